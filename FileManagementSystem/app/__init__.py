@@ -2,6 +2,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api import api_router
+from app.database.routing import ReadYourWritesMiddleware
+from app.database.session import READ_YOUR_WRITES_SECONDS, async_engine, async_replica_engines, replica_set
+from app.services.reference_data import reference_data
+from app.services.run_events import run_event_broker
+from app.utils.auth import password_hasher
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -20,8 +25,13 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
     
+    # Clients that just wrote read from the primary (only needed with replicas)
+    if len(replica_set):
+        app.add_middleware(ReadYourWritesMiddleware, window_seconds=READ_YOUR_WRITES_SECONDS)
+    
     # Include routers
     app.include_router(api_router, prefix="/api/v1")
     
@@ -34,6 +44,16 @@ def create_app() -> FastAPI:
             "api_version": "v1"
         }
     
+    @app.on_event("shutdown")
+    async def stop_background_pools():
+        run_event_broker.stop()
+        reference_data.stop()
+        password_hasher.shutdown()
+        replica_set.stop()
+        await async_engine.dispose()
+        for replica in async_replica_engines:
+            await replica.dispose()
+    
     @app.get("/health")
     def health_check():
         return {"status": "healthy"}
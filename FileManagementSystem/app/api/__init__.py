@@ -17,7 +17,9 @@ from .v1 import (
     run,
     suitcase,
     tester_group,
-    execution
+    execution,
+    job,
+    comparison
 )
 
 from .v1.admin import (
@@ -49,4 +51,6 @@ api_router.include_router(attachment.router)
 api_router.include_router(run.router)
 api_router.include_router(suitcase.router)
 api_router.include_router(tester_group.router)
-api_router.include_router(execution.router)
\ No newline at end of file
+api_router.include_router(execution.router)
+api_router.include_router(job.router)
+api_router.include_router(comparison.router)
\ No newline at end of file
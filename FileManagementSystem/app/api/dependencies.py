@@ -1,53 +1,138 @@
 from datetime import datetime, timedelta
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import Depends, HTTPException, Query, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database.session import get_db
+from app.database.session import get_async_db, get_db
 from app.database.models import Tester
 from app.schemas.auth import TokenData
+from app.utils.principal_cache import Principal, PrincipalKey, principal_cache
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
-def get_current_tester(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> Tester:
-    credentials_exception = HTTPException(
+# Scope of the short-lived tokens EventSource clients pass as ?token= to
+# /runs/{id}/events; they authorize that stream and nothing else
+RUN_EVENTS_SCOPE = "run_events"
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def _decode_token(token: str) -> dict:
+    try:
+        return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        raise _credentials_exception()
+
+def _principal_key(credentials: HTTPAuthorizationCredentials) -> PrincipalKey:
+    """Decode the bearer token into its principal cache key."""
+    payload = _decode_token(credentials.credentials)
+    # Scoped tokens travel in URLs and must not work as bearer tokens
+    if payload.get("scope"):
+        raise _credentials_exception()
     try:
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
         tester_id: int = int(payload.get("sub"))
         if tester_id is None:
-            raise credentials_exception
+            raise _credentials_exception()
+        issued_at = payload.get("iat")
         token_data = TokenData(
             tester_id=tester_id,
             email=payload.get("email"),
             tester_type_id=payload.get("tester_type_id")
         )
-    except (JWTError, ValueError):
-        raise credentials_exception
+    except (JWTError, TypeError, ValueError):
+        raise _credentials_exception()
     
-    tester = db.query(Tester).filter(Tester.id == token_data.tester_id).first()
+    return (token_data.tester_id, issued_at)
+
+def _resolve_principal(key: PrincipalKey, tester: Optional[Tester]) -> Principal:
+    """Cache the principal of a freshly loaded tester."""
     if tester is None:
-        raise credentials_exception
-    if not tester.active:
+        raise _credentials_exception()
+    principal = Principal(
+        id=tester.id,
+        tester_type_id=tester.tester_type_id,
+        tester_group_id=tester.tester_group_id,
+        active=tester.active,
+    )
+    principal_cache.put(key, principal)
+    return principal
+
+def _require_active(principal: Principal) -> Principal:
+    if not principal.active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive tester"
         )
-    return tester
+    return principal
+
+def get_current_tester(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """
+    Resolve the bearer token to the tester's Principal.
+    
+    Principals are cached per (tester, token issue time), so a warm request
+    authenticates without touching the database.
+    """
+    key = _principal_key(credentials)
+    principal = principal_cache.get(key)
+    if principal is None:
+        tester = db.query(Tester).filter(Tester.id == key[0]).first()
+        principal = _resolve_principal(key, tester)
+    return _require_active(principal)
+
+def get_run_events_tester(
+    run_id: int,
+    token: Optional[str] = Query(None, description="Token from POST /runs/{run_id}/events/token, for EventSource clients"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """
+    get_current_tester for the run event stream.
+    
+    Browsers' EventSource cannot send an Authorization header, so the
+    stream also accepts a token from create_run_events_token in the query
+    string. Such a token is short-lived and only valid for its run.
+    """
+    if credentials is not None:
+        return get_current_tester(credentials, db)
+    if token is None:
+        raise _credentials_exception()
+    
+    payload = _decode_token(token)
+    if payload.get("scope") != RUN_EVENTS_SCOPE or payload.get("run_id") != run_id:
+        raise _credentials_exception()
+    try:
+        key = (int(payload.get("sub")), payload.get("iat"))
+    except (TypeError, ValueError):
+        raise _credentials_exception()
+    principal = principal_cache.get(key)
+    if principal is None:
+        tester = db.query(Tester).filter(Tester.id == key[0]).first()
+        principal = _resolve_principal(key, tester)
+    return _require_active(principal)
+
+async def get_current_tester_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """get_current_tester for async endpoints: a cache miss is loaded on the AsyncSession."""
+    key = _principal_key(credentials)
+    principal = principal_cache.get(key)
+    if principal is None:
+        tester = await db.get(Tester, key[0])
+        principal = _resolve_principal(key, tester)
+    return _require_active(principal)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -56,7 +141,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    # iat keys the principal cache, so every login starts from a fresh entry
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(
         to_encode,
         settings.JWT_SECRET_KEY,
@@ -65,7 +151,43 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def require_admin(current_user: Tester = Depends(get_current_tester)):
+def create_run_events_token(tester_id: int, run_id: int) -> str:
+    """A token that authorizes only the event stream of `run_id`, for ?token=."""
+    return create_access_token(
+        {"sub": str(tester_id), "scope": RUN_EVENTS_SCOPE, "run_id": run_id},
+        timedelta(minutes=settings.RUN_EVENTS_TOKEN_MINUTES),
+    )
+
+
+def require_admin(current_user: Principal = Depends(get_current_tester)):
     if current_user.tester_type_id not in (1, 2):  # super, admin
         raise HTTPException(status_code=403, detail="Admin access required")
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+class Pagination:
+    """
+    Paging parameters shared by the list endpoints.
+
+    Clients either page with skip/limit or pass the X-Next-Cursor header of
+    the previous response as `cursor`, which stays fast on deep pages.
+    """
+
+    def __init__(
+        self,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value of the previous page"),
+    ):
+        self.response = response
+        self.skip = skip
+        self.limit = limit
+        self.cursor = cursor
+
+    def respond(self, page: List) -> List:
+        """Expose the cursor of the following page, if any, and return the page."""
+        next_cursor = getattr(page, "next_cursor", None)
+        if next_cursor:
+            self.response.headers["X-Next-Cursor"] = next_cursor
+        return page
@@ -2,10 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.database.session import get_db
-from app.database.models import Tester as TesterModel
+from app.utils.principal_cache import Principal
 from app.schemas.tester import TesterCreateAdmin, TesterResponse
 from app.services.tester import create_tester_admin
 from app.api.dependencies import require_admin
+from app.utils.auth import PasswordHasherBusy
 
 router = APIRouter(prefix="/admin/testers", tags=["admin"])
 
@@ -13,7 +14,10 @@ router = APIRouter(prefix="/admin/testers", tags=["admin"])
 def admin_create_tester(
     payload: TesterCreateAdmin,
     db: Session = Depends(get_db),
-    current_admin: TesterModel = Depends(require_admin),  # Proper dependency
+    current_admin: Principal = Depends(require_admin),  # Proper dependency
 ):
     """Create a new tester (admin only)"""
-    return create_tester_admin(db, payload)
\ No newline at end of file
+    try:
+        return create_tester_admin(db, payload)
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
\ No newline at end of file
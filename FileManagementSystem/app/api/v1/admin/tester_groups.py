@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.database.session import get_db
 from app.api.dependencies import get_current_tester, require_admin
-from app.database.models import Tester
+from app.utils.principal_cache import Principal
 from app.schemas.tester_group import (
     TesterGroupCreate,
     TesterGroupUpdate,
@@ -29,7 +29,7 @@ router = APIRouter(prefix="/admin/tester_groups", tags=["tester_groups"])
 def create_new_tester_group(
     group_data: TesterGroupCreate,
     db: Session = Depends(get_db),
-    current_admin: Tester = Depends(require_admin),
+    current_admin: Principal = Depends(require_admin),
 ):
     """Create a new tester group."""
     try:
@@ -43,7 +43,7 @@ def update_existing_tester_group(
     group_id: int,
     group_data: TesterGroupUpdate,
     db: Session = Depends(get_db),
-    current_admin: Tester = Depends(require_admin),
+    current_admin: Principal = Depends(require_admin),
 ):
     """Update an existing tester group."""
     try:
@@ -60,7 +60,7 @@ def add_member(
     group_id: int,
     request: AddMemberRequest,
     db: Session = Depends(get_db),
-    current_admin: Tester = Depends(require_admin),
+    current_admin: Principal = Depends(require_admin),
 ):
     """Add a tester to a tester group."""
     try:
@@ -79,7 +79,7 @@ def add_multiple_members(
     group_id: int,
     request: BulkAddMembersRequest,
     db: Session = Depends(get_db),
-    current_admin: Tester = Depends(require_admin),
+    current_admin: Principal = Depends(require_admin),
 ):
     """Add multiple testers to a tester group."""
     try:
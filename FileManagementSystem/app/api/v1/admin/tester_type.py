@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.database.session import get_db
 from app.api.dependencies import require_admin
-from app.database.models import Tester
+from app.utils.principal_cache import Principal
 
 from app.schemas.tester_type import (
     TesterTypeCreate,
@@ -22,7 +22,7 @@ router = APIRouter(prefix="/admin/tester_types", tags=["tester_types"])
 def create_new_tester_type(
     tester_type: TesterTypeCreate,
     db: Session = Depends(get_db),
-    current_admin: Tester = Depends(require_admin),
+    current_admin: Principal = Depends(require_admin),
 ):
     return create_tester_type(db, tester_type)
 
@@ -31,7 +31,7 @@ def update_existing_tester_type(
     tester_type_id: int,
     tester_type: TesterTypeUpdate,
     db: Session = Depends(get_db),
-    current_admin: Tester = Depends(require_admin),
+    current_admin: Principal = Depends(require_admin),
 ):
     updated = update_tester_type(db, tester_type_id, tester_type)
     if not updated:
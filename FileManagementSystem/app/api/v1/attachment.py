@@ -1,66 +1,168 @@
 # --- /home/oleksiak/FileManagementTool/FileManagementSystem/app/api/v1/attachment.py ---
 import os
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from typing import List, Literal, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester as TesterModel
+from app.database.session import get_async_read_db, get_db, get_read_db
+from app.api.dependencies import get_current_tester, get_current_tester_async, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.attachment import (
     AttachmentCreate,
     AttachmentUpdate,
     AttachmentResponse,
     AttachmentWithRelationsResponse,
-    FileUploadResponse
+    AttachmentLineageResponse,
+    AttachmentMetricsResponse,
+    AttachmentSeriesResponse,
+    AttachmentUploadForm,
+    AttachmentVersionUploadForm,
+    FileUploadResponse,
+    ResumableUploadCreate,
+    ResumableUploadStatusResponse,
+    ResumableChunkResponse
 )
+from app.services.processing import create_processed_attachment, create_processed_attachment_version
 from app.services.attachment import (
-    get_attachments,
     get_attachment_by_id,
-    create_attachment,
     update_attachment,
     get_attachments_by_uploader,
     get_attachment_tree,
+    get_attachment_tree_rows,
+    get_attachment_ancestors,
+    get_attachment_descendants,
     get_root_attachments,
-    create_attachment_version
+    MAX_ATTACHMENT_TREE_DEPTH,
+    get_attachment_by_content,
+    get_attachment_metrics,
+    get_attachment_series,
+    get_attachments_async
+)
+from app.utils.uploads import ReceivedUpload, receive_upload
+from app.utils.files import file_storage
+from app.utils.resumable import resumable_uploads
+from app.utils.presentmon import PresentMonError
+from app.utils.series import MAX_SERIES_WIDTH
+from app.utils.preview import MAX_PREVIEW_BYTES, MAX_PREVIEW_LINES, TextPreview
+from app.utils.ranges import (
+    FileValidators,
+    is_not_modified,
+    not_modified_response,
+    ranged_file_response
 )
-from app.utils.files import file_storage, validate_file_upload
 from app.config import settings
 
 router = APIRouter(prefix="/attachments", tags=["attachments"])
 
 
+# Upload bodies are parsed by the streaming receiver rather than by FastAPI,
+# so the multipart form is described here to keep it in the OpenAPI docs.
+def _multipart_form(properties: dict) -> dict:
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["file"],
+                        "properties": {
+                            "file": {"type": "string", "format": "binary"},
+                            **properties,
+                        },
+                    }
+                }
+            },
+        }
+    }
+
+
+VERSION_FORM_OPENAPI = _multipart_form({
+    "subdirectory": {"type": "string", "default": ""},
+})
+
+UPLOAD_FORM_OPENAPI = _multipart_form({
+    "resolution_id": {"type": "integer"},
+    "parent_attachment_id": {"type": "integer"},
+    "presentmon_file": {"type": "boolean", "default": False},
+    "presentmon_version": {"type": "string"},
+    "subdirectory": {"type": "string", "default": ""},
+})
+
+
+async def _store_upload(db: Session, upload: ReceivedUpload, subdirectory: str) -> Tuple[str, str, str]:
+    """Place a received upload in storage and return (filename, relative_path, full_path)."""
+    if not settings.CONTENT_ADDRESSED_STORAGE:
+        return file_storage.store_received_file(upload.temp_path, upload.original_filename, subdirectory)
+    
+    # Identical content that is already stored is shared instead of written again
+    existing = await run_in_threadpool(get_attachment_by_content, db, upload.content_hash, upload.size)
+    if existing and file_storage.file_exists(existing.relative_path, existing.filename):
+        upload.discard()
+        full_path = file_storage.get_file_path(existing.relative_path, existing.filename)
+        return existing.filename, existing.relative_path, str(full_path)
+    
+    return file_storage.store_content_addressed(upload.temp_path, upload.original_filename, upload.content_hash)
+
+
+def _discard_stored_file(relative_path: str, filename: str) -> None:
+    """
+    Remove the file of an upload whose attachment record was not created.
+    
+    A content-addressed file may already be shared by a concurrent upload of
+    the same content whose record is not committed yet, so it is left for
+    the orphan cleanup, which only removes files no record references.
+    """
+    if settings.CONTENT_ADDRESSED_STORAGE:
+        return
+    try:
+        # Uniquely named, so no other attachment can reference it
+        file_storage.delete_file(relative_path, filename, references=0)
+    except OSError as e:
+        print(f"Failed to remove stored file {relative_path}/{filename}: {e}")
+
+
+def _lineage_entry(attachment, depth: int) -> AttachmentLineageResponse:
+    return AttachmentLineageResponse(**AttachmentResponse.model_validate(attachment).dict(), depth=depth)
+
+
 @router.get("/", response_model=List[AttachmentResponse])
-def read_attachments(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+async def read_attachments(
+    page: Pagination = Depends(),
     filename: Optional[str] = None,
     uploaded_by: Optional[int] = None,
     resolution_id: Optional[int] = None,
     parent_attachment_id: Optional[int] = None,
     presentmon_file: Optional[bool] = None,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_tester: Principal = Depends(get_current_tester_async),
 ):
     """Get all attachments with optional filtering."""
-    return get_attachments(
-        db=db,
-        skip=skip,
-        limit=limit,
-        filename=filename,
-        uploaded_by=uploaded_by,
-        resolution_id=resolution_id,
-        parent_attachment_id=parent_attachment_id,
-        presentmon_file=presentmon_file,
-    )
+    try:
+        return page.respond(await get_attachments_async(
+            db=db,
+            skip=page.skip,
+            limit=page.limit,
+            cursor=page.cursor,
+            filename=filename,
+            uploaded_by=uploaded_by,
+            resolution_id=resolution_id,
+            parent_attachment_id=parent_attachment_id,
+            presentmon_file=presentmon_file,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{attachment_id}", response_model=AttachmentWithRelationsResponse)
 def read_attachment(
     attachment_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get a specific attachment by ID."""
     attachment = get_attachment_by_id(db, attachment_id)
@@ -72,10 +174,11 @@ def read_attachment(
 @router.get("/{attachment_id}/download")
 def download_attachment(
     attachment_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
-    """Download an attachment file."""
+    """Download an attachment file. Supports Range, If-Range, If-None-Match and If-Modified-Since."""
     attachment = get_attachment_by_id(db, attachment_id)
     if not attachment:
         raise HTTPException(status_code=404, detail="Attachment not found")
@@ -85,20 +188,34 @@ def download_attachment(
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="File not found on server")
     
-    return FileResponse(
-        path=file_path,
+    return ranged_file_response(
+        request,
+        file_path,
+        media_type='application/octet-stream',
         filename=attachment.filename,
-        media_type='application/octet-stream'
+        content_hash=attachment.content_hash,
+        modified_at=attachment.uploaded_at
     )
 
 
 @router.get("/{attachment_id}/preview")
 def preview_attachment(
     attachment_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    request: Request,
+    unit: Literal["line", "byte"] = Query("line"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(200, ge=1, le=MAX_PREVIEW_BYTES),
+    raw: bool = Query(False),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
-    """Preview an attachment (if it's an image or text file)."""
+    """
+    Preview an attachment (if it's an image or text file).
+    
+    Text files are paged by line or byte: `offset`/`limit` select the page and
+    the response carries `next_offset` for the following one. With `raw=true`
+    the page is streamed as text/plain and the paging fields move to headers.
+    """
     attachment = get_attachment_by_id(db, attachment_id)
     if not attachment:
         raise HTTPException(status_code=404, detail="Attachment not found")
@@ -111,147 +228,397 @@ def preview_attachment(
     mime_type = file_storage.get_mime_type(attachment.filename)
     
     if mime_type.startswith('image/'):
-        return FileResponse(
-            path=file_path,
+        return ranged_file_response(
+            request,
+            file_path,
+            media_type=mime_type,
             filename=attachment.filename,
-            media_type=mime_type
+            content_hash=attachment.content_hash,
+            modified_at=attachment.uploaded_at,
+            disposition="inline"
         )
     elif mime_type.startswith('text/'):
-        with open(file_path, 'r') as f:
-            content = f.read()
-        return {"content": content, "filename": attachment.filename, "mime_type": mime_type}
+        validators = FileValidators(file_path, attachment.content_hash, attachment.uploaded_at)
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+        
+        if unit == "line" and limit > MAX_PREVIEW_LINES:
+            raise HTTPException(status_code=400, detail=f"limit may not exceed {MAX_PREVIEW_LINES} lines")
+        
+        preview = TextPreview(file_path)
+        try:
+            if unit == "line":
+                start, end, lines = preview.line_range(offset, limit)
+                next_offset = offset + lines
+                total = preview.index.total_lines
+            else:
+                start, end = preview.byte_range(offset, limit)
+                next_offset = end
+                total = preview.size
+            
+            page = {
+                "filename": attachment.filename,
+                "mime_type": mime_type,
+                "unit": unit,
+                "offset": offset,
+                "next_offset": next_offset if next_offset < total else None,
+                "total": total,
+                "start_byte": start,
+                "end_byte": end,
+            }
+            headers = validators.headers(accept_ranges=False)
+            
+            if raw:
+                headers.update({
+                    f"X-Preview-{key.replace('_', '-').title()}": str(value)
+                    for key, value in page.items()
+                    if key not in ("filename", "mime_type") and value is not None
+                })
+                # The generator closes the preview once the page is sent
+                return StreamingResponse(
+                    preview.iter_bytes(start, end),
+                    media_type=mime_type,
+                    headers=headers
+                )
+            
+            page["content"] = preview.read(start, end)
+        except BaseException:
+            preview.close()
+            raise
+        
+        preview.close()
+        return JSONResponse(content=page, headers=headers)
     else:
         raise HTTPException(status_code=400, detail="File type not previewable")
 
 
-@router.post("/upload", response_model=FileUploadResponse, status_code=status.HTTP_201_CREATED)
+@router.get("/{attachment_id}/metrics", response_model=AttachmentMetricsResponse)
+def read_attachment_metrics(
+    attachment_id: int,
+    refresh: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Get frame-time metrics (FPS, lows, percentiles, stutters) of a PresentMon capture."""
+    try:
+        metrics = get_attachment_metrics(db, attachment_id, refresh)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found on server")
+    except PresentMonError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not metrics:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    return metrics
+
+
+@router.get("/{attachment_id}/series", response_model=AttachmentSeriesResponse)
+def read_attachment_series(
+    attachment_id: int,
+    column: str = Query("frame_time"),
+    width: int = Query(1000, ge=1, le=MAX_SERIES_WIDTH),
+    start: Optional[float] = Query(None, ge=0),
+    end: Optional[float] = Query(None, ge=0),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Get a min/max downsampled series of a PresentMon column for a time window in seconds."""
+    if start is not None and end is not None and end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    
+    try:
+        series = get_attachment_series(db, attachment_id, column, width, start, end)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found on server")
+    except PresentMonError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not series:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    return series
+
+
+@router.post(
+    "/upload",
+    response_model=FileUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=UPLOAD_FORM_OPENAPI,
+)
 async def upload_file(
-    file: UploadFile = File(...),
-    resolution_id: Optional[int] = Form(None),
-    parent_attachment_id: Optional[int] = Form(None),
-    presentmon_file: bool = Form(False),
-    presentmon_version: Optional[str] = Form(None),
-    subdirectory: str = Form(""),
+    request: Request,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Upload a new file and create an attachment record."""
+    # Stream the body to disk; size and extension are checked as it arrives
+    upload = await receive_upload(request)
+    
     try:
-        # Validate the file
-        validate_file_upload(file)
-        
-        # Save the file to disk
-        filename, relative_path, full_path = file_storage.save_file(file, subdirectory)
+        form = AttachmentUploadForm(**upload.fields)
+    except ValidationError as e:
+        upload.discard()
+        raise HTTPException(status_code=422, detail=e.errors())
+    
+    try:
+        # Move the received file into place
+        filename, relative_path, full_path = await _store_upload(db, upload, form.subdirectory)
         
         # Create attachment record
         attachment_data = AttachmentCreate(
-            parent_attachment_id=parent_attachment_id,
-            resolution_id=resolution_id,
+            parent_attachment_id=form.parent_attachment_id,
+            resolution_id=form.resolution_id,
             filename=filename,
             relative_path=relative_path,
-            presentmon_file=presentmon_file,
-            presentmon_version=presentmon_version,
+            presentmon_file=form.presentmon_file,
+            presentmon_version=form.presentmon_version,
+            content_hash=upload.content_hash,
+            file_size=upload.size,
             uploaded_by=current_tester.id
         )
         
-        attachment = create_attachment(db, attachment_data)
-        
-        # Construct file URL
-        file_url = f"/api/v1/attachments/{attachment.id}/download"
-        
-        return FileUploadResponse(
-            message="File uploaded successfully",
-            attachment_id=attachment.id,
-            filename=filename,
-            file_path=full_path,
-            file_url=file_url
-        )
+        attachment, job = await run_in_threadpool(create_processed_attachment, db, attachment_data)
         
     except Exception as e:
         # Clean up file if there was an error
+        upload.discard()
         if 'full_path' in locals():
-            try:
-                os.remove(full_path)
-            except:
-                pass
+            await run_in_threadpool(_discard_stored_file, relative_path, filename)
         raise HTTPException(status_code=400, detail=str(e))
+    
+    # Construct file URL
+    file_url = f"/api/v1/attachments/{attachment.id}/download"
+    
+    return FileUploadResponse(
+        message="File uploaded successfully",
+        attachment_id=attachment.id,
+        filename=filename,
+        file_path=full_path,
+        file_url=file_url,
+        job_id=job.id if job else None
+    )
 
 
-@router.post("/{attachment_id}/version", response_model=FileUploadResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{attachment_id}/version",
+    response_model=FileUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=VERSION_FORM_OPENAPI,
+)
 async def create_version(
     attachment_id: int,
-    file: UploadFile = File(...),
-    subdirectory: str = Form(""),
+    request: Request,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Create a new version of an existing attachment."""
+    upload = await receive_upload(request)
+    
     try:
-        # Validate the file
-        validate_file_upload(file)
-        
-        # Save the file to disk
-        filename, relative_path, full_path = file_storage.save_file(file, subdirectory)
+        form = AttachmentVersionUploadForm(**upload.fields)
+    except ValidationError as e:
+        upload.discard()
+        raise HTTPException(status_code=422, detail=e.errors())
+    
+    try:
+        # Move the received file into place
+        filename, relative_path, full_path = await _store_upload(db, upload, form.subdirectory)
         
         # Create new attachment version
-        new_attachment = create_attachment_version(
+        new_attachment, job = await run_in_threadpool(
+            create_processed_attachment_version,
             db,
             attachment_id,
             filename,
             relative_path,
-            current_tester.id
+            current_tester.id,
+            upload.content_hash,
+            upload.size
         )
         
-        # Construct file URL
-        file_url = f"/api/v1/attachments/{new_attachment.id}/download"
+    except Exception as e:
+        # Clean up file if there was an error
+        upload.discard()
+        if 'full_path' in locals():
+            await run_in_threadpool(_discard_stored_file, relative_path, filename)
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Construct file URL
+    file_url = f"/api/v1/attachments/{new_attachment.id}/download"
+    
+    return FileUploadResponse(
+        message="New version created successfully",
+        attachment_id=new_attachment.id,
+        filename=filename,
+        file_path=full_path,
+        file_url=file_url,
+        job_id=job.id if job else None
+    )
+
+
+@router.post("/uploads", response_model=ResumableUploadStatusResponse, status_code=status.HTTP_201_CREATED)
+def init_resumable_upload(
+    upload_data: ResumableUploadCreate,
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Start a resumable upload and return its upload ID and chunk layout."""
+    metadata = upload_data.dict(
+        include={"resolution_id", "parent_attachment_id", "presentmon_file", "presentmon_version", "subdirectory"}
+    )
+    manifest = resumable_uploads.create(
+        filename=upload_data.filename,
+        total_size=upload_data.total_size,
+        uploaded_by=current_tester.id,
+        chunk_size=upload_data.chunk_size,
+        content_hash=upload_data.content_hash,
+        metadata=metadata,
+    )
+    return resumable_uploads.status(manifest)
+
+
+@router.put("/uploads/{upload_id}/chunks/{index}", response_model=ResumableChunkResponse)
+async def upload_resumable_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Upload one chunk as the raw request body. Chunks may be sent in any order, in parallel, and retried."""
+    manifest = resumable_uploads.get_manifest(upload_id, current_tester.id)
+    size = await resumable_uploads.write_chunk(manifest, index, request)
+    return ResumableChunkResponse(upload_id=upload_id, index=index, size=size)
+
+
+@router.get("/uploads/{upload_id}", response_model=ResumableUploadStatusResponse)
+def read_resumable_upload(
+    upload_id: str,
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Get the received chunks and the byte ranges still missing."""
+    manifest = resumable_uploads.get_manifest(upload_id, current_tester.id)
+    return resumable_uploads.status(manifest)
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=FileUploadResponse, status_code=status.HTTP_201_CREATED)
+async def complete_resumable_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Assemble the received chunks and create the attachment record."""
+    manifest = resumable_uploads.get_manifest(upload_id, current_tester.id)
+    upload = await resumable_uploads.assemble(manifest)
+    form = AttachmentUploadForm(**upload.fields)
+    
+    try:
+        filename, relative_path, full_path = await _store_upload(db, upload, form.subdirectory)
         
-        return FileUploadResponse(
-            message="New version created successfully",
-            attachment_id=new_attachment.id,
+        attachment_data = AttachmentCreate(
+            parent_attachment_id=form.parent_attachment_id,
+            resolution_id=form.resolution_id,
             filename=filename,
-            file_path=full_path,
-            file_url=file_url
+            relative_path=relative_path,
+            presentmon_file=form.presentmon_file,
+            presentmon_version=form.presentmon_version,
+            content_hash=upload.content_hash,
+            file_size=upload.size,
+            uploaded_by=current_tester.id
         )
         
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        attachment, job = await run_in_threadpool(create_processed_attachment, db, attachment_data)
+        
     except Exception as e:
-        # Clean up file if there was an error
+        # Keep the chunks so the client can retry the finalize step
+        upload.discard()
+        resumable_uploads.release(upload_id)
         if 'full_path' in locals():
-            try:
-                os.remove(full_path)
-            except:
-                pass
+            await run_in_threadpool(_discard_stored_file, relative_path, filename)
         raise HTTPException(status_code=400, detail=str(e))
+    
+    resumable_uploads.delete(upload_id)
+    
+    return FileUploadResponse(
+        message="File uploaded successfully",
+        attachment_id=attachment.id,
+        filename=filename,
+        file_path=full_path,
+        file_url=f"/api/v1/attachments/{attachment.id}/download",
+        job_id=job.id if job else None
+    )
+
+
+@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def abort_resumable_upload(
+    upload_id: str,
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Abort a resumable upload and discard its chunks."""
+    resumable_uploads.get_manifest(upload_id, current_tester.id)
+    resumable_uploads.delete(upload_id)
 
 
 @router.get("/uploader/{uploader_id}", response_model=List[AttachmentResponse])
 def read_attachments_by_uploader(
     uploader_id: int,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all attachments uploaded by a specific tester."""
-    attachments = get_attachments_by_uploader(db, uploader_id)
-    return attachments[skip:skip + limit]
+    try:
+        return page.respond(get_attachments_by_uploader(db, uploader_id, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/tree/structure", response_model=List[dict])
 def read_attachment_tree(
     parent_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    max_depth: Optional[int] = Query(None, ge=0, le=MAX_ATTACHMENT_TREE_DEPTH),
+    flat: bool = Query(False, description="Return the adjacency list (id, parent_attachment_id, depth) instead of nested children"),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get attachments in a tree structure."""
-    return get_attachment_tree(db, parent_id)
+    if flat:
+        return get_attachment_tree_rows(db, parent_id, max_depth)
+    return get_attachment_tree(db, parent_id, max_depth)
+
+
+@router.get("/{attachment_id}/ancestors", response_model=List[AttachmentLineageResponse])
+def read_attachment_ancestors(
+    attachment_id: int,
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Get the versions an attachment derives from, from its parent up to the root."""
+    ancestors = get_attachment_ancestors(db, attachment_id)
+    if ancestors is None:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    return [_lineage_entry(attachment, depth) for attachment, depth in ancestors]
+
+
+@router.get("/{attachment_id}/descendants", response_model=List[AttachmentLineageResponse])
+def read_attachment_descendants(
+    attachment_id: int,
+    max_depth: Optional[int] = Query(None, ge=1, le=MAX_ATTACHMENT_TREE_DEPTH),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Get every version derived from an attachment, breadth first."""
+    descendants = get_attachment_descendants(db, attachment_id, max_depth)
+    if descendants is None:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    return [_lineage_entry(attachment, depth) for attachment, depth in descendants]
 
 
 @router.get("/tree/roots", response_model=List[AttachmentResponse])
 def read_root_attachments(
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all root attachments (without parent)."""
     return get_root_attachments(db)
@@ -262,7 +629,7 @@ def update_existing_attachment(
     attachment_id: int,
     attachment_data: AttachmentUpdate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Update an existing attachment's metadata."""
     attachment = get_attachment_by_id(db, attachment_id)
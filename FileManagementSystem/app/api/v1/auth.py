@@ -1,23 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.session import get_db
+from app.database.session import get_async_db
 from app.schemas.auth import Token, LoginRequest
-from app.services.auth import authenticate_tester, login_tester
+from app.services.auth import authenticate_tester, login_tester_async
+from app.utils.auth import PasswordHasherBusy
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    tester = authenticate_tester(
-        db,
-        email=login_data.email,
-        password=login_data.password
-    )
+    try:
+        tester = await authenticate_tester(
+            db,
+            email=login_data.email,
+            password=login_data.password
+        )
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
     if not tester:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -25,7 +29,7 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return login_tester(db, tester)
+    return await login_tester_async(db, tester)
 
 @router.post("/test-token", dependencies=[Depends(HTTPBearer())])
 def test_token():
@@ -1,10 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester
+from app.database.session import get_db, get_read_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.client import ClientCreate, ClientUpdate, ClientResponse
 from app.services.client import (
     get_clients, get_client_by_id, create_client, update_client
@@ -15,19 +15,21 @@ router = APIRouter(prefix="/clients", tags=["clients"])
 
 @router.get("/", response_model=List[ClientResponse])
 def read_clients(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_tester),
 ):
-    return get_clients(db, skip, limit)
+    try:
+        return page.respond(get_clients(db, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{client_id}", response_model=ClientResponse)
 def read_client(
     client_id: int,
-    db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_tester),
 ):
     client = get_client_by_id(db, client_id)
     if not client:
@@ -39,7 +41,7 @@ def read_client(
 def create_new_client(
     client: ClientCreate,
     db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    _: Principal = Depends(get_current_tester),
 ):
     return create_client(db, client)
 
@@ -49,7 +51,7 @@ def update_existing_client(
     client_id: int,
     client: ClientUpdate,
     db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    _: Principal = Depends(get_current_tester),
 ):
     updated = update_client(db, client_id, client)
     if not updated:
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.database.session import get_db
+from app.api.dependencies import get_current_tester
+from app.utils.principal_cache import Principal
+from app.schemas.comparison import ComparisonRequest, ComparisonResponse
+from app.services.comparison import compare_slices
+
+router = APIRouter(prefix="/comparisons", tags=["comparisons"])
+
+
+@router.post("/", response_model=ComparisonResponse)
+def compare_runs(
+    comparison_in: ComparisonRequest,
+    db: Session = Depends(get_db),
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """
+    Compare PresentMon results of runs or device/resolution slices of runs.
+
+    The first slice is the baseline. Executions are matched by test case and
+    every other slice gets per-test deltas in FPS, lows and frame-time
+    percentiles, plus a geometric-mean ratio over all matched tests.
+    """
+    try:
+        return compare_slices(db, comparison_in)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,10 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester as TesterModel
+from app.database.session import get_db, get_read_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.device import (
     DeviceCreate,
     DeviceUpdate,
@@ -22,33 +22,36 @@ router = APIRouter(prefix="/devices", tags=["devices"])
 
 @router.get("/", response_model=List[DeviceResponse])
 def read_devices(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    page: Pagination = Depends(),
     name_external: str | None = None,
     name_internal: str | None = None,
     cpu: str | None = None,
     gpu: str | None = None,
     ram: str | None = None,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
-    return get_devices(
-        db=db,
-        skip=skip,
-        limit=limit,
-        name_external=name_external,
-        name_internal=name_internal,
-        cpu=cpu,
-        gpu=gpu,
-        ram=ram,
-    )
+    try:
+        return page.respond(get_devices(
+            db=db,
+            skip=page.skip,
+            limit=page.limit,
+            cursor=page.cursor,
+            name_external=name_external,
+            name_internal=name_internal,
+            cpu=cpu,
+            gpu=gpu,
+            ram=ram,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{device_id}", response_model=DeviceResponse)
 def read_device(
     device_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     device = get_device_by_id(db, device_id)
     if not device:
@@ -60,7 +63,7 @@ def read_device(
 def create_new_device(
     device: DeviceCreate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     return create_device(db, device)
 
@@ -70,7 +73,7 @@ def update_existing_device(
     device_id: int,
     device: DeviceUpdate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     updated = update_device(db, device_id, device)
     if not updated:
@@ -1,13 +1,14 @@
 # --- /home/oleksiak/FileManagementTool/FileManagementSystem/app/api/v1/execution.py ---
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
 from pydantic import BaseModel
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester as TesterModel
+from app.database.session import get_async_db, get_async_read_db, get_db, get_read_db
+from app.api.dependencies import get_current_tester, get_current_tester_async, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.execution import (
     ExecutionCreate,
     ExecutionUpdate,
@@ -19,25 +20,29 @@ from app.schemas.execution import (
     ExecutionStatusUpdate
 )
 from app.services.execution import (
-    get_executions,
     get_execution_by_id,
     create_execution,
     update_execution,
-    get_executions_by_run,
     get_executions_by_device,
     get_executions_by_tester,
     get_executions_by_test_case,
     get_executions_by_test_suite,
     get_execution_stats,
-    get_execution_with_relations,
-    update_execution_status,
+    get_executions_with_relations,
     create_executions_for_test_suite,
     reassign_execution_device,
-    reassign_execution_tester
+    reassign_execution_tester,
+    get_executions_async,
+    get_executions_by_run_async,
+    get_execution_by_id_async,
+    get_execution_with_relations_async,
+    update_execution_status_async
 )
 
 router = APIRouter(prefix="/executions", tags=["executions"])
 
+MAX_BATCH_EXECUTIONS = 500
+
 
 class BulkCreateExecutionsRequest(BaseModel):
     """Request model for bulk execution creation from test suite."""
@@ -48,9 +53,8 @@ class BulkCreateExecutionsRequest(BaseModel):
 
 
 @router.get("/", response_model=List[ExecutionResponse])
-def read_executions(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+async def read_executions(
+    page: Pagination = Depends(),
     device_id: int | None = None,
     run_id: int | None = None,
     test_case_version_id: int | None = None,
@@ -63,105 +67,131 @@ def read_executions(
     test_case_id: int | None = None,
     test_suite_id: int | None = None,
     scenario_id: int | None = None,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_tester: Principal = Depends(get_current_tester_async),
 ):
     """Get all executions with optional filtering."""
-    return get_executions(
-        db=db,
-        skip=skip,
-        limit=limit,
-        device_id=device_id,
-        run_id=run_id,
-        test_case_version_id=test_case_version_id,
-        executed_by=executed_by,
-        status_id=status_id,
-        attachment_id=attachment_id,
-        executed_after=executed_after,
-        executed_before=executed_before,
-        project_id=project_id,
-        test_case_id=test_case_id,
-        test_suite_id=test_suite_id,
-        scenario_id=scenario_id,
-    )
+    try:
+        return page.respond(await get_executions_async(
+            db=db,
+            skip=page.skip,
+            limit=page.limit,
+            cursor=page.cursor,
+            device_id=device_id,
+            run_id=run_id,
+            test_case_version_id=test_case_version_id,
+            executed_by=executed_by,
+            status_id=status_id,
+            attachment_id=attachment_id,
+            executed_after=executed_after,
+            executed_before=executed_before,
+            project_id=project_id,
+            test_case_id=test_case_id,
+            test_suite_id=test_suite_id,
+            scenario_id=scenario_id,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/batch", response_model=List[ExecutionWithRelationsResponse])
+def read_executions_batch(
+    ids: str = Query(..., description="Comma-separated execution IDs"),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Get several executions with all relations; unknown IDs are left out."""
+    try:
+        execution_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    if len(execution_ids) > MAX_BATCH_EXECUTIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_EXECUTIONS} executions per batch")
+    
+    return get_executions_with_relations(db, execution_ids)
 
 
 @router.get("/{execution_id}", response_model=ExecutionWithRelationsResponse)
-def read_execution(
+async def read_execution(
     execution_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_tester: Principal = Depends(get_current_tester_async),
 ):
     """Get a specific execution by ID with all relations."""
-    execution = get_execution_with_relations(db, execution_id)
+    execution = await get_execution_with_relations_async(db, execution_id)
     if not execution:
         raise HTTPException(status_code=404, detail="Execution not found")
     return execution
 
 
 @router.get("/run/{run_id}/list", response_model=List[ExecutionResponse])
-def read_executions_by_run(
+async def read_executions_by_run(
     run_id: int,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_tester: Principal = Depends(get_current_tester_async),
 ):
     """Get all executions for a specific run."""
-    executions = get_executions_by_run(db, run_id)
-    return executions[skip:skip + limit]
+    try:
+        return page.respond(await get_executions_by_run_async(db, run_id, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/device/{device_id}/list", response_model=List[ExecutionResponse])
 def read_executions_by_device(
     device_id: int,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all executions on a specific device."""
-    executions = get_executions_by_device(db, device_id)
-    return executions[skip:skip + limit]
+    try:
+        return page.respond(get_executions_by_device(db, device_id, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/tester/{tester_id}/list", response_model=List[ExecutionResponse])
 def read_executions_by_tester(
     tester_id: int,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all executions performed by a specific tester."""
-    executions = get_executions_by_tester(db, tester_id)
-    return executions[skip:skip + limit]
+    try:
+        return page.respond(get_executions_by_tester(db, tester_id, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/test_case/{test_case_id}/list", response_model=List[ExecutionResponse])
 def read_executions_by_test_case(
     test_case_id: int,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all executions for a specific test case (across all versions)."""
-    executions = get_executions_by_test_case(db, test_case_id)
-    return executions[skip:skip + limit]
+    try:
+        return page.respond(get_executions_by_test_case(db, test_case_id, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/test_suite/{test_suite_id}/list", response_model=List[ExecutionResponse])
 def read_executions_by_test_suite(
     test_suite_id: int,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all executions for test cases in a specific test suite."""
-    executions = get_executions_by_test_suite(db, test_suite_id)
-    return executions[skip:skip + limit]
+    try:
+        return page.respond(get_executions_by_test_suite(db, test_suite_id, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/stats/summary", response_model=ExecutionStatsResponse)
@@ -172,8 +202,8 @@ def read_execution_stats(
     executed_by: int | None = None,
     executed_after: datetime | None = None,
     executed_before: datetime | None = None,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get execution statistics."""
     filters = {}
@@ -198,7 +228,7 @@ def read_execution_stats(
 def bulk_create_executions_from_test_suite(
     request: BulkCreateExecutionsRequest,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Create executions in bulk when test cases are assigned to a test suite."""
     try:
@@ -219,7 +249,7 @@ def bulk_create_executions_from_test_suite(
 def create_new_execution(
     execution_data: ExecutionCreate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Create a new execution (manual creation)."""
     try:
@@ -233,7 +263,7 @@ def update_existing_execution(
     execution_id: int,
     execution_data: ExecutionUpdate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Update an existing execution."""
     execution = get_execution_by_id(db, execution_id)
@@ -254,14 +284,14 @@ def update_existing_execution(
 
 
 @router.patch("/{execution_id}/status", response_model=ExecutionResponse)
-def update_execution_status_endpoint(
+async def update_execution_status_endpoint(
     execution_id: int,
     status_update: ExecutionStatusUpdate,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: AsyncSession = Depends(get_async_db),
+    current_tester: Principal = Depends(get_current_tester_async),
 ):
     """Update an execution's status, actual result, and/or attachment."""
-    execution = get_execution_by_id(db, execution_id)
+    execution = await get_execution_by_id_async(db, execution_id)
     if not execution:
         raise HTTPException(status_code=404, detail="Execution not found")
     
@@ -270,7 +300,7 @@ def update_execution_status_endpoint(
         raise HTTPException(status_code=403, detail="Not authorized to update this execution's status")
     
     try:
-        updated = update_execution_status(
+        updated = await update_execution_status_async(
             db,
             execution_id,
             status_update.status_id,
@@ -289,7 +319,7 @@ def reassign_execution_device_endpoint(
     execution_id: int,
     new_device_id: int,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Reassign an execution to a different device."""
     execution = get_execution_by_id(db, execution_id)
@@ -314,7 +344,7 @@ def reassign_execution_tester_endpoint(
     execution_id: int,
     new_tester_id: int,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Reassign an execution to a different tester."""
     execution = get_execution_by_id(db, execution_id)
@@ -337,8 +367,8 @@ def reassign_execution_tester_endpoint(
 @router.get("/run/{run_id}/summary", response_model=List[ExecutionSummaryResponse])
 def read_run_execution_summary(
     run_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get a summary of all executions in a run with relevant information."""
     from sqlalchemy.orm import aliased
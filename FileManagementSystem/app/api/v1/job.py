@@ -0,0 +1,64 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.database.session import get_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
+from app.schemas.job import JobResponse
+from app.services.job import get_job_by_id, get_jobs, retry_job
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/", response_model=List[JobResponse])
+def read_jobs(
+    page: Pagination = Depends(),
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    attachment_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Get background jobs, newest first."""
+    try:
+        return page.respond(get_jobs(
+            db,
+            skip=page.skip,
+            limit=page.limit,
+            cursor=page.cursor,
+            status=status,
+            kind=kind,
+            attachment_id=attachment_id,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def read_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Get the status of a background job."""
+    job = get_job_by_id(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/{job_id}/retry", response_model=JobResponse)
+def retry_failed_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Requeue a failed job."""
+    try:
+        job = retry_job(db, job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -1,10 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester
+from app.database.session import get_db, get_read_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.project import (
     ProjectCreate,
     ProjectUpdate,
@@ -22,25 +22,28 @@ router = APIRouter(prefix="/projects", tags=["projects"])
 
 @router.get("/", response_model=List[ProjectResponse])
 def read_projects(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    page: Pagination = Depends(),
     client_id: int | None = None,
-    db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_tester),
 ):
-    return get_projects(
-        db=db,
-        skip=skip,
-        limit=limit,
-        client_id=client_id,
-    )
+    try:
+        return page.respond(get_projects(
+            db=db,
+            skip=page.skip,
+            limit=page.limit,
+            cursor=page.cursor,
+            client_id=client_id,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 def read_project(
     project_id: int,
-    db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_tester),
 ):
     project = get_project_by_id(db, project_id)
     if not project:
@@ -52,7 +55,7 @@ def read_project(
 def create_new_project(
     project: ProjectCreate,
     db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    _: Principal = Depends(get_current_tester),
 ):
     return create_project(db, project)
 
@@ -62,7 +65,7 @@ def update_existing_project(
     project_id: int,
     project: ProjectUpdate,
     db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    _: Principal = Depends(get_current_tester),
 ):
     updated = update_project(db, project_id, project)
     if not updated:
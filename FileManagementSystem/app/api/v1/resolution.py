@@ -1,10 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester as TesterModel
+from app.database.session import get_db, get_read_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.resolution import (
     ResolutionCreate,
     ResolutionUpdate,
@@ -12,7 +12,7 @@ from app.schemas.resolution import (
 )
 from app.services.resolution import (
     get_resolutions,
-    get_resolution_by_id,
+    get_cached_resolution,
     create_resolution,
     update_resolution
 )
@@ -22,29 +22,32 @@ router = APIRouter(prefix="/resolutions", tags=["resolutions"])
 
 @router.get("/", response_model=List[ResolutionResponse])
 def read_resolutions(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    page: Pagination = Depends(),
     w: int | None = None,
     h: int | None = None,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
-    return get_resolutions(
-        db=db,
-        skip=skip,
-        limit=limit,
-        w=w,
-        h=h,
-    )
+    try:
+        return page.respond(get_resolutions(
+            db=db,
+            skip=page.skip,
+            limit=page.limit,
+            cursor=page.cursor,
+            w=w,
+            h=h,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{resolution_id}", response_model=ResolutionResponse)
 def read_resolution(
     resolution_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
-    resolution = get_resolution_by_id(db, resolution_id)
+    resolution = get_cached_resolution(db, resolution_id)
     if not resolution:
         raise HTTPException(status_code=404, detail="Resolution not found")
     return resolution
@@ -54,7 +57,7 @@ def read_resolution(
 def create_new_resolution(
     resolution: ResolutionCreate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     try:
         return create_resolution(db, resolution)
@@ -67,7 +70,7 @@ def update_existing_resolution(
     resolution_id: int,
     resolution: ResolutionUpdate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     updated = update_resolution(db, resolution_id, resolution)
     if not updated:
@@ -1,38 +1,48 @@
 # --- /home/oleksiak/FileManagementTool/FileManagementSystem/app/api/v1/run.py ---
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester as TesterModel
+from app.database.session import get_async_read_db, get_db, get_read_db
+from app.api.dependencies import (
+    create_run_events_token,
+    get_current_tester,
+    get_current_tester_async,
+    get_run_events_tester,
+    Pagination,
+)
+from app.config import settings
+from app.utils.principal_cache import Principal
 from app.schemas.run import (
     RunCreate,
     RunUpdate,
     RunResponse,
     RunWithRelationsResponse,
-    RunStatsResponse
+    RunStatsResponse,
+    RunEventsTokenResponse
 )
 from app.services.run import (
-    get_runs,
     get_run_by_id,
     create_run,
     update_run,
-    get_runs_by_project,
-    get_run_stats,
     start_run,
     complete_run,
-    get_active_runs
+    get_active_runs,
+    get_runs_async,
+    get_runs_by_project_async,
+    get_run_stats_async
 )
+from app.services.run_events import run_event_stream
 
 router = APIRouter(prefix="/runs", tags=["runs"])
 
 
 @router.get("/", response_model=List[RunResponse])
-def read_runs(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+async def read_runs(
+    page: Pagination = Depends(),
     name: str | None = None,
     project_id: int | None = None,
     started_after: datetime | None = None,
@@ -40,29 +50,33 @@ def read_runs(
     done_after: datetime | None = None,
     done_before: datetime | None = None,
     completed: bool | None = None,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_tester: Principal = Depends(get_current_tester_async),
 ):
     """Get all runs with optional filtering."""
-    return get_runs(
-        db=db,
-        skip=skip,
-        limit=limit,
-        name=name,
-        project_id=project_id,
-        started_after=started_after,
-        started_before=started_before,
-        done_after=done_after,
-        done_before=done_before,
-        completed=completed,
-    )
+    try:
+        return page.respond(await get_runs_async(
+            db=db,
+            skip=page.skip,
+            limit=page.limit,
+            cursor=page.cursor,
+            name=name,
+            project_id=project_id,
+            started_after=started_after,
+            started_before=started_before,
+            done_after=done_after,
+            done_before=done_before,
+            completed=completed,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{run_id}", response_model=RunWithRelationsResponse)
 def read_run(
     run_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get a specific run by ID."""
     run = get_run_by_id(db, run_id)
@@ -72,35 +86,80 @@ def read_run(
 
 
 @router.get("/project/{project_id}", response_model=List[RunResponse])
-def read_runs_by_project(
+async def read_runs_by_project(
     project_id: int,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_tester: Principal = Depends(get_current_tester_async),
 ):
     """Get all runs for a specific project."""
-    runs = get_runs_by_project(db, project_id)
-    return runs[skip:skip + limit]
+    try:
+        return page.respond(await get_runs_by_project_async(db, project_id, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{run_id}/stats", response_model=RunStatsResponse)
-def read_run_stats(
+async def read_run_stats(
     run_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_tester: Principal = Depends(get_current_tester_async),
 ):
     """Get statistics for a run."""
-    stats = get_run_stats(db, run_id)
+    stats = await get_run_stats_async(db, run_id)
     if not stats:
         raise HTTPException(status_code=404, detail="Run not found")
     return stats
 
 
+@router.post("/{run_id}/events/token", response_model=RunEventsTokenResponse)
+def create_run_events_stream_token(
+    run_id: int,
+    db: Session = Depends(get_db),
+    current_tester: Principal = Depends(get_current_tester),
+):
+    """Short-lived token for opening the run's event stream with EventSource."""
+    if not get_run_by_id(db, run_id):
+        raise HTTPException(status_code=404, detail="Run not found")
+    return RunEventsTokenResponse(
+        token=create_run_events_token(current_tester.id, run_id),
+        expires_in=settings.RUN_EVENTS_TOKEN_MINUTES * 60,
+    )
+
+
+@router.get("/{run_id}/events")
+def stream_run_events(
+    run_id: int,
+    db: Session = Depends(get_db),
+    current_tester: Principal = Depends(get_run_events_tester),
+):
+    """
+    Live progress of a run as Server-Sent Events.
+    
+    Sends a `snapshot` event (the run stats and per-status counts), then an
+    `execution` or `executions_created` event for every committed change,
+    each carrying the new counts of the statuses it touched.
+    
+    Browsers' EventSource cannot set the Authorization header; they pass
+    `?token=` from POST /runs/{run_id}/events/token instead and fetch a new
+    one when the connection errors after the token has expired.
+    """
+    if not get_run_by_id(db, run_id):
+        raise HTTPException(status_code=404, detail="Run not found")
+    # The stream can stay open for hours; do not hold a pooled connection for it
+    db.close()
+    
+    return StreamingResponse(
+        run_event_stream(run_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/active/list", response_model=List[RunResponse])
 def read_active_runs(
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all active runs (started but not completed)."""
     return get_active_runs(db)
@@ -110,7 +169,7 @@ def read_active_runs(
 def create_new_run(
     run_data: RunCreate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Create a new run."""
     try:
@@ -123,7 +182,7 @@ def create_new_run(
 def start_existing_run(
     run_id: int,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Mark a run as started."""
     run = start_run(db, run_id)
@@ -136,7 +195,7 @@ def start_existing_run(
 def complete_existing_run(
     run_id: int,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Mark a run as completed."""
     run = complete_run(db, run_id)
@@ -150,7 +209,7 @@ def update_existing_run(
     run_id: int,
     run_data: RunUpdate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Update an existing run."""
     try:
@@ -1,10 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester
+from app.database.session import get_db, get_read_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.scenario import ScenarioCreate, ScenarioUpdate, ScenarioResponse
 from app.services.scenario import (
     get_scenarios, get_scenario_by_id, create_scenario, update_scenario
@@ -15,19 +15,21 @@ router = APIRouter(prefix="/scenarios", tags=["scenarios"])
 
 @router.get("/", response_model=List[ScenarioResponse])
 def read_scenarios(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_tester),
 ):
-    return get_scenarios(db, skip, limit)
+    try:
+        return page.respond(get_scenarios(db, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{scenario_id}", response_model=ScenarioResponse)
 def read_scenario(
     scenario_id: int,
-    db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_tester),
 ):
     scenario = get_scenario_by_id(db, scenario_id)
     if not scenario:
@@ -39,7 +41,7 @@ def read_scenario(
 def create_new_scenario(
     scenario: ScenarioCreate,
     db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    _: Principal = Depends(get_current_tester),
 ):
     return create_scenario(db, scenario)
 
@@ -49,7 +51,7 @@ def update_existing_scenario(
     scenario_id: int,
     scenario: ScenarioUpdate,
     db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    _: Principal = Depends(get_current_tester),
 ):
     updated = update_scenario(db, scenario_id, scenario)
     if not updated:
@@ -1,10 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester
+from app.database.session import get_db, get_read_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.status_set import StatusSetCreate, StatusSetUpdate, StatusSetResponse
 from app.services.status_set import (
     get_status_sets, get_status_set_by_id, create_status_set, update_status_set
@@ -15,19 +15,21 @@ router = APIRouter(prefix="/status_sets", tags=["status_sets"])
 
 @router.get("/", response_model=List[StatusSetResponse])
 def read_status_sets(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_tester),
 ):
-    return get_status_sets(db, skip, limit)
+    try:
+        return page.respond(get_status_sets(db, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{status_set_id}", response_model=StatusSetResponse)
 def read_status_set(
     status_set_id: int,
-    db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_tester),
 ):
     status_set = get_status_set_by_id(db, status_set_id)
     if not status_set:
@@ -39,7 +41,7 @@ def read_status_set(
 def create_new_status_set(
     status_set: StatusSetCreate,
     db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    _: Principal = Depends(get_current_tester),
 ):
     return create_status_set(db, status_set)
 
@@ -49,7 +51,7 @@ def update_existing_status_set(
     status_set_id: int,
     status_set: StatusSetUpdate,
     db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    _: Principal = Depends(get_current_tester),
 ):
     updated = update_status_set(db, status_set_id, status_set)
     if not updated:
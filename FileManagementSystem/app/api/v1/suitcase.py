@@ -1,11 +1,11 @@
 # --- /home/oleksiak/FileManagementTool/FileManagementSystem/app/api/v1/suitcase.py ---
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester as TesterModel
+from app.database.session import get_db, get_read_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.suitcase import (
     SuitcaseCreate,
     SuitcaseResponse,
@@ -34,28 +34,31 @@ router = APIRouter(prefix="/suitcases", tags=["suitcases"])
 
 @router.get("/", response_model=List[SuitcaseResponse])
 def read_suitcases(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    page: Pagination = Depends(),
     test_case_id: int | None = None,
     test_suite_id: int | None = None,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all suitcases (test case - test suite relationships) with optional filtering."""
-    return get_suitcases(
-        db=db,
-        skip=skip,
-        limit=limit,
-        test_case_id=test_case_id,
-        test_suite_id=test_suite_id,
-    )
+    try:
+        return page.respond(get_suitcases(
+            db=db,
+            skip=page.skip,
+            limit=page.limit,
+            cursor=page.cursor,
+            test_case_id=test_case_id,
+            test_suite_id=test_suite_id,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/test_suite/{test_suite_id}/test_cases", response_model=TestSuiteWithTestCasesResponse)
 def read_test_cases_in_test_suite(
     test_suite_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all test cases in a specific test suite with their latest versions."""
     try:
@@ -67,8 +70,8 @@ def read_test_cases_in_test_suite(
 @router.get("/test_case/{test_case_id}/test_suites", response_model=TestCaseWithTestSuitesResponse)
 def read_test_suites_for_test_case(
     test_case_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all test suites that contain a specific test case."""
     try:
@@ -81,7 +84,7 @@ def read_test_suites_for_test_case(
 def create_new_suitcase(
     suitcase: SuitcaseCreate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Create a new suitcase (link a test case to a test suite)."""
     try:
@@ -95,7 +98,7 @@ def add_test_case_to_suite(
     test_suite_id: int,
     request: AddTestCaseToSuiteRequest,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Add a test case to a test suite."""
     try:
@@ -110,7 +113,7 @@ def add_multiple_test_cases_to_suite(
     test_suite_id: int,
     request: BulkAddTestCasesRequest,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Add multiple test cases to a test suite."""
     try:
@@ -124,7 +127,7 @@ def add_test_suite_to_case(
     test_case_id: int,
     request: AddTestSuiteToCaseRequest,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Add a test case to a test suite."""
     try:
@@ -139,7 +142,7 @@ def add_case_to_multiple_suites(
     test_case_id: int,
     request: BulkAddTestSuitesRequest,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Add a test case to multiple test suites."""
     try:
@@ -1,11 +1,11 @@
 # --- /home/oleksiak/FileManagementTool/FileManagementSystem/app/api/v1/test_case.py ---
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester as TesterModel
+from app.database.session import get_db, get_read_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.test_case import (
     TestCaseCreate, 
     TestCaseUpdate, 
@@ -30,28 +30,31 @@ router = APIRouter(prefix="/test_cases", tags=["test_cases"])
 
 @router.get("/", response_model=List[TestCaseResponse])
 def read_test_cases(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    page: Pagination = Depends(),
     scenario_id: int | None = None,
     status_set_id: int | None = None,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all test cases with optional filtering."""
-    return get_test_cases(
-        db=db,
-        skip=skip,
-        limit=limit,
-        scenario_id=scenario_id,
-        status_set_id=status_set_id,
-    )
+    try:
+        return page.respond(get_test_cases(
+            db=db,
+            skip=page.skip,
+            limit=page.limit,
+            cursor=page.cursor,
+            scenario_id=scenario_id,
+            status_set_id=status_set_id,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{test_case_id}", response_model=TestCaseWithRelationsResponse)
 def read_test_case(
     test_case_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get a specific test case by ID."""
     test_case = get_test_case_by_id(db, test_case_id)
@@ -63,34 +66,36 @@ def read_test_case(
 @router.get("/scenario/{scenario_id}", response_model=List[TestCaseResponse])
 def read_test_cases_by_scenario(
     scenario_id: int,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all test cases for a specific scenario."""
-    test_cases = get_test_cases_by_scenario(db, scenario_id)
-    return test_cases[skip:skip + limit]
+    try:
+        return page.respond(get_test_cases_by_scenario(db, scenario_id, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/status_set/{status_set_id}", response_model=List[TestCaseResponse])
 def read_test_cases_by_status_set(
     status_set_id: int,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all test cases for a specific status set."""
-    test_cases = get_test_cases_by_status_set(db, status_set_id)
-    return test_cases[skip:skip + limit]
+    try:
+        return page.respond(get_test_cases_by_status_set(db, status_set_id, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/", response_model=TestCaseResponse, status_code=status.HTTP_201_CREATED)
 def create_new_test_case(
     test_case_data: TestCaseCreate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Create a new test case."""
     try:
@@ -104,7 +109,7 @@ def update_existing_test_case(
     test_case_id: int,
     test_case_data: TestCaseUpdate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Update an existing test case."""
     try:
@@ -119,8 +124,8 @@ def update_existing_test_case(
 @router.get("/{test_case_id}/with-versions", response_model=TestCaseWithRelationsResponse)
 def read_test_case_with_versions(
     test_case_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get a test case with its versions (returns basic info, versions would be in a separate endpoint)."""
     test_case = get_test_case_with_versions(db, test_case_id)
@@ -132,8 +137,8 @@ def read_test_case_with_versions(
 @router.get("/{test_case_id}/test_suites", response_model=TestCaseWithTestSuitesResponse)
 def read_test_suites_for_test_case(
     test_case_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all test suites that contain this test case."""
     try:
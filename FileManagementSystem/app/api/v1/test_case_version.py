@@ -1,11 +1,11 @@
 # --- /home/oleksiak/FileManagementTool/FileManagementSystem/app/api/v1/test_case_version.py ---
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester as TesterModel
+from app.database.session import get_db, get_read_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.test_case_version import (
     TestCaseVersionCreate,
     TestCaseVersionUpdate,
@@ -30,32 +30,35 @@ router = APIRouter(prefix="/test_case_versions", tags=["test_case_versions"])
 
 @router.get("/", response_model=List[TestCaseVersionResponse])
 def read_test_case_versions(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    page: Pagination = Depends(),
     test_case_id: int | None = None,
     created_by: int | None = None,
     release_ready: bool | None = None,
     version: int | None = None,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all test case versions with optional filtering."""
-    return get_test_case_versions(
-        db=db,
-        skip=skip,
-        limit=limit,
-        test_case_id=test_case_id,
-        created_by=created_by,
-        release_ready=release_ready,
-        version=version,
-    )
+    try:
+        return page.respond(get_test_case_versions(
+            db=db,
+            skip=page.skip,
+            limit=page.limit,
+            cursor=page.cursor,
+            test_case_id=test_case_id,
+            created_by=created_by,
+            release_ready=release_ready,
+            version=version,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{version_id}", response_model=TestCaseVersionWithRelationsResponse)
 def read_test_case_version(
     version_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get a specific test case version by ID."""
     version = get_test_case_version_by_id(db, version_id)
@@ -67,21 +70,22 @@ def read_test_case_version(
 @router.get("/test_case/{test_case_id}", response_model=List[TestCaseVersionResponse])
 def read_versions_by_test_case(
     test_case_id: int,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all versions for a specific test case."""
-    versions = get_versions_by_test_case(db, test_case_id)
-    return versions[skip:skip + limit]
+    try:
+        return page.respond(get_versions_by_test_case(db, test_case_id, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/test_case/{test_case_id}/latest", response_model=TestCaseVersionWithRelationsResponse)
 def read_latest_version_for_test_case(
     test_case_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get the latest version for a test case."""
     version = get_latest_version_for_test_case(db, test_case_id)
@@ -93,8 +97,8 @@ def read_latest_version_for_test_case(
 @router.get("/test_case/{test_case_id}/latest/release-ready", response_model=TestCaseVersionWithRelationsResponse)
 def read_latest_release_ready_version(
     test_case_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get the latest release-ready version for a test case."""
     version = get_latest_release_ready_version(db, test_case_id)
@@ -107,8 +111,8 @@ def read_latest_release_ready_version(
 def read_version_by_test_case_and_number(
     test_case_id: int,
     version_number: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get a specific version by test case ID and version number."""
     version = get_version_by_test_case_and_number(db, test_case_id, version_number)
@@ -121,7 +125,7 @@ def read_version_by_test_case_and_number(
 def create_new_test_case_version(
     version_data: TestCaseVersionCreate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Create a new test case version."""
     # Ensure the creator is the current tester (or an admin can create for others)
@@ -139,7 +143,7 @@ def create_new_version_from_latest(
     test_case_id: int,
     update_data: TestCaseVersionUpdate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Create a new version based on the latest version."""
     try:
@@ -156,7 +160,7 @@ def update_existing_test_case_version(
     version_id: int,
     version_data: TestCaseVersionUpdate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Update an existing test case version."""
     version = get_test_case_version_by_id(db, version_id)
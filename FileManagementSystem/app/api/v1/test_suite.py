@@ -1,10 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester
+from app.database.session import get_db, get_read_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.test_suite import TestSuiteCreate, TestSuiteUpdate, TestSuiteResponse
 from app.schemas.suitcase import TestSuiteWithTestCasesResponse
 from app.services.suitcase import get_test_suite_with_test_cases
@@ -17,19 +17,21 @@ router = APIRouter(prefix="/test_suites", tags=["test_suites"])
 
 @router.get("/", response_model=List[TestSuiteResponse])
 def read_test_suites(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_tester),
 ):
-    return get_test_suites(db, skip, limit)
+    try:
+        return page.respond(get_test_suites(db, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{test_suite_id}", response_model=TestSuiteResponse)
 def read_test_suite(
     test_suite_id: int,
-    db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_tester),
 ):
     test_suite = get_test_suite_by_id(db, test_suite_id)
     if not test_suite:
@@ -41,7 +43,7 @@ def read_test_suite(
 def create_new_test_suite(
     test_suite: TestSuiteCreate,
     db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    _: Principal = Depends(get_current_tester),
 ):
     return create_test_suite(db, test_suite)
 
@@ -51,7 +53,7 @@ def update_existing_test_suite(
     test_suite_id: int,
     test_suite: TestSuiteUpdate,
     db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    _: Principal = Depends(get_current_tester),
 ):
     updated = update_test_suite(db, test_suite_id, test_suite)
     if not updated:
@@ -62,8 +64,8 @@ def update_existing_test_suite(
 @router.get("/{test_suite_id}/test_cases", response_model=TestSuiteWithTestCasesResponse)
 def read_test_cases_in_test_suite(
     test_suite_id: int,
-    db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_tester),
 ):
     """Get all test cases in this test suite with their latest versions."""
     try:
@@ -1,11 +1,12 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester as TesterModel
+from app.database.session import get_db, get_read_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.tester import TesterResponse, TesterCreate, TesterUpdate
+from app.utils.auth import PasswordHasherBusy
 from app.services.tester import (
     get_tester_by_id, 
     get_tester_by_email, 
@@ -20,38 +21,48 @@ router = APIRouter(prefix="/testers", tags=["testers"])
 
 @router.get("/", response_model=List[TesterResponse])
 def read_testers(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    page: Pagination = Depends(),
     email: str | None = None,
     first_name: str | None = None,
     last_name: str | None = None,
     active: bool | None = None,
     tester_type_id: int | None = None,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
-    return get_testers(
-        db=db,
-        skip=skip,
-        limit=limit,
-        email=email,
-        first_name=first_name,
-        last_name=last_name,
-        active=active,
-        tester_type_id=tester_type_id,
-    )
+    try:
+        return page.respond(get_testers(
+            db=db,
+            skip=page.skip,
+            limit=page.limit,
+            cursor=page.cursor,
+            email=email,
+            first_name=first_name,
+            last_name=last_name,
+            active=active,
+            tester_type_id=tester_type_id,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/me", response_model=TesterResponse)
-def read_tester_me(current_tester: TesterModel = Depends(get_current_tester)):
+def read_tester_me(
+    # On the primary, so a tester always sees their own latest changes
+    db: Session = Depends(get_db),
+    current_tester: Principal = Depends(get_current_tester),
+):
     """Get current tester"""
-    return current_tester
+    db_tester = get_tester_by_id(db, tester_id=current_tester.id)
+    if db_tester is None:
+        raise HTTPException(status_code=404, detail="Tester not found")
+    return db_tester
 
 @router.get("/{tester_id}", response_model=TesterResponse)
 def read_tester(
     tester_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester)
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester)
 ):
     """Get specific tester by ID"""
     db_tester = get_tester_by_id(db, tester_id=tester_id)
@@ -64,14 +75,17 @@ def register_tester(
     payload: TesterCreate,
     db: Session = Depends(get_db),
 ):
-    return create_tester_self(db, payload)
+    try:
+        return create_tester_self(db, payload)
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
 
 @router.patch("/{tester_id}", response_model=TesterResponse)
 def update_existing_tester(
     tester_id: int,
     tester: TesterUpdate,
     db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester)
+    current_tester: Principal = Depends(get_current_tester)
 ):
     """Update tester"""
     db_tester = update_tester(db, tester_id, tester)
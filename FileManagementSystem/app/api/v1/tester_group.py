@@ -1,10 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester as TesterModel
+from app.database.session import get_read_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.tester_group import (
     TesterGroupResponse,
     TesterGroupWithMembersResponse,
@@ -19,30 +19,33 @@ router = APIRouter(prefix="/tester_groups", tags=["tester_groups"])
 
 @router.get("/", response_model=List[TesterGroupResponse])
 def read_tester_groups(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    page: Pagination = Depends(),
     name: str | None = None,
     created_by_id: int | None = None,
     owner_id: int | None = None,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get all tester groups with optional filtering."""
-    return get_tester_groups(
-        db=db,
-        skip=skip,
-        limit=limit,
-        name=name,
-        created_by_id=created_by_id,
-        owner_id=owner_id,
-    )
+    try:
+        return page.respond(get_tester_groups(
+            db=db,
+            skip=page.skip,
+            limit=page.limit,
+            cursor=page.cursor,
+            name=name,
+            created_by_id=created_by_id,
+            owner_id=owner_id,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{group_id}", response_model=TesterGroupWithMembersResponse)
 def read_tester_group(
     group_id: int,
-    db: Session = Depends(get_db),
-    current_tester: TesterModel = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    current_tester: Principal = Depends(get_current_tester),
 ):
     """Get a specific tester group by ID with members."""
     try:
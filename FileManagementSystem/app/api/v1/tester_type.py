@@ -1,10 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database.session import get_db
-from app.api.dependencies import get_current_tester
-from app.database.models import Tester
+from app.database.session import get_db, get_read_db
+from app.api.dependencies import get_current_tester, Pagination
+from app.utils.principal_cache import Principal
 from app.schemas.tester_type import (
     TesterTypeCreate,
     TesterTypeUpdate,
@@ -22,19 +22,21 @@ router = APIRouter(prefix="/tester_types", tags=["tester_types"])  # Changed pre
 
 @router.get("/", response_model=List[TesterTypeResponse])
 def read_tester_types(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    page: Pagination = Depends(),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_tester),
 ):
-    return get_tester_types(db, skip, limit)
+    try:
+        return page.respond(get_tester_types(db, page.skip, page.limit, page.cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{tester_type_id}", response_model=TesterTypeResponse)  # Changed parameter name
 def read_tester_type(
     tester_type_id: int,  # Changed parameter name
-    db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_tester),
 ):
     tester_type = get_tester_type_by_id(db, tester_type_id)
     if not tester_type:
@@ -46,6 +48,6 @@ def read_tester_type(
 def create_new_tester_type(
     tester_type: TesterTypeCreate,
     db: Session = Depends(get_db),
-    _: Tester = Depends(get_current_tester),
+    _: Principal = Depends(get_current_tester),
 ):
     return create_tester_type(db, tester_type)
\ No newline at end of file
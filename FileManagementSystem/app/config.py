@@ -1,7 +1,7 @@
 import json
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
@@ -23,23 +23,91 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
     
+    # Connection pools (per engine: the primary and each replica, sync and async)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # wait for a free connection before failing the request
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # reconnect older connections; keep below proxy/firewall idle timeouts
+    
+    # Read replicas for read-only endpoints: comma-separated host[:port], same credentials and database
+    DB_REPLICA_HOSTS: str = ""
+    DB_REPLICA_CHECK_SECONDS: float = 5.0  # health check interval; a down replica is retried this often
+    DB_REPLICA_MAX_LAG_SECONDS: float = 10.0  # replicas further behind the primary are skipped
+    
     # JWT
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PRINCIPAL_CACHE_SIZE: int = 10000  # authenticated testers kept per API process; 0 disables
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0  # upper bound for a deactivation to reach every process
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # stored hashes with other rounds are rehashed at the next login
+    PASSWORD_HASH_WORKERS: int = 2  # bcrypt processes per API process
+    PASSWORD_HASH_MAX_PENDING: int = 32  # queued + running hashes before requests get 429
+    
+    # Reference-data cache (statuses, status sets, resolutions, scenarios, tester types, clients, projects)
+    REFERENCE_DATA_TTL_SECONDS: float = 300.0  # safety net; writes refresh every process via NOTIFY
 
     
     UPLOAD_DIR: str = "uploads"
     MAX_UPLOAD_SIZE: int = 100 * 1024 * 1024  # 100MB
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # 1MB writes while streaming uploads
+    CONTENT_ADDRESSED_STORAGE: bool = False  # Store uploads once per SHA-256 digest
+    CLEANUP_GRACE_MINUTES: int = 60  # files newer than this may belong to an upload still in progress
+    
+    # Resumable uploads
+    MAX_RESUMABLE_UPLOAD_SIZE: int = 20 * 1024 * 1024 * 1024  # 20GB
+    RESUMABLE_CHUNK_SIZE: int = 8 * 1024 * 1024  # 8MB
+    MAX_RESUMABLE_CHUNK_SIZE: int = 64 * 1024 * 1024  # 64MB
+    RESUMABLE_UPLOAD_TTL_HOURS: int = 24
+    
+    # Background jobs
+    JOB_WORKER_CONCURRENCY: int = 2  # worker processes per `cli.py worker`
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: int = 30  # doubled after every failed attempt
+    JOB_LOCK_TIMEOUT_MINUTES: int = 30  # running jobs older than this are requeued
+    
+    # Live run progress (/runs/{id}/events)
+    RUN_EVENTS_QUEUE_SIZE: int = 100  # pending events per client before it is sent a fresh snapshot
+    RUN_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    RUN_EVENTS_RETRY_MS: int = 3000  # EventSource reconnect delay
+    RUN_EVENTS_LISTEN_TIMEOUT_SECONDS: float = 5.0  # wait for LISTEN before a client's first snapshot
+    RUN_EVENTS_TOKEN_MINUTES: int = 5  # lifetime of the ?token= of EventSource clients
     ALLOWED_EXTENSIONS: list = ['.txt', '.pdf', '.png', '.jpg', '.jpeg', '.gif', '.csv', '.json', '.xml']
     
     @property
     def UPLOAD_PATH(self) -> Path:
         return BASE_DIR / self.UPLOAD_DIR
     
+    def _database_url(self, scheme: str, host: str, port: int) -> str:
+        return f"{scheme}://{self.DB_USER}:{self.DB_PASSWORD}@{host}:{port}/{self.DB_NAME}"
+    
+    def _replica_addresses(self) -> List[Tuple[str, int]]:
+        addresses = []
+        for entry in self.DB_REPLICA_HOSTS.split(","):
+            entry = entry.strip()
+            if entry:
+                host, _, port = entry.partition(":")
+                addresses.append((host, int(port) if port else self.DB_PORT))
+        return addresses
+    
     @property
     def DATABASE_URL(self) -> str:
-        return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        return self._database_url("postgresql", self.DB_HOST, self.DB_PORT)
+    
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return self._database_url("postgresql+asyncpg", self.DB_HOST, self.DB_PORT)
+    
+    @property
+    def REPLICA_DATABASE_URLS(self) -> List[str]:
+        return [self._database_url("postgresql", host, port) for host, port in self._replica_addresses()]
+    
+    @property
+    def ASYNC_REPLICA_DATABASE_URLS(self) -> List[str]:
+        return [self._database_url("postgresql+asyncpg", host, port) for host, port in self._replica_addresses()]
     
     class Config:
         env_file = ".env"
@@ -1,6 +1,6 @@
 from sqlalchemy import (
-    Column, Integer, String, Boolean, ForeignKey, Text,
-    DateTime, JSON, UniqueConstraint, Index
+    Column, Integer, BigInteger, String, Boolean, ForeignKey, Text,
+    DateTime, JSON, Numeric, UniqueConstraint, Index
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -108,6 +108,10 @@ class TesterGroup(Base):
         back_populates="tester_group"
     )
 
+    __table_args__ = (
+        Index("tester_group_name_id_idx", "name", "id"),
+    )
+
 
 # -------------------------
 # REMAINING TABLES (unchanged)
@@ -206,6 +210,7 @@ class TestCaseVersion(Base):
 
     __table_args__ = (
         UniqueConstraint("test_case_id", "version", name="test_case_version_unique"),
+        Index("test_case_version_version_id_idx", "version", "id"),
     )
 
 # -------------------------
@@ -243,6 +248,10 @@ class Run(Base):
     project = relationship("Project")
     executions = relationship("Execution", back_populates="run")
 
+    __table_args__ = (
+        Index("run_started_at_id_idx", "started_at", "id"),
+    )
+
 
 # -------------------------
 # ATTACHMENTS
@@ -260,12 +269,16 @@ class Attachment(Base):
     filename = Column(String)
     relative_path = Column(String)
 
+    content_hash = Column(String(64))  # SHA-256 hex digest of the file
+    file_size = Column(BigInteger)
+
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
 
     presentmon_file = Column(Boolean)
     presentmon_version = Column(String)
 
     settings = Column(JSON)
+    metrics = Column(JSON)  # PresentMon frame-time metrics, computed on demand
 
     parent = relationship(
         "Attachment",
@@ -284,6 +297,9 @@ class Attachment(Base):
         Index("attachment_uploaded_by_idx", "uploaded_by"),
         Index("attachment_filename_idx", "filename"),
         Index("attachment_uploaded_at_idx", "uploaded_at"),
+        Index("attachment_content_hash_idx", "content_hash", "file_size"),
+        Index("attachment_uploaded_at_id_idx", "uploaded_at", "id"),
+        Index("attachment_uploader_uploaded_at_idx", "uploaded_by", "uploaded_at", "id"),
     )
 
 
@@ -323,4 +339,71 @@ class Execution(Base):
             "test_case_version_id",
             name="execution_run_version_unique"
         ),
+        # Matches the list order: newest first, then execution order
+        Index("execution_executed_at_order_idx", executed_at.desc(), execution_order, id),
+        # Equality filter + the same order, one per filterable foreign key
+        Index("execution_device_executed_at_idx", device_id, executed_at.desc(), execution_order, id),
+        Index("execution_tester_executed_at_idx", executed_by, executed_at.desc(), execution_order, id),
+        Index("execution_status_executed_at_idx", status_id, executed_at.desc(), execution_order, id),
+        Index("execution_version_executed_at_idx", test_case_version_id, executed_at.desc(), execution_order, id),
+        # Per-run listing, which follows the planned execution order
+        Index("execution_run_order_idx", run_id, execution_order, executed_at.desc(), id),
+        # Most executions have no attachment; only the ones that do are looked up by it
+        Index("execution_attachment_idx", attachment_id, postgresql_where=attachment_id.isnot(None)),
+    )
+
+
+class RunStatusCount(Base):
+    """Executions per (run, status), kept in step with every execution write."""
+    __tablename__ = "run_status_count"
+
+    run_id = Column(Integer, ForeignKey("run.id"), primary_key=True)
+    status_id = Column(Integer, ForeignKey("status.id"), primary_key=True)
+
+    count = Column(Integer, nullable=False, default=0)
+    # Executions with executed_at set, and the exact sum of their executed_at
+    # in epoch seconds, for the average execution time of a run
+    executed_count = Column(Integer, nullable=False, default=0)
+    executed_at_sum = Column(Numeric, nullable=False, default=0)
+
+    status = relationship("Status")
+
+
+# -------------------------
+# BACKGROUND JOBS
+# -------------------------
+
+class Job(Base):
+    __tablename__ = "job"
+
+    id = Column(Integer, primary_key=True)
+
+    kind = Column(String, nullable=False)
+    payload = Column(JSON)
+
+    # queued -> running -> succeeded | failed (queued again while retries remain)
+    status = Column(String, nullable=False, default="queued")
+    priority = Column(Integer, nullable=False, default=0)  # higher runs first
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime(timezone=True), server_default=func.now())
+
+    locked_by = Column(String)
+    locked_at = Column(DateTime(timezone=True))
+
+    result = Column(JSON)
+    last_error = Column(Text)
+
+    attachment_id = Column(Integer, ForeignKey("attachment.id"))
+    created_by = Column(Integer, ForeignKey("tester.id"))
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
+
+    attachment = relationship("Attachment")
+
+    __table_args__ = (
+        Index("job_dequeue_idx", "status", "priority", "run_after"),
+        Index("job_attachment_idx", "attachment_id"),
     )
@@ -0,0 +1,239 @@
+import itertools
+import math
+import threading
+import time
+from typing import Any, List, Mapping, Optional, Sequence
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+# Execution option that keeps a read on the primary, e.g. for data that is
+# cached after a write and must not be read from a replica that lags
+USE_PRIMARY = "use_primary"
+
+# How far a replica is behind the primary, in seconds; 0 when it has
+# replayed everything it received (an idle primary is not counted as lag).
+# NULL when its WAL receiver is not streaming: it then receives nothing, so
+# replaying all it received says nothing about the primary. Reading the
+# receiver's status takes pg_read_all_stats (e.g. via pg_monitor) for the
+# database user; without it every replica reports NULL.
+REPLICATION_LAG = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+# Cookie holding the time of a client's last write request, so its reads
+# stay on the primary until every replica in rotation has that write
+LAST_WRITE_COOKIE = "db_last_write"
+
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+def wrote_recently(cookies: Mapping[str, str], window_seconds: float) -> bool:
+    """Whether the client's last write request was less than `window_seconds` ago."""
+    try:
+        written_at = float(cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    # Allow for clock differences between the API processes
+    return abs(time.time() - written_at) < window_seconds
+
+
+class ReadYourWritesMiddleware:
+    """
+    Stamps every response to a write request with the LAST_WRITE_COOKIE.
+
+    Read sessions of a client that wrote within the window are opened on
+    the primary (see get_read_db), so a client reads its own writes across
+    requests, e.g. a GET right after the POST that created the resource.
+    Clients that do not keep cookies (scripts, most API clients) get no
+    such guarantee and may read from a lagging replica after a write.
+    Plain ASGI rather than BaseHTTPMiddleware, so streamed responses pass
+    through untouched.
+    """
+
+    def __init__(self, app: Any, window_seconds: float):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Any) -> None:
+            if message["type"] == "http.response.start":
+                # Sent after the handler returned, so after its commit
+                cookie = (
+                    f"{LAST_WRITE_COOKIE}={time.time():.3f}; Max-Age={math.ceil(self.window_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message.setdefault("headers", []).append((b"set-cookie", cookie.encode("latin-1")))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+class ReplicaSet:
+    """
+    Health of the read replicas, shared by every routing session of a process.
+
+    A background thread probes each replica every `check_interval` seconds
+    and takes out of rotation those that are unreachable, not streaming
+    from the primary or more than `max_lag_seconds` behind it. A replica whose connection fails
+    during a request is taken out at once and comes back with the next
+    probe that finds it healthy.
+
+    The thread starts with the first choose(), so processes that never read
+    from a replica (the CLI, the job worker) never start it.
+    """
+
+    def __init__(self, engines: Sequence[Engine], check_interval: float, max_lag_seconds: float):
+        self.engines = list(engines)
+        self.check_interval = check_interval
+        self.max_lag_seconds = max_lag_seconds
+        self._healthy = [True] * len(self.engines)
+        # Lag measured by the last probe; None until probed or when
+        # unreachable, inf when not streaming from the primary
+        self.lag_seconds: List[Optional[float]] = [None] * len(self.engines)
+        self._turn = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        for index, engine in enumerate(self.engines):
+            self.watch(engine, index)
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def healthy(self) -> List[int]:
+        return [index for index, healthy in enumerate(self._healthy) if healthy]
+
+    def choose(self) -> Optional[int]:
+        """The index of the replica for a new session (round robin over healthy ones), or None for the primary."""
+        if not self.engines:
+            return None
+        self._start()
+        healthy = self.healthy()
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    def watch(self, engine: Engine, index: int) -> None:
+        """Take replica `index` out of rotation whenever `engine`, which connects to it, cannot connect or is disconnected."""
+        def on_error(context: Any) -> None:
+            if context.is_disconnect or context.connection is None:
+                self._set_healthy(index, False, "connection failed")
+
+        event.listen(engine, "handle_error", on_error)
+
+    def check(self) -> None:
+        """Probe every replica once."""
+        for index, engine in enumerate(self.engines):
+            try:
+                with engine.connect() as connection:
+                    lag = connection.execute(REPLICATION_LAG).scalar()
+            except (SQLAlchemyError, OSError) as e:
+                self.lag_seconds[index] = None
+                self._set_healthy(index, False, f"probe failed: {e}")
+                continue
+            if lag is None:
+                # Cut off from the primary: the lag is unknown and growing
+                self.lag_seconds[index] = math.inf
+                self._set_healthy(index, False, "WAL receiver not streaming")
+                continue
+            lag = float(lag)
+            self.lag_seconds[index] = lag
+            if lag > self.max_lag_seconds:
+                self._set_healthy(index, False, f"{lag:.1f}s behind the primary")
+            else:
+                self._set_healthy(index, True, "healthy")
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="replica-health", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self.check()
+            self._stopping.wait(self.check_interval)
+
+    def _set_healthy(self, index: int, healthy: bool, reason: str) -> None:
+        with self._lock:
+            if self._healthy[index] == healthy:
+                return
+            self._healthy[index] = healthy
+        url = self.engines[index].url
+        state = "back in rotation" if healthy else "out of rotation"
+        print(f"[DB] Replica {url.host}:{url.port} {state} ({reason})")
+
+
+class RoutingSession(Session):
+    """
+    A Session that sends plain reads to a read replica.
+
+    Statements go to the primary (the session's bind) when they write or
+    lock (INSERT/UPDATE/DELETE, flushes, SELECT ... FOR UPDATE, raw SQL),
+    when they carry the use_primary execution option, or when no replica is
+    healthy. A session that has written stays on the primary for the rest
+    of its life, so it reads its own writes. All replica reads of a session
+    go to the replica picked for its first read.
+
+    For read-only endpoints: a service that reads rows and then writes
+    based on them must use a primary session, as the replica may lag.
+    """
+
+    def __init__(self, *args: Any, replicas: Sequence[Engine] = (), replica_set: Optional[ReplicaSet] = None, **kw: Any):
+        super().__init__(*args, **kw)
+        # replicas[i] connects to the replica that replica_set tracks at index i
+        self.replicas = list(replicas)
+        self.replica_set = replica_set
+        self._replica: Optional[Engine] = None
+        self._primary_only = False
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Engine:
+        primary = super().get_bind(mapper=mapper, clause=clause, **kw)
+        if self._primary_only or not self.replicas or self.replica_set is None:
+            return primary
+
+        if self._flushing or not self._is_clean():
+            self._primary_only = True
+            return primary
+        if clause is None:
+            # No statement: a caller asking for the session's engine or connection
+            return primary
+        if not self._is_plain_read(clause):
+            self._primary_only = True
+            return primary
+        if clause.get_execution_options().get(USE_PRIMARY):
+            return primary
+
+        if self._replica is None:
+            index = self.replica_set.choose()
+            if index is None:
+                return primary
+            self._replica = self.replicas[index]
+        return self._replica
+
+    @staticmethod
+    def _is_plain_read(clause: Any) -> bool:
+        return isinstance(clause, Select) and clause._for_update_arg is None
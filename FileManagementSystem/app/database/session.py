@@ -1,18 +1,98 @@
+from typing import AsyncIterator
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from app.config import settings
+from app.database.routing import ReplicaSet, RoutingSession, wrote_recently
+
+# Applied to every engine below; each holds up to pool_size + max_overflow
+# connections per process
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=True,
+)
 
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=False  # Set to True for SQL logging
+    echo=False,  # Set to True for SQL logging
+    **POOL_OPTIONS
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# asyncpg engine for the async endpoints: a request waiting on the database
+# holds no thread, so concurrency is bounded by the pool rather than by
+# the threadpool that runs the sync handlers
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    echo=False,
+    **POOL_OPTIONS
+)
+
+# Objects stay readable after commit; lazy loads are not possible on an
+# AsyncSession, so responses must not depend on a refresh
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Read replicas, in DB_REPLICA_HOSTS order. The sync engines also run the
+# health checks; the async engines report connection failures to the same set
+replica_engines = [create_engine(url, **POOL_OPTIONS) for url in settings.REPLICA_DATABASE_URLS]
+async_replica_engines = [create_async_engine(url, **POOL_OPTIONS) for url in settings.ASYNC_REPLICA_DATABASE_URLS]
+replica_set = ReplicaSet(replica_engines, settings.DB_REPLICA_CHECK_SECONDS, settings.DB_REPLICA_MAX_LAG_SECONDS)
+for index, replica in enumerate(async_replica_engines):
+    replica_set.watch(replica.sync_engine, index)
+
+# A replica may fall this far behind before a health check takes it out of
+# rotation, so clients that wrote more recently read from the primary
+READ_YOUR_WRITES_SECONDS = settings.DB_REPLICA_MAX_LAG_SECONDS + settings.DB_REPLICA_CHECK_SECONDS
+
+# Sessions for read-only endpoints: reads go to a healthy replica, anything
+# else (and everything, when no replica is configured) to the primary
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    replicas=replica_engines,
+    replica_set=replica_set,
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_engine,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+    replicas=[replica.sync_engine for replica in async_replica_engines],
+    replica_set=replica_set,
+)
+
 def get_db() -> Session:
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_read_db(request: Request) -> Session:
+    if wrote_recently(request.cookies, READ_YOUR_WRITES_SECONDS):
+        db = SessionLocal()
+    else:
+        db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    if wrote_recently(request.cookies, READ_YOUR_WRITES_SECONDS):
+        session_factory = AsyncSessionLocal
+    else:
+        session_factory = AsyncReadSessionLocal
+    async with session_factory() as db:
+        yield db
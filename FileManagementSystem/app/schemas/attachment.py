@@ -1,6 +1,6 @@
 # --- /home/oleksiak/FileManagementTool/FileManagementSystem/app/schemas/attachment.py ---
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from pydantic import BaseModel, Field
 
 
@@ -12,6 +12,8 @@ class AttachmentBase(BaseModel):
     presentmon_file: bool = False
     presentmon_version: Optional[str] = None
     settings: Optional[Dict[str, Any]] = None
+    content_hash: Optional[str] = None
+    file_size: Optional[int] = None
 
 
 class AttachmentCreate(AttachmentBase):
@@ -48,12 +50,100 @@ class AttachmentWithRelationsResponse(AttachmentResponse):
         from_attributes = True
 
 
+class AttachmentLineageResponse(AttachmentResponse):
+    depth: int  # distance from the attachment the lineage was requested for
+
+
 class FileUploadResponse(BaseModel):
     message: str
     attachment_id: int
     filename: str
     file_path: str
     file_url: str
+    job_id: Optional[int] = None  # background processing of derived data
+
+
+class AttachmentVersionUploadForm(BaseModel):
+    subdirectory: str = ""
+
+
+class AttachmentUploadForm(AttachmentVersionUploadForm):
+    resolution_id: Optional[int] = None
+    parent_attachment_id: Optional[int] = None
+    presentmon_file: bool = False
+    presentmon_version: Optional[str] = None
+
+
+class ResumableUploadCreate(AttachmentUploadForm):
+    filename: str
+    total_size: int = Field(..., ge=0)
+    chunk_size: Optional[int] = Field(None, ge=1)
+    content_hash: Optional[str] = Field(None, pattern="^[0-9a-fA-F]{64}$")  # SHA-256, verified on finalize
+
+
+class ResumableUploadStatusResponse(BaseModel):
+    upload_id: str
+    filename: str
+    total_size: int
+    chunk_size: int
+    chunk_count: int
+    received_chunks: List[int]
+    missing_chunks: List[int]
+    missing_ranges: List[Tuple[int, int]]  # Inclusive byte ranges
+    bytes_received: int
+    complete: bool
+    expires_at: datetime
+
+
+class ResumableChunkResponse(BaseModel):
+    upload_id: str
+    index: int
+    size: int
+
+
+class FrameTimeStats(BaseModel):
+    mean: float
+    min: float
+    max: float
+    std: float
+    p50: float
+    p90: float
+    p95: float
+    p99: float
+    p99_9: float
+
+
+class AttachmentMetricsResponse(BaseModel):
+    attachment_id: int
+    presentmon_version: Optional[str] = None
+    presentmon_schema: str
+    metrics_version: int
+    frame_count: int
+    duration_seconds: float
+    average_fps: float
+    fps_1_percent_low: float
+    fps_0_1_percent_low: float
+    frame_time_ms: FrameTimeStats
+    stutter_threshold_ms: float
+    stutter_count: int
+    gpu_bound_ratio: Optional[float] = None
+    cpu_bound_ratio: Optional[float] = None
+
+
+class AttachmentSeriesResponse(BaseModel):
+    attachment_id: int
+    presentmon_version: Optional[str] = None
+    presentmon_schema: str
+    column: str
+    columns: List[str]
+    start: Optional[float] = None
+    end: Optional[float] = None
+    frame_count: int
+    level: int
+    bucket_frames: int
+    t: List[float]
+    min: List[Optional[float]]
+    max: List[Optional[float]]
 
 
 class AttachmentFilter(BaseModel):
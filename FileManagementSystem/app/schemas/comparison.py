@@ -0,0 +1,56 @@
+from typing import Optional, List, Dict
+from pydantic import BaseModel, Field
+
+
+class ComparisonSlice(BaseModel):
+    """A set of executions to compare: one run, optionally narrowed to a device and resolution."""
+    run_id: int
+    device_id: Optional[int] = None
+    resolution_id: Optional[int] = None
+    label: Optional[str] = None
+
+
+class ComparisonRequest(BaseModel):
+    # The first slice is the baseline every other slice is compared against
+    slices: List[ComparisonSlice] = Field(..., min_length=2, max_length=10)
+    metrics: Optional[List[str]] = None  # defaults to every comparable metric
+
+
+class MetricDelta(BaseModel):
+    baseline: Optional[float] = None
+    value: Optional[float] = None
+    delta: Optional[float] = None
+    delta_percent: Optional[float] = None
+    ci_low: Optional[float] = None
+    ci_high: Optional[float] = None
+    baseline_samples: int
+    samples: int
+
+
+class TestCaseComparison(BaseModel):
+    test_case_id: int
+    name: Optional[str] = None
+    # Slice label -> metric name -> delta against the baseline
+    slices: Dict[str, Dict[str, MetricDelta]]
+
+
+class SliceSummary(BaseModel):
+    label: str
+    run_id: int
+    device_id: Optional[int] = None
+    resolution_id: Optional[int] = None
+    captures: int
+    test_cases: int
+    # Metric name -> geometric mean of value / baseline over matched test cases
+    ratio: Dict[str, Optional[float]] = {}
+
+
+class ComparisonResponse(BaseModel):
+    baseline: str
+    metrics: List[str]
+    slices: List[SliceSummary]
+    test_cases: List[TestCaseComparison]
+    # Slice label -> test cases present in only one of it and the baseline
+    unmatched_test_cases: Dict[str, List[int]] = {}
+    # PresentMon attachments that could not be analyzed
+    skipped_attachments: List[int] = []
@@ -43,6 +43,7 @@ class ExecutionWithRelationsResponse(ExecutionResponse):
     device: Optional[Dict[str, Any]] = None
     run: Optional[Dict[str, Any]] = None
     test_case_version: Optional[Dict[str, Any]] = None
+    test_case: Optional[Dict[str, Any]] = None
     executor: Optional[Dict[str, Any]] = None
     status: Optional[Dict[str, Any]] = None
     attachment: Optional[Dict[str, Any]] = None
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional, Dict, Any
+from pydantic import BaseModel
+
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    payload: Optional[Dict[str, Any]] = None
+    status: str
+    priority: int
+    attempts: int
+    max_attempts: int
+    run_after: Optional[datetime] = None
+    locked_by: Optional[str] = None
+    locked_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    last_error: Optional[str] = None
+    attachment_id: Optional[int] = None
+    created_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -53,6 +53,11 @@ class RunStatsResponse(BaseModel):
     duration_seconds: Optional[float] = None
 
 
+class RunEventsTokenResponse(BaseModel):
+    token: str
+    expires_in: int  # seconds
+
+
 class RunFilter(BaseModel):
     name: Optional[str] = None
     project_id: Optional[int] = None
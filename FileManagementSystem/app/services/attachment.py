@@ -2,14 +2,29 @@
 import os
 import shutil
 import uuid
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select, literal
 
 from app.database.models import Attachment, Tester, Resolution
 from app.schemas.attachment import AttachmentCreate, AttachmentUpdate
 from app.config import settings
+from app.services.reference_data import reference_data
+from app.utils.files import file_storage
+from app.utils.columnar import ColumnarCapture, columnar_cache
+from app.utils.presentmon import CHUNK_ROWS, METRICS_VERSION, metrics_from_chunks
+from app.utils.series import SeriesPyramid
+from app.utils.pagination import SortKey, paginate, paginate_async
+
+ATTACHMENT_SORT = (
+    SortKey(Attachment.uploaded_at, descending=True),
+    SortKey(Attachment.id, descending=True),
+)
+
+# Hard stop for the recursive lineage queries, so a parent cycle cannot make them run forever
+MAX_ATTACHMENT_TREE_DEPTH = 1000
 
 
 def get_attachment_by_id(db: Session, attachment_id: int) -> Optional[Attachment]:
@@ -17,19 +32,31 @@ def get_attachment_by_id(db: Session, attachment_id: int) -> Optional[Attachment
     return db.query(Attachment).filter(Attachment.id == attachment_id).first()
 
 
-def get_attachments(
-    db: Session,
-    skip: int = 0,
-    limit: int = 100,
+def get_attachment_by_content(db: Session, content_hash: str, file_size: int) -> Optional[Attachment]:
+    """Get an attachment whose file has the given digest and size."""
+    return db.query(Attachment).filter(
+        Attachment.content_hash == content_hash,
+        Attachment.file_size == file_size
+    ).order_by(Attachment.id).first()
+
+
+def count_file_references(db: Session, relative_path: str, filename: str) -> int:
+    """Count the attachments that point at a stored file."""
+    return db.query(Attachment).filter(
+        Attachment.relative_path == relative_path,
+        Attachment.filename == filename
+    ).count()
+
+
+def _filter_attachments(
+    query: Any,
     filename: Optional[str] = None,
     uploaded_by: Optional[int] = None,
     resolution_id: Optional[int] = None,
     parent_attachment_id: Optional[int] = None,
     presentmon_file: Optional[bool] = None,
-) -> List[Attachment]:
-    """Get multiple attachments with optional filtering."""
-    query = db.query(Attachment)
-
+) -> Any:
+    """Apply the attachment list filters to a Query or a select() of Attachment."""
     if filename:
         query = query.filter(Attachment.filename.ilike(f"%{filename}%"))
     if uploaded_by is not None:
@@ -44,11 +71,29 @@ def get_attachments(
     if presentmon_file is not None:
         query = query.filter(Attachment.presentmon_file == presentmon_file)
 
-    return query.order_by(Attachment.uploaded_at.desc()).offset(skip).limit(limit).all()
+    return query
+
+
+def get_attachments(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    filename: Optional[str] = None,
+    uploaded_by: Optional[int] = None,
+    resolution_id: Optional[int] = None,
+    parent_attachment_id: Optional[int] = None,
+    presentmon_file: Optional[bool] = None,
+) -> List[Attachment]:
+    """Get multiple attachments with optional filtering."""
+    query = _filter_attachments(
+        db.query(Attachment), filename, uploaded_by, resolution_id, parent_attachment_id, presentmon_file
+    )
+    return paginate(query, ATTACHMENT_SORT, skip, limit, cursor)
 
 
-def create_attachment(db: Session, attachment_in: AttachmentCreate) -> Attachment:
-    """Create a new attachment record."""
+def create_attachment(db: Session, attachment_in: AttachmentCreate, commit: bool = True) -> Attachment:
+    """Create a new attachment record. With commit=False it is only flushed, to commit together with the caller's changes."""
     # Check if uploader exists
     uploader = db.query(Tester).filter(Tester.id == attachment_in.uploaded_by).first()
     if not uploader:
@@ -56,7 +101,7 @@ def create_attachment(db: Session, attachment_in: AttachmentCreate) -> Attachmen
     
     # Check if resolution exists if provided
     if attachment_in.resolution_id:
-        resolution = db.query(Resolution).filter(Resolution.id == attachment_in.resolution_id).first()
+        resolution = reference_data.get(db, Resolution, attachment_in.resolution_id)
         if not resolution:
             raise ValueError(f"Resolution with ID {attachment_in.resolution_id} does not exist")
     
@@ -70,7 +115,10 @@ def create_attachment(db: Session, attachment_in: AttachmentCreate) -> Attachmen
     db.add(attachment)
     
     try:
-        db.commit()
+        if commit:
+            db.commit()
+        else:
+            db.flush()
     except IntegrityError as e:
         db.rollback()
         if "foreign key constraint" in str(e).lower():
@@ -114,30 +162,119 @@ def update_attachment(
     return attachment
 
 
-def get_attachments_by_uploader(db: Session, uploader_id: int) -> List[Attachment]:
-    """Get all attachments uploaded by a specific tester."""
-    return db.query(Attachment).filter(Attachment.uploaded_by == uploader_id).all()
+def get_attachments_by_uploader(
+    db: Session, uploader_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Attachment]:
+    """Get one page of the attachments uploaded by a specific tester, newest first."""
+    query = db.query(Attachment).filter(Attachment.uploaded_by == uploader_id)
+    return paginate(query, ATTACHMENT_SORT, skip, limit, cursor)
 
 
-def get_attachment_tree(db: Session, parent_id: Optional[int] = None) -> List[Dict[str, Any]]:
-    """Get attachments as a tree structure."""
-    query = db.query(Attachment).filter(Attachment.parent_attachment_id == parent_id)
-    attachments = query.all()
-    
+def _descendants_cte(parent_id: Optional[int], max_depth: Optional[int], first_depth: int = 0):
+    """
+    WITH RECURSIVE walk over parent_attachment_id, starting at the children of
+    `parent_id` (the root attachments when None), which get depth `first_depth`.
+    Nothing deeper than `max_depth` is returned.
+    """
+    depth_limit = min(max_depth if max_depth is not None else MAX_ATTACHMENT_TREE_DEPTH, MAX_ATTACHMENT_TREE_DEPTH)
+    if parent_id is None:
+        start = Attachment.parent_attachment_id.is_(None)
+    else:
+        start = Attachment.parent_attachment_id == parent_id
+
+    tree = select(Attachment.id, literal(first_depth).label("depth")).where(start).cte("tree", recursive=True)
+    return tree.union_all(
+        select(Attachment.id, tree.c.depth + 1)
+        .join(tree, Attachment.parent_attachment_id == tree.c.id)
+        .where(tree.c.depth < depth_limit)
+    )
+
+
+def _ancestors_cte(attachment_id: int):
+    """WITH RECURSIVE walk from an attachment up to its root; the parent has depth 1."""
+    lineage = select(
+        Attachment.parent_attachment_id.label("id"), literal(1).label("depth")
+    ).where(
+        Attachment.id == attachment_id,
+        Attachment.parent_attachment_id.isnot(None)
+    ).cte("lineage", recursive=True)
+    return lineage.union_all(
+        select(Attachment.parent_attachment_id, lineage.c.depth + 1)
+        .join(lineage, Attachment.id == lineage.c.id)
+        .where(
+            Attachment.parent_attachment_id.isnot(None),
+            lineage.c.depth < MAX_ATTACHMENT_TREE_DEPTH
+        )
+    )
+
+
+def get_attachment_tree_rows(
+    db: Session, parent_id: Optional[int] = None, max_depth: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get the (sub)tree below `parent_id` as a flat adjacency list in one query.
+
+    Rows are ordered by depth, so every parent comes before its children.
+    """
+    tree = _descendants_cte(parent_id, max_depth)
+    rows = db.query(
+        Attachment.id,
+        Attachment.parent_attachment_id,
+        Attachment.filename,
+        Attachment.uploaded_by,
+        Attachment.uploaded_at,
+        tree.c.depth
+    ).join(tree, Attachment.id == tree.c.id).order_by(tree.c.depth, Attachment.id).all()
+    return [dict(row._mapping) for row in rows]
+
+
+def get_attachment_tree(
+    db: Session, parent_id: Optional[int] = None, max_depth: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Get attachments as a tree structure, nested through `children`."""
     result = []
-    for attachment in attachments:
-        attachment_dict = {
-            "id": attachment.id,
-            "filename": attachment.filename,
-            "uploaded_by": attachment.uploaded_by,
-            "uploaded_at": attachment.uploaded_at,
-            "children": get_attachment_tree(db, attachment.id)
+    nodes: Dict[int, Dict[str, Any]] = {}
+    for row in get_attachment_tree_rows(db, parent_id, max_depth):
+        node = {
+            "id": row["id"],
+            "filename": row["filename"],
+            "uploaded_by": row["uploaded_by"],
+            "uploaded_at": row["uploaded_at"],
+            "children": []
         }
-        result.append(attachment_dict)
+        nodes[row["id"]] = node
+        if row["depth"] == 0:
+            result.append(node)
+        else:
+            nodes[row["parent_attachment_id"]]["children"].append(node)
     
     return result
 
 
+def get_attachment_ancestors(db: Session, attachment_id: int) -> Optional[List[Tuple[Attachment, int]]]:
+    """Get the ancestors of an attachment with their distance, nearest (the parent) first."""
+    if not get_attachment_by_id(db, attachment_id):
+        return None
+    
+    lineage = _ancestors_cte(attachment_id)
+    return db.query(Attachment, lineage.c.depth).join(
+        lineage, Attachment.id == lineage.c.id
+    ).order_by(lineage.c.depth).all()
+
+
+def get_attachment_descendants(
+    db: Session, attachment_id: int, max_depth: Optional[int] = None
+) -> Optional[List[Tuple[Attachment, int]]]:
+    """Get every version derived from an attachment with its depth below it (children are 1), breadth first."""
+    if not get_attachment_by_id(db, attachment_id):
+        return None
+    
+    tree = _descendants_cte(attachment_id, max_depth, first_depth=1)
+    return db.query(Attachment, tree.c.depth).join(
+        tree, Attachment.id == tree.c.id
+    ).order_by(tree.c.depth, Attachment.id).all()
+
+
 def get_root_attachments(db: Session) -> List[Attachment]:
     """Get all root attachments (without parent)."""
     return db.query(Attachment).filter(Attachment.parent_attachment_id.is_(None)).all()
@@ -148,7 +285,10 @@ def create_attachment_version(
     original_attachment_id: int,
     new_filename: str,
     new_relative_path: str,
-    uploaded_by: int
+    uploaded_by: int,
+    content_hash: Optional[str] = None,
+    file_size: Optional[int] = None,
+    commit: bool = True
 ) -> Attachment:
     """Create a new version of an existing attachment."""
     original = get_attachment_by_id(db, original_attachment_id)
@@ -164,7 +304,99 @@ def create_attachment_version(
         presentmon_file=original.presentmon_file,
         presentmon_version=original.presentmon_version,
         settings=original.settings,
+        content_hash=content_hash,
+        file_size=file_size,
         uploaded_by=uploaded_by
     )
     
-    return create_attachment(db, new_attachment_data)
\ No newline at end of file
+    return create_attachment(db, new_attachment_data, commit=commit)
+
+
+def get_capture_columns(db: Session, attachment: Attachment) -> ColumnarCapture:
+    """Get the parsed columns of a PresentMon attachment, building the cache on first use."""
+    if not attachment.presentmon_file:
+        raise ValueError(f"Attachment with ID {attachment.id} is not a PresentMon capture")
+    
+    file_path = file_storage.get_file_path(attachment.relative_path, attachment.filename)
+    if not file_path.exists():
+        raise FileNotFoundError(f"File for attachment {attachment.id} not found on server")
+    
+    if not attachment.content_hash:
+        # Rows stored before content hashing get their digest on first analysis
+        attachment.content_hash = file_storage.compute_content_hash(attachment.relative_path, attachment.filename)
+        attachment.file_size = file_path.stat().st_size
+        db.commit()
+    
+    return columnar_cache.load_or_build(attachment.content_hash, file_path, attachment.presentmon_version)
+
+
+def get_attachment_metrics(db: Session, attachment_id: int, refresh: bool = False) -> Optional[Dict[str, Any]]:
+    """Get the PresentMon metrics of an attachment, computing and storing them if needed."""
+    attachment = get_attachment_by_id(db, attachment_id)
+    if not attachment:
+        return None
+    
+    if not attachment.presentmon_file:
+        raise ValueError(f"Attachment with ID {attachment_id} is not a PresentMon capture")
+    
+    metrics = attachment.metrics
+    if refresh or not metrics or metrics.get("metrics_version") != METRICS_VERSION:
+        if refresh:
+            columnar_cache.invalidate(attachment.content_hash)
+        capture = get_capture_columns(db, attachment)
+        metrics = metrics_from_chunks(capture.chunks(CHUNK_ROWS))
+        metrics["presentmon_schema"] = capture.schema
+        attachment.metrics = metrics
+        db.commit()
+    
+    return {
+        "attachment_id": attachment.id,
+        "presentmon_version": attachment.presentmon_version,
+        **metrics
+    }
+
+
+def get_attachment_series(
+    db: Session,
+    attachment_id: int,
+    column: str,
+    width: int,
+    start: Optional[float] = None,
+    end: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
+    """Get a min/max downsample of one capture column for charting."""
+    attachment = get_attachment_by_id(db, attachment_id)
+    if not attachment:
+        return None
+    
+    capture = get_capture_columns(db, attachment)
+    series = SeriesPyramid(capture, column).query(width, start, end)
+    
+    return {
+        "attachment_id": attachment.id,
+        "presentmon_version": attachment.presentmon_version,
+        "presentmon_schema": capture.schema,
+        "column": column,
+        "columns": [name for name in capture.column_names if name != "time"],
+        **series
+    }
+
+
+# Async variants for the AsyncSession endpoints; see the execution service
+
+async def get_attachments_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    filename: Optional[str] = None,
+    uploaded_by: Optional[int] = None,
+    resolution_id: Optional[int] = None,
+    parent_attachment_id: Optional[int] = None,
+    presentmon_file: Optional[bool] = None,
+) -> List[Attachment]:
+    """Get multiple attachments with optional filtering."""
+    statement = _filter_attachments(
+        select(Attachment), filename, uploaded_by, resolution_id, parent_attachment_id, presentmon_file
+    )
+    return await paginate_async(db, statement, ATTACHMENT_SORT, skip, limit, cursor)
@@ -1,24 +1,34 @@
 from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 from app.database.models import Tester
-from app.utils.auth import verify_password
+from app.utils.auth import password_hasher
 from app.api.dependencies import create_access_token
 
-def authenticate_tester(db: Session, email: str, password: str) -> Optional[Tester]:
-    tester = db.query(Tester).filter(Tester.email == email).first()
+async def authenticate_tester(db: AsyncSession, email: str, password: str) -> Optional[Tester]:
+    """
+    Check a tester's credentials without blocking the event loop.
+    
+    The lookup runs on the AsyncSession and bcrypt in the password hashing
+    pool (PasswordHasherBusy when it is saturated). A hash made with old
+    cost parameters is replaced on the tester; login_tester_async commits it.
+    """
+    tester = (await db.scalars(select(Tester).where(Tester.email == email))).first()
+    # End the lookup's transaction so the pooled connection is not held
+    # through the hash; the tester stays loaded (expire_on_commit=False)
+    await db.commit()
     if not tester:
         return None
-    if not verify_password(password, tester.password):
+    valid, new_hash = await password_hasher.verify_and_update_async(password, tester.password)
+    if not valid:
         return None
+    if new_hash:
+        tester.password = new_hash
     return tester
 
-def login_tester(db: Session, tester: Tester) -> dict:
-    # Update last login
-    tester.last_login_at = datetime.utcnow()
-    db.commit()
-    db.refresh(tester)
-    
+def _token_response(tester: Tester) -> dict:
     # Create token
     access_token = create_access_token(
         data={
@@ -31,4 +41,20 @@ def login_tester(db: Session, tester: Tester) -> dict:
     return {
         "access_token": access_token,
         "token_type": "bearer"
-    }
\ No newline at end of file
+    }
+
+def login_tester(db: Session, tester: Tester) -> dict:
+    # Update last login
+    tester.last_login_at = datetime.utcnow()
+    db.commit()
+    db.refresh(tester)
+    
+    return _token_response(tester)
+
+async def login_tester_async(db: AsyncSession, tester: Tester) -> dict:
+    # Update last login (and a rehash from authenticate_tester) in a new
+    # transaction; the session keeps the tester loaded after commit
+    tester.last_login_at = datetime.utcnow()
+    await db.commit()
+    
+    return _token_response(tester)
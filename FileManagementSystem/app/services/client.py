@@ -3,19 +3,26 @@ from sqlalchemy.orm import Session
 
 from app.database.models import Client
 from app.schemas.client import ClientCreate, ClientUpdate
+from app.services.reference_data import reference_data_changed
+from app.utils.pagination import SortKey, paginate
+
+CLIENT_SORT = (SortKey(Client.id),)
 
 
 def get_client_by_id(db: Session, client_id: int) -> Optional[Client]:
     return db.query(Client).filter(Client.id == client_id).first()
 
 
-def get_clients(db: Session, skip: int = 0, limit: int = 100) -> List[Client]:
-    return db.query(Client).offset(skip).limit(limit).all()
+def get_clients(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Client]:
+    return paginate(db.query(Client), CLIENT_SORT, skip, limit, cursor)
 
 
 def create_client(db: Session, client_in: ClientCreate) -> Client:
     client = Client(**client_in.dict())
     db.add(client)
+    reference_data_changed(db, Client)
     db.commit()
     db.refresh(client)
     return client
@@ -29,6 +36,7 @@ def update_client(db: Session, client_id: int, client_in: ClientUpdate) -> Optio
     for field, value in client_in.dict(exclude_unset=True).items():
         setattr(client, field, value)
 
+    reference_data_changed(db, Client)
     db.commit()
     db.refresh(client)
     return client
\ No newline at end of file
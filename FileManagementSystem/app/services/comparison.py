@@ -0,0 +1,186 @@
+import math
+from collections import defaultdict
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy.orm import Session
+
+from app.database.models import Attachment, Execution, TestCaseVersion
+from app.schemas.comparison import ComparisonRequest, ComparisonSlice
+from app.services.attachment import get_attachment_metrics
+from app.utils.presentmon import METRICS_VERSION, PresentMonError
+from app.utils.stats import summarize, welch_interval
+
+# Comparable metric -> path into the stored PresentMon metrics
+COMPARABLE_METRICS: Dict[str, Tuple[str, ...]] = {
+    "average_fps": ("average_fps",),
+    "fps_1_percent_low": ("fps_1_percent_low",),
+    "fps_0_1_percent_low": ("fps_0_1_percent_low",),
+    "frame_time_mean": ("frame_time_ms", "mean"),
+    "frame_time_p50": ("frame_time_ms", "p50"),
+    "frame_time_p95": ("frame_time_ms", "p95"),
+    "frame_time_p99": ("frame_time_ms", "p99"),
+    "frame_time_p99_9": ("frame_time_ms", "p99_9"),
+}
+
+
+def _metric_value(metrics: Dict[str, Any], path: Tuple[str, ...]) -> Optional[float]:
+    value: Any = metrics
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return float(value) if value is not None else None
+
+
+def _slice_label(slice_in: ComparisonSlice) -> str:
+    if slice_in.label:
+        return slice_in.label
+    label = f"run {slice_in.run_id}"
+    if slice_in.device_id is not None:
+        label += f" / device {slice_in.device_id}"
+    if slice_in.resolution_id is not None:
+        label += f" / resolution {slice_in.resolution_id}"
+    return label
+
+
+def _load_slice(
+    db: Session, slice_in: ComparisonSlice, skipped: List[int]
+) -> Tuple[Dict[int, List[Dict[str, Any]]], Dict[int, str], int]:
+    """
+    Load the cached metrics of every PresentMon capture in a slice, grouped by test case.
+
+    Captures without current metrics are analyzed once here (through the
+    columnar cache) and stored, so later comparisons only read the column.
+    """
+    query = db.query(TestCaseVersion.test_case_id, TestCaseVersion.name, Attachment).select_from(Execution).join(
+        TestCaseVersion, Execution.test_case_version_id == TestCaseVersion.id
+    ).join(
+        Attachment, Execution.attachment_id == Attachment.id
+    ).filter(
+        Execution.run_id == slice_in.run_id,
+        Attachment.presentmon_file.is_(True)
+    )
+    if slice_in.device_id is not None:
+        query = query.filter(Execution.device_id == slice_in.device_id)
+    if slice_in.resolution_id is not None:
+        query = query.filter(Attachment.resolution_id == slice_in.resolution_id)
+
+    samples: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    names: Dict[int, str] = {}
+    captures = 0
+    for test_case_id, name, attachment in query.all():
+        metrics = attachment.metrics
+        if not metrics or metrics.get("metrics_version") != METRICS_VERSION:
+            try:
+                metrics = get_attachment_metrics(db, attachment.id)
+            except (PresentMonError, FileNotFoundError, ValueError):
+                skipped.append(attachment.id)
+                continue
+        samples[test_case_id].append(metrics)
+        names.setdefault(test_case_id, name)
+        captures += 1
+
+    return samples, names, captures
+
+
+def _compare_metric(
+    baseline: List[Dict[str, Any]], other: List[Dict[str, Any]], metric: str
+) -> Dict[str, Any]:
+    path = COMPARABLE_METRICS[metric]
+    base_values = [v for v in (_metric_value(m, path) for m in baseline) if v is not None]
+    values = [v for v in (_metric_value(m, path) for m in other) if v is not None]
+
+    result: Dict[str, Any] = {"baseline_samples": len(base_values), "samples": len(values)}
+    if not base_values or not values:
+        return result
+
+    mean_a, var_a, n_a = summarize(base_values)
+    mean_b, var_b, n_b = summarize(values)
+    delta = mean_b - mean_a
+    result.update({
+        "baseline": mean_a,
+        "value": mean_b,
+        "delta": delta,
+        "delta_percent": delta / mean_a * 100 if mean_a else None,
+    })
+
+    # Captures are the samples; frames within one capture are autocorrelated,
+    # so a single capture per side gives no interval
+    interval = welch_interval(mean_a, var_a, n_a, mean_b, var_b, n_b)
+    if interval is not None:
+        result["ci_low"], result["ci_high"] = interval
+    return result
+
+
+def compare_slices(db: Session, request: ComparisonRequest) -> Dict[str, Any]:
+    """
+    Compare PresentMon captures of two or more run slices, test case by test case.
+
+    Executions are matched across slices through their test case (not the
+    test case version), so a test stays comparable when its version changes
+    between builds. Deltas are value minus baseline with 95% Welch intervals
+    when there are repeated captures.
+    """
+    metrics = request.metrics or list(COMPARABLE_METRICS)
+    unknown = [metric for metric in metrics if metric not in COMPARABLE_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(unknown)}")
+
+    labels: List[str] = []
+    for slice_in in request.slices:
+        label = _slice_label(slice_in)
+        if label in labels:
+            label = f"{label} #{len(labels) + 1}"
+        labels.append(label)
+
+    skipped: List[int] = []
+    loaded = [_load_slice(db, slice_in, skipped) for slice_in in request.slices]
+    baseline_samples, names, _ = loaded[0]
+    for _, slice_names, _ in loaded[1:]:
+        for test_case_id, name in slice_names.items():
+            names.setdefault(test_case_id, name)
+
+    test_cases: Dict[int, Dict[str, Any]] = {}
+    summaries = []
+    unmatched: Dict[str, List[int]] = {}
+    for index, (slice_in, label, (samples, _, captures)) in enumerate(zip(request.slices, labels, loaded)):
+        log_ratios: Dict[str, List[float]] = defaultdict(list)
+        if index > 0:
+            for test_case_id in sorted(samples.keys() & baseline_samples.keys()):
+                deltas = {
+                    metric: _compare_metric(baseline_samples[test_case_id], samples[test_case_id], metric)
+                    for metric in metrics
+                }
+                for metric, delta in deltas.items():
+                    if delta.get("baseline") and delta.get("value") and delta["baseline"] > 0 and delta["value"] > 0:
+                        log_ratios[metric].append(math.log(delta["value"] / delta["baseline"]))
+                test_cases.setdefault(test_case_id, {
+                    "test_case_id": test_case_id,
+                    "name": names.get(test_case_id),
+                    "slices": {},
+                })["slices"][label] = deltas
+
+            missing = sorted(samples.keys() ^ baseline_samples.keys())
+            if missing:
+                unmatched[label] = missing
+
+        summaries.append({
+            "label": label,
+            "run_id": slice_in.run_id,
+            "device_id": slice_in.device_id,
+            "resolution_id": slice_in.resolution_id,
+            "captures": captures,
+            "test_cases": len(samples),
+            "ratio": {
+                metric: math.exp(sum(log_ratios[metric]) / len(log_ratios[metric])) if log_ratios[metric] else None
+                for metric in metrics
+            } if index > 0 else {},
+        })
+
+    return {
+        "baseline": labels[0],
+        "metrics": metrics,
+        "slices": summaries,
+        "test_cases": [test_cases[test_case_id] for test_case_id in sorted(test_cases)],
+        "unmatched_test_cases": unmatched,
+        "skipped_attachments": sorted(set(skipped)),
+    }
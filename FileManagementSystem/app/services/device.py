@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 
 from app.database.models import Device
 from app.schemas.device import DeviceCreate, DeviceUpdate
+from app.utils.pagination import SortKey, paginate
+
+DEVICE_SORT = (SortKey(Device.id),)
 
 
 def get_device_by_id(db: Session, device_id: int) -> Optional[Device]:
@@ -13,6 +16,7 @@ def get_devices(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     name_external: Optional[str] = None,
     name_internal: Optional[str] = None,
     cpu: Optional[str] = None,
@@ -32,7 +36,7 @@ def get_devices(
     if ram:
         query = query.filter(Device.ram.ilike(f"%{ram}%"))
 
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, DEVICE_SORT, skip, limit, cursor)
 
 
 def create_device(db: Session, device_in: DeviceCreate) -> Device:
@@ -1,10 +1,12 @@
 # --- /home/oleksiak/FileManagementTool/FileManagementSystem/app/services/execution.py ---
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import and_, or_, func, desc, asc, case
+from sqlalchemy import and_, or_, func, desc, asc, case, values, column, Integer, Boolean, select, bindparam, literal_column
 from sqlalchemy.sql import label
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.database.models import (
     Execution, Device, Run, TestCaseVersion, Tester, 
@@ -12,6 +14,32 @@ from app.database.models import (
     Suitcase, Scenario
 )
 from app.schemas.execution import ExecutionCreate, ExecutionUpdate
+from app.services.run_status_count import (
+    execution_state, record_execution_change, record_executions_created,
+    get_run_status_counts, average_execution_seconds
+)
+from app.services.reference_data import reference_data
+from app.services.run_events import publish_execution_change, publish_executions_created
+from app.utils.pagination import SortKey, paginate, paginate_async
+
+# Rows per INSERT statement; keeps each statement well below the 65535 bind parameter limit
+EXECUTION_INSERT_BATCH_SIZE = 1000
+
+# Newest first; the id keeps executions with the same timestamp and order stable.
+# Shared by the per-device, per-tester and per-test listings, so the
+# execution_*_executed_at_idx indexes serve both those and the filtered list
+EXECUTION_SORT = (
+    SortKey(Execution.executed_at, descending=True),
+    SortKey(Execution.execution_order),
+    SortKey(Execution.id),
+)
+
+# Order of the per-run listing: the order the executions are meant to be run in
+RUN_EXECUTION_SORT = (
+    SortKey(Execution.execution_order),
+    SortKey(Execution.executed_at, descending=True),
+    SortKey(Execution.id),
+)
 
 
 def get_execution_by_id(db: Session, execution_id: int) -> Optional[Execution]:
@@ -19,10 +47,20 @@ def get_execution_by_id(db: Session, execution_id: int) -> Optional[Execution]:
     return db.query(Execution).filter(Execution.id == execution_id).first()
 
 
-def get_executions(
-    db: Session,
-    skip: int = 0,
-    limit: int = 100,
+def _lock_execution(db: Session, execution_id: int) -> Optional[Execution]:
+    """
+    Load an execution for an update that moves it in the run_status_count
+    rollup. The row stays locked until commit, so concurrent updates apply
+    their rollup deltas one after the other, each from the state the
+    previous one left.
+    """
+    return db.query(Execution).filter(
+        Execution.id == execution_id
+    ).with_for_update().populate_existing().first()
+
+
+def _filter_executions(
+    query: Any,
     device_id: Optional[int] = None,
     run_id: Optional[int] = None,
     test_case_version_id: Optional[int] = None,
@@ -35,10 +73,8 @@ def get_executions(
     test_case_id: Optional[int] = None,
     test_suite_id: Optional[int] = None,
     scenario_id: Optional[int] = None,
-) -> List[Execution]:
-    """Get multiple executions with optional filtering."""
-    query = db.query(Execution)
-    
+) -> Any:
+    """Apply the execution list filters to a Query or a select() of Execution."""
     # Join tables for complex filtering
     if any([project_id, test_case_id, test_suite_id, scenario_id]):
         query = query.join(Device).join(Run).join(TestCaseVersion)
@@ -68,21 +104,51 @@ def get_executions(
         query = query.filter(TestCaseVersion.test_case_id == test_case_id)
     if test_suite_id is not None:
         # Get test case IDs from the suitcase table
-        subquery = db.query(Suitcase.test_case_id).filter(
-            Suitcase.test_suite_id == test_suite_id
-        ).subquery()
+        subquery = select(Suitcase.test_case_id).where(Suitcase.test_suite_id == test_suite_id)
         query = query.filter(TestCaseVersion.test_case_id.in_(subquery))
     if scenario_id is not None:
         # Get test case IDs with the given scenario
-        subquery = db.query(TestCase.id).filter(
-            TestCase.scenario_id == scenario_id
-        ).subquery()
+        subquery = select(TestCase.id).where(TestCase.scenario_id == scenario_id)
         query = query.filter(TestCaseVersion.test_case_id.in_(subquery))
     
-    return query.order_by(
-        desc(Execution.executed_at), 
-        asc(Execution.execution_order)
-    ).offset(skip).limit(limit).all()
+    return query
+
+
+def get_executions(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    device_id: Optional[int] = None,
+    run_id: Optional[int] = None,
+    test_case_version_id: Optional[int] = None,
+    executed_by: Optional[int] = None,
+    status_id: Optional[int] = None,
+    attachment_id: Optional[int] = None,
+    executed_after: Optional[datetime] = None,
+    executed_before: Optional[datetime] = None,
+    project_id: Optional[int] = None,
+    test_case_id: Optional[int] = None,
+    test_suite_id: Optional[int] = None,
+    scenario_id: Optional[int] = None,
+) -> List[Execution]:
+    """Get multiple executions with optional filtering."""
+    query = _filter_executions(
+        db.query(Execution),
+        device_id=device_id,
+        run_id=run_id,
+        test_case_version_id=test_case_version_id,
+        executed_by=executed_by,
+        status_id=status_id,
+        attachment_id=attachment_id,
+        executed_after=executed_after,
+        executed_before=executed_before,
+        project_id=project_id,
+        test_case_id=test_case_id,
+        test_suite_id=test_suite_id,
+        scenario_id=scenario_id,
+    )
+    return paginate(query, EXECUTION_SORT, skip, limit, cursor)
 
 
 def create_execution(db: Session, execution_in: ExecutionCreate) -> Execution:
@@ -106,7 +172,7 @@ def create_execution(db: Session, execution_in: ExecutionCreate) -> Execution:
     if not tester:
         raise ValueError(f"Tester with ID {execution_in.executed_by} does not exist")
     
-    status = db.query(Status).filter(Status.id == execution_in.status_id).first()
+    status = reference_data.get(db, Status, execution_in.status_id)
     if not status:
         raise ValueError(f"Status with ID {execution_in.status_id} does not exist")
     
@@ -136,6 +202,9 @@ def create_execution(db: Session, execution_in: ExecutionCreate) -> Execution:
     db.add(execution)
     
     try:
+        db.flush()
+        counts = record_execution_change(db, None, execution_state(execution))
+        publish_execution_change(db, execution, counts)
         db.commit()
     except IntegrityError as e:
         db.rollback()
@@ -158,49 +227,52 @@ def _resolve_test_case_versions(
     """
     Resolve test case versions for a test suite according to the resolution flow.
     
+    Every suitcase row of the suite resolves to the overridden version when
+    the override names a version of that test case, otherwise to the version
+    with the highest primary key. Test cases without versions are skipped.
+    The whole flow, including the suite lookup, runs as one grouped query
+    in suitcase order.
+    
     Returns: List of tuples (test_case_id, test_case_version_id)
     """
-    # Step 1: Identify the target test_suite
-    test_suite = db.query(TestSuite).filter(TestSuite.id == test_suite_id).first()
-    if not test_suite:
-        raise ValueError(f"Test suite with ID {test_suite_id} does not exist")
+    # Steps 2-4: suite -> suitcases -> their versions -> one version per suitcase row
+    selected_version = func.max(TestCaseVersion.id)
+    overrides = None
+    if version_override:
+        overrides = values(
+            column("test_case_id", Integer),
+            column("version_id", Integer),
+            name="version_override"
+        ).data([(int(test_case_id), int(version_id)) for test_case_id, version_id in version_override.items()])
+        # An override only applies if it names a version of that test case
+        selected_version = func.coalesce(
+            func.max(case((TestCaseVersion.id == overrides.c.version_id, TestCaseVersion.id))),
+            selected_version
+        )
     
-    # Step 2: Fetch all test_cases assigned to the test_suite (via suitcase mapping)
-    suitcases = db.query(Suitcase).filter(Suitcase.test_suite_id == test_suite_id).all()
-    if not suitcases:
-        raise ValueError(f"Test suite with ID {test_suite_id} has no test cases")
+    query = db.query(Suitcase.test_case_id, selected_version).select_from(TestSuite).outerjoin(
+        Suitcase, Suitcase.test_suite_id == TestSuite.id
+    ).outerjoin(
+        TestCaseVersion, TestCaseVersion.test_case_id == Suitcase.test_case_id
+    )
+    if overrides is not None:
+        query = query.outerjoin(overrides, overrides.c.test_case_id == Suitcase.test_case_id)
     
-    resolved_versions = []
+    rows = query.filter(
+        TestSuite.id == test_suite_id
+    ).group_by(Suitcase.id, Suitcase.test_case_id).order_by(Suitcase.id).all()
     
-    for suitcase in suitcases:
-        test_case_id = suitcase.test_case_id
-        
-        # Step 3: For each test_case, fetch related test_case_version rows
-        test_case_versions = db.query(TestCaseVersion).filter(
-            TestCaseVersion.test_case_id == test_case_id
-        ).order_by(TestCaseVersion.id.desc()).all()
-        
-        if not test_case_versions:
-            continue  # Skip test cases without versions
-        
-        # Step 4: Select exactly one test_case_version per test_case
-        selected_version = None
-        
-        # Check for explicit override first
-        if version_override and test_case_id in version_override:
-            version_id = version_override[test_case_id]
-            for version in test_case_versions:
-                if version.id == version_id:
-                    selected_version = version
-                    break
-        
-        # Default: Choose test_case_version with the highest primary key
-        if not selected_version:
-            selected_version = test_case_versions[0]  # Already sorted by id.desc()
-        
-        resolved_versions.append((test_case_id, selected_version.id))
+    # Step 1: the outer joins keep one all-NULL row for a suite without suitcases
+    if not rows:
+        raise ValueError(f"Test suite with ID {test_suite_id} does not exist")
+    if rows[0][0] is None:
+        raise ValueError(f"Test suite with ID {test_suite_id} has no test cases")
     
-    return resolved_versions
+    return [
+        (test_case_id, version_id)
+        for test_case_id, version_id in rows
+        if version_id is not None
+    ]
 
 
 def create_executions_for_test_suite(
@@ -219,6 +291,9 @@ def create_executions_for_test_suite(
     2. Fetch test_cases via suitcase
     3. Resolve test_case_version for each test_case
     4. Create execution per resolved test_case_version
+    
+    Shared references are validated once and all executions are written with
+    batched INSERT ... ON CONFLICT statements in a single transaction.
     """
     # Validate run exists
     run = db.query(Run).filter(Run.id == run_id).first()
@@ -236,56 +311,97 @@ def create_executions_for_test_suite(
         raise ValueError(f"Tester with ID {executed_by} does not exist")
     
     # Get "Not Run" status
-    not_run_status = db.query(Status).filter(Status.name == "Not Run").first()
+    not_run_status = reference_data.get_by_name(db, Status, "Not Run")
     if not not_run_status:
         raise ValueError("Status 'Not Run' not found")
     
     # Resolve test case versions
     resolved_versions = _resolve_test_case_versions(db, test_suite_id, version_override)
     
-    executions = []
-    execution_order = 1
-    
-    for test_case_id, test_case_version_id in resolved_versions:
-        # Check if execution already exists
-        existing = db.query(Execution).filter(
-            and_(
-                Execution.run_id == run_id,
-                Execution.test_case_version_id == test_case_version_id
-            )
-        ).first()
-        
-        if existing:
-            # Update execution order if needed
-            if existing.execution_order != execution_order:
-                existing.execution_order = execution_order
-                executions.append(existing)
-            execution_order += 1
+    # Existing executions of the run, in one query
+    existing_orders = dict(
+        db.query(Execution.test_case_version_id, Execution.execution_order).filter(
+            Execution.run_id == run_id,
+            Execution.test_case_version_id.in_([version_id for _, version_id in resolved_versions])
+        ).all()
+    ) if resolved_versions else {}
+    
+    rows = []
+    seen = set()
+    for execution_order, (test_case_id, test_case_version_id) in enumerate(resolved_versions, start=1):
+        if test_case_version_id in seen:
+            # The same test case listed twice in the suite runs once
             continue
+        seen.add(test_case_version_id)
         
-        # Create new execution
-        execution_data = ExecutionCreate(
-            device_id=device_id,
-            run_id=run_id,
-            test_case_version_id=test_case_version_id,
-            executed_by=executed_by,
-            status_id=not_run_status.id,
-            execution_order=execution_order,
-            executed_at=None,
-            actual_result=None,
-            attachment_id=None
-        )
-        
-        try:
-            execution = create_execution(db, execution_data)
-            executions.append(execution)
-        except Exception as e:
-            # Skip problematic executions but continue with others
-            print(f"Failed to create execution for test case version {test_case_version_id}: {e}")
+        # Existing executions only need writing when their order moved
+        if existing_orders.get(test_case_version_id) == execution_order:
             continue
         
-        execution_order += 1
+        rows.append({
+            "device_id": device_id,
+            "run_id": run_id,
+            "test_case_version_id": test_case_version_id,
+            "executed_by": executed_by,
+            "status_id": not_run_status.id,
+            "execution_order": execution_order,
+            "executed_at": None,
+            "actual_result": None,
+            "attachment_id": None,
+        })
+    
+    if not rows:
+        return []
     
+    try:
+        executions = _upsert_executions(db, rows)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        # Fall back to row-by-row writes to find and report the offending rows
+        executions = []
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    executions.extend(_upsert_executions(db, [row]))
+            except IntegrityError as e:
+                print(f"Failed to create execution for test case version {row['test_case_version_id']}: {e.orig}")
+        db.commit()
+    
+    return sorted(executions, key=lambda execution: execution.execution_order)
+
+
+def _upsert_executions(db: Session, rows: List[Dict[str, Any]]) -> List[Execution]:
+    """
+    Insert executions in batched multi-row statements.
+    
+    A row whose (run, test case version) already exists only has its
+    execution order updated, and only if that order changed, so concurrent
+    materialization of the same suite cannot create duplicates. Returns the
+    inserted and updated executions.
+    
+    Only inserted rows (xmax = 0 in RETURNING) are added to the run status
+    rollup and announced to run event subscribers; an updated row keeps its
+    status.
+    """
+    executions = []
+    for start in range(0, len(rows), EXECUTION_INSERT_BATCH_SIZE):
+        stmt = pg_insert(Execution).values(rows[start:start + EXECUTION_INSERT_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            constraint="execution_run_version_unique",
+            set_={"execution_order": stmt.excluded.execution_order},
+            where=Execution.execution_order.is_distinct_from(stmt.excluded.execution_order)
+        ).returning(Execution, literal_column("xmax = 0", Boolean).label("inserted"))
+        result = db.execute(stmt, execution_options={"populate_existing": True}).all()
+        executions.extend(execution for execution, _ in result)
+        created = [execution_state(execution) for execution, inserted in result if inserted]
+        counts = record_executions_created(db, created)
+        for run_id in {state[0] for state in created}:
+            publish_executions_created(
+                db, run_id,
+                sum(1 for state in created if state[0] == run_id),
+                [row for row in counts if row.run_id == run_id],
+            )
     return executions
 
 
@@ -295,11 +411,12 @@ def update_execution(
     execution_in: ExecutionUpdate,
 ) -> Optional[Execution]:
     """Update an existing execution."""
-    execution = get_execution_by_id(db, execution_id)
+    execution = _lock_execution(db, execution_id)
     if not execution:
         return None
     
     update_data = execution_in.dict(exclude_unset=True)
+    before = execution_state(execution)
     
     # Restriction: test_case_version reference must not change after creation
     if "test_case_version_id" in update_data:
@@ -323,7 +440,7 @@ def update_execution(
             raise ValueError(f"Tester with ID {update_data['executed_by']} does not exist")
     
     if "status_id" in update_data:
-        status = db.query(Status).filter(Status.id == update_data["status_id"]).first()
+        status = reference_data.get(db, Status, update_data["status_id"])
         if not status:
             raise ValueError(f"Status with ID {update_data['status_id']} does not exist")
     
@@ -336,6 +453,8 @@ def update_execution(
         setattr(execution, field, value)
     
     try:
+        counts = record_execution_change(db, before, execution_state(execution))
+        publish_execution_change(db, execution, counts)
         db.commit()
     except IntegrityError as e:
         db.rollback()
@@ -350,42 +469,47 @@ def update_execution(
     return execution
 
 
-def get_executions_by_run(db: Session, run_id: int) -> List[Execution]:
-    """Get all executions for a specific run."""
-    return db.query(Execution).filter(Execution.run_id == run_id).order_by(
-        asc(Execution.execution_order),
-        desc(Execution.executed_at)
-    ).all()
+def get_executions_by_run(
+    db: Session, run_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Execution]:
+    """Get one page of the executions of a specific run, in execution order."""
+    query = db.query(Execution).filter(Execution.run_id == run_id)
+    return paginate(query, RUN_EXECUTION_SORT, skip, limit, cursor)
 
 
-def get_executions_by_device(db: Session, device_id: int) -> List[Execution]:
-    """Get all executions on a specific device."""
-    return db.query(Execution).filter(Execution.device_id == device_id).order_by(
-        desc(Execution.executed_at)
-    ).all()
+def get_executions_by_device(
+    db: Session, device_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Execution]:
+    """Get one page of the executions on a specific device, newest first."""
+    query = db.query(Execution).filter(Execution.device_id == device_id)
+    return paginate(query, EXECUTION_SORT, skip, limit, cursor)
 
 
-def get_executions_by_tester(db: Session, tester_id: int) -> List[Execution]:
-    """Get all executions performed by a specific tester."""
-    return db.query(Execution).filter(Execution.executed_by == tester_id).order_by(
-        desc(Execution.executed_at)
-    ).all()
+def get_executions_by_tester(
+    db: Session, tester_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Execution]:
+    """Get one page of the executions performed by a specific tester, newest first."""
+    query = db.query(Execution).filter(Execution.executed_by == tester_id)
+    return paginate(query, EXECUTION_SORT, skip, limit, cursor)
 
 
-def get_executions_by_test_case(db: Session, test_case_id: int) -> List[Execution]:
-    """Get all executions for a specific test case (across all versions)."""
+def get_executions_by_test_case(
+    db: Session, test_case_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Execution]:
+    """Get one page of the executions of a specific test case (across all versions), newest first."""
     # Get all versions of the test case
     versions = db.query(TestCaseVersion.id).filter(
         TestCaseVersion.test_case_id == test_case_id
     ).subquery()
     
-    return db.query(Execution).filter(
-        Execution.test_case_version_id.in_(versions)
-    ).order_by(desc(Execution.executed_at)).all()
+    query = db.query(Execution).filter(Execution.test_case_version_id.in_(versions))
+    return paginate(query, EXECUTION_SORT, skip, limit, cursor)
 
 
-def get_executions_by_test_suite(db: Session, test_suite_id: int) -> List[Execution]:
-    """Get all executions for test cases in a specific test suite."""
+def get_executions_by_test_suite(
+    db: Session, test_suite_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Execution]:
+    """Get one page of the executions of the test cases in a specific test suite, newest first."""
     # Get test case IDs in the test suite
     test_case_ids = db.query(Suitcase.test_case_id).filter(
         Suitcase.test_suite_id == test_suite_id
@@ -396,33 +520,49 @@ def get_executions_by_test_suite(db: Session, test_suite_id: int) -> List[Execut
         TestCaseVersion.test_case_id.in_(test_case_ids)
     ).subquery()
     
-    return db.query(Execution).filter(
-        Execution.test_case_version_id.in_(version_ids)
-    ).order_by(desc(Execution.executed_at)).all()
+    query = db.query(Execution).filter(Execution.test_case_version_id.in_(version_ids))
+    return paginate(query, EXECUTION_SORT, skip, limit, cursor)
 
 
-def get_execution_stats(db: Session, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """Get execution statistics."""
+def _scan_execution_status_counts(db: Session, filters: Dict[str, Any]):
+    """Per-status counts with a GROUP BY over the filtered executions."""
     query = db.query(
         Status.name,
         func.count(Execution.id).label('count')
     ).join(Status, Execution.status_id == Status.id)
     
-    if filters:
-        if filters.get("run_id"):
-            query = query.filter(Execution.run_id == filters["run_id"])
-        if filters.get("project_id"):
-            query = query.join(Device).filter(Device.project_id == filters["project_id"])
-        if filters.get("device_id"):
-            query = query.filter(Execution.device_id == filters["device_id"])
-        if filters.get("executed_by"):
-            query = query.filter(Execution.executed_by == filters["executed_by"])
-        if filters.get("executed_after"):
-            query = query.filter(Execution.executed_at >= filters["executed_after"])
-        if filters.get("executed_before"):
-            query = query.filter(Execution.executed_at <= filters["executed_before"])
-    
-    results = query.group_by(Status.name).all()
+    if filters.get("run_id"):
+        query = query.filter(Execution.run_id == filters["run_id"])
+    if filters.get("project_id"):
+        query = query.join(Device).filter(Device.project_id == filters["project_id"])
+    if filters.get("device_id"):
+        query = query.filter(Execution.device_id == filters["device_id"])
+    if filters.get("executed_by"):
+        query = query.filter(Execution.executed_by == filters["executed_by"])
+    if filters.get("executed_after"):
+        query = query.filter(Execution.executed_at >= filters["executed_after"])
+    if filters.get("executed_before"):
+        query = query.filter(Execution.executed_at <= filters["executed_before"])
+    
+    return query.group_by(Status.name).all()
+
+
+def get_execution_stats(db: Session, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Get execution statistics.
+    
+    Without filters, or filtered by run only, the counts come from the
+    run_status_count rollup (one row per run and status) instead of a
+    GROUP BY over the executions.
+    """
+    filters = {key: value for key, value in (filters or {}).items() if value}
+    
+    rollup = None
+    if set(filters) <= {"run_id"}:
+        rollup = get_run_status_counts(db, filters.get("run_id"))
+        results = rollup
+    else:
+        results = _scan_execution_status_counts(db, filters)
     
     # Calculate totals
     total = sum(result.count for result in results)
@@ -459,42 +599,48 @@ def get_execution_stats(db: Session, filters: Optional[Dict[str, Any]] = None) -
             stats["completed_executions"] += result.count
     
     # Calculate average execution time for completed executions
-    if filters and filters.get("run_id"):
-        avg_time_query = db.query(
-            func.avg(
-                func.extract('epoch', Execution.executed_at) - 
-                func.extract('epoch', Run.started_at)
-            )
-        ).join(Run, Execution.run_id == Run.id).filter(
-            Execution.run_id == filters["run_id"],
-            Execution.executed_at.isnot(None),
-            Run.started_at.isnot(None)
-        ).first()
-        
-        if avg_time_query and avg_time_query[0]:
-            stats["average_execution_time_seconds"] = float(avg_time_query[0])
+    if filters.get("run_id"):
+        started_at = db.query(Run.started_at).filter(Run.id == filters["run_id"]).scalar()
+        if rollup is None:
+            rollup = get_run_status_counts(db, filters["run_id"])
+        average = average_execution_seconds(rollup, started_at)
+        if average:
+            stats["average_execution_time_seconds"] = average
     
     return stats
 
 
-def get_execution_with_relations(db: Session, execution_id: int) -> Optional[Dict[str, Any]]:
-    """Get an execution with all related objects."""
-    execution = db.query(Execution).filter(Execution.id == execution_id).first()
-    if not execution:
-        return None
-    
-    # Get all related data
-    device = db.query(Device).filter(Device.id == execution.device_id).first()
-    run = db.query(Run).filter(Run.id == execution.run_id).first()
-    test_case_version = db.query(TestCaseVersion).filter(
-        TestCaseVersion.id == execution.test_case_version_id
-    ).first()
-    executor = db.query(Tester).filter(Tester.id == execution.executed_by).first()
-    status = db.query(Status).filter(Status.id == execution.status_id).first()
-    attachment = db.query(Attachment).filter(Attachment.id == execution.attachment_id).first() if execution.attachment_id else None
-    
-    # Get test case for the version
-    test_case = db.query(TestCase).filter(TestCase.id == test_case_version.test_case_id).first() if test_case_version else None
+# Built once at import so every call reuses the same compiled SQL; the
+# many-to-one relations are joined into the single SELECT
+_EXECUTION_WITH_RELATIONS = select(Execution).options(
+    joinedload(Execution.device, innerjoin=True),
+    joinedload(Execution.run, innerjoin=True),
+    joinedload(Execution.test_case_version, innerjoin=True).joinedload(TestCaseVersion.test_case, innerjoin=True),
+    joinedload(Execution.executor, innerjoin=True),
+    joinedload(Execution.status, innerjoin=True),
+    joinedload(Execution.attachment),
+).where(Execution.id == bindparam("execution_id"))
+
+# Relations of a batch are loaded with one IN query each, so hundreds of
+# executions sharing a few runs and devices hydrate in a fixed number of queries
+_EXECUTION_BATCH_OPTIONS = (
+    selectinload(Execution.device),
+    selectinload(Execution.run),
+    selectinload(Execution.test_case_version).selectinload(TestCaseVersion.test_case),
+    selectinload(Execution.executor),
+    selectinload(Execution.status),
+    selectinload(Execution.attachment),
+)
+
+
+def _execution_with_relations(execution: Execution) -> Dict[str, Any]:
+    device = execution.device
+    run = execution.run
+    test_case_version = execution.test_case_version
+    test_case = test_case_version.test_case if test_case_version else None
+    executor = execution.executor
+    status = execution.status
+    attachment = execution.attachment
     
     return {
         "id": execution.id,
@@ -552,6 +698,34 @@ def get_execution_with_relations(db: Session, execution_id: int) -> Optional[Dic
     }
 
 
+def get_execution_with_relations(db: Session, execution_id: int) -> Optional[Dict[str, Any]]:
+    """Get an execution with all related objects in a single query."""
+    execution = db.execute(
+        _EXECUTION_WITH_RELATIONS, {"execution_id": execution_id}
+    ).unique().scalar_one_or_none()
+    if not execution:
+        return None
+    
+    return _execution_with_relations(execution)
+
+
+def get_executions_with_relations(db: Session, execution_ids: List[int]) -> List[Dict[str, Any]]:
+    """Get several executions with their related objects, in the order requested; unknown IDs are skipped."""
+    if not execution_ids:
+        return []
+    
+    executions = db.scalars(
+        select(Execution).where(Execution.id.in_(set(execution_ids))).options(*_EXECUTION_BATCH_OPTIONS)
+    ).all()
+    by_id = {execution.id: execution for execution in executions}
+    
+    return [
+        _execution_with_relations(by_id[execution_id])
+        for execution_id in dict.fromkeys(execution_ids)
+        if execution_id in by_id
+    ]
+
+
 def update_execution_status(
     db: Session,
     execution_id: int,
@@ -560,12 +734,12 @@ def update_execution_status(
     attachment_id: Optional[int] = None
 ) -> Optional[Execution]:
     """Update an execution's status and related fields."""
-    execution = get_execution_by_id(db, execution_id)
+    execution = _lock_execution(db, execution_id)
     if not execution:
         return None
     
     # Validate status
-    status = db.query(Status).filter(Status.id == status_id).first()
+    status = reference_data.get(db, Status, status_id)
     if not status:
         raise ValueError(f"Status with ID {status_id} does not exist")
     
@@ -575,6 +749,8 @@ def update_execution_status(
         if not attachment:
             raise ValueError(f"Attachment with ID {attachment_id} does not exist")
 
+    before = execution_state(execution)
+    
     # Update fields
     execution.status_id = status_id
     
@@ -588,6 +764,8 @@ def update_execution_status(
     if attachment_id is not None:
         execution.attachment_id = attachment_id
     
+    counts = record_execution_change(db, before, execution_state(execution))
+    publish_execution_change(db, execution, counts)
     db.commit()
     db.refresh(execution)
     return execution
@@ -632,4 +810,81 @@ def reassign_execution_tester(
     execution.executed_by = new_tester_id
     db.commit()
     db.refresh(execution)
-    return execution
\ No newline at end of file
+    return execution
+
+# Async variants for the AsyncSession endpoints. Reads are native async
+# queries; writes run the sync service above on the session's connection
+# (AsyncSession.run_sync), so the rollup, NOTIFY and validation logic
+# exists only once.
+
+async def get_execution_by_id_async(db: AsyncSession, execution_id: int) -> Optional[Execution]:
+    """Get a single execution by ID."""
+    return await db.get(Execution, execution_id)
+
+
+async def get_executions_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    device_id: Optional[int] = None,
+    run_id: Optional[int] = None,
+    test_case_version_id: Optional[int] = None,
+    executed_by: Optional[int] = None,
+    status_id: Optional[int] = None,
+    attachment_id: Optional[int] = None,
+    executed_after: Optional[datetime] = None,
+    executed_before: Optional[datetime] = None,
+    project_id: Optional[int] = None,
+    test_case_id: Optional[int] = None,
+    test_suite_id: Optional[int] = None,
+    scenario_id: Optional[int] = None,
+) -> List[Execution]:
+    """Get multiple executions with optional filtering."""
+    statement = _filter_executions(
+        select(Execution),
+        device_id=device_id,
+        run_id=run_id,
+        test_case_version_id=test_case_version_id,
+        executed_by=executed_by,
+        status_id=status_id,
+        attachment_id=attachment_id,
+        executed_after=executed_after,
+        executed_before=executed_before,
+        project_id=project_id,
+        test_case_id=test_case_id,
+        test_suite_id=test_suite_id,
+        scenario_id=scenario_id,
+    )
+    return await paginate_async(db, statement, EXECUTION_SORT, skip, limit, cursor)
+
+
+async def get_executions_by_run_async(
+    db: AsyncSession, run_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Execution]:
+    """Get one page of the executions of a specific run, in execution order."""
+    statement = select(Execution).where(Execution.run_id == run_id)
+    return await paginate_async(db, statement, RUN_EXECUTION_SORT, skip, limit, cursor)
+
+
+async def get_execution_with_relations_async(db: AsyncSession, execution_id: int) -> Optional[Dict[str, Any]]:
+    """Get an execution with all related objects in a single query."""
+    result = await db.execute(_EXECUTION_WITH_RELATIONS, {"execution_id": execution_id})
+    execution = result.unique().scalar_one_or_none()
+    if not execution:
+        return None
+    
+    return _execution_with_relations(execution)
+
+
+async def update_execution_status_async(
+    db: AsyncSession,
+    execution_id: int,
+    status_id: int,
+    actual_result: Optional[str] = None,
+    attachment_id: Optional[int] = None
+) -> Optional[Execution]:
+    """Update an execution's status and related fields."""
+    return await db.run_sync(
+        update_execution_status, execution_id, status_id, actual_result, attachment_id
+    )
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict
+from sqlalchemy.orm import Session
+
+from app.database.models import Execution, Device, TestCaseVersion, TestCase, Suitcase
+from app.services.execution import (
+    get_executions,
+    get_executions_by_run,
+    get_executions_by_device,
+    get_executions_by_tester,
+    get_executions_by_test_case,
+    get_executions_by_test_suite,
+    get_execution_stats,
+)
+
+
+def _sample_ids(db: Session) -> Dict[str, Any]:
+    """Real IDs to plug into the query shapes; 1 when the table is empty."""
+    sample = {
+        "run_id": 1, "device_id": 1, "executed_by": 1, "status_id": 1, "attachment_id": 1,
+        "test_case_version_id": 1, "project_id": 1, "test_case_id": 1, "test_suite_id": 1, "scenario_id": 1,
+    }
+    execution = db.query(Execution).order_by(Execution.id).first()
+    if execution:
+        for key in ("run_id", "device_id", "executed_by", "status_id", "test_case_version_id"):
+            sample[key] = getattr(execution, key)
+        sample["attachment_id"] = db.query(Execution.attachment_id).filter(
+            Execution.attachment_id.isnot(None)
+        ).limit(1).scalar() or 1
+        sample["project_id"] = db.query(Device.project_id).filter(Device.id == execution.device_id).scalar()
+        test_case = db.query(TestCase).join(
+            TestCaseVersion, TestCaseVersion.test_case_id == TestCase.id
+        ).filter(TestCaseVersion.id == execution.test_case_version_id).first()
+        if test_case:
+            sample["test_case_id"] = test_case.id
+            sample["scenario_id"] = test_case.scenario_id
+            sample["test_suite_id"] = db.query(Suitcase.test_suite_id).filter(
+                Suitcase.test_case_id == test_case.id
+            ).limit(1).scalar() or 1
+    return sample
+
+
+def execution_query_shapes(db: Session) -> Dict[str, Callable[[], Any]]:
+    """
+    Every query shape the execution services emit, keyed by a short name.
+
+    Each entry runs the service the way an endpoint would, so the advisor
+    sees exactly the SQL (filters, joins, ORDER BY, keyset predicate) that
+    production sends.
+    """
+    ids = _sample_ids(db)
+    week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+
+    def second_page(fetch: Callable[..., Any]) -> Callable[[], Any]:
+        def run():
+            cursor = fetch(limit=1).next_cursor
+            return fetch(limit=100, cursor=cursor) if cursor else None
+        return run
+
+    shapes: Dict[str, Callable[[], Any]] = {
+        "list": lambda: get_executions(db),
+        "list (cursor)": second_page(lambda **page: get_executions(db, **page)),
+        "list executed_after": lambda: get_executions(db, executed_after=week_ago),
+    }
+    for key in ("device_id", "run_id", "test_case_version_id", "executed_by", "status_id", "attachment_id",
+                "project_id", "test_case_id", "test_suite_id", "scenario_id"):
+        shapes[f"list {key}"] = (lambda key: lambda: get_executions(db, **{key: ids[key]}))(key)
+
+    shapes.update({
+        "by run": lambda: get_executions_by_run(db, ids["run_id"]),
+        "by run (cursor)": second_page(lambda **page: get_executions_by_run(db, ids["run_id"], **page)),
+        "by device": lambda: get_executions_by_device(db, ids["device_id"]),
+        "by device (cursor)": second_page(lambda **page: get_executions_by_device(db, ids["device_id"], **page)),
+        "by tester": lambda: get_executions_by_tester(db, ids["executed_by"]),
+        "by test case": lambda: get_executions_by_test_case(db, ids["test_case_id"]),
+        "by test suite": lambda: get_executions_by_test_suite(db, ids["test_suite_id"]),
+        "stats": lambda: get_execution_stats(db),
+        "stats executed_after": lambda: get_execution_stats(db, {"executed_after": week_ago}),
+    })
+    for key in ("run_id", "project_id", "device_id", "executed_by"):
+        shapes[f"stats {key}"] = (lambda key: lambda: get_execution_stats(db, {key: ids[key]}))(key)
+
+    return shapes
@@ -0,0 +1,173 @@
+from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+
+from app.database.models import Job
+from app.config import settings
+from app.utils.pagination import SortKey, paginate
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+JOB_SORT = (SortKey(Job.id, descending=True),)
+
+
+def get_job_by_id(db: Session, job_id: int) -> Optional[Job]:
+    """Get a single job by ID."""
+    return db.query(Job).filter(Job.id == job_id).first()
+
+
+def get_jobs(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    attachment_id: Optional[int] = None,
+) -> List[Job]:
+    """Get jobs, newest first, with optional filtering."""
+    query = db.query(Job)
+
+    if status:
+        query = query.filter(Job.status == status)
+    if kind:
+        query = query.filter(Job.kind == kind)
+    if attachment_id is not None:
+        query = query.filter(Job.attachment_id == attachment_id)
+
+    return paginate(query, JOB_SORT, skip, limit, cursor)
+
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    priority: int = 0,
+    max_attempts: Optional[int] = None,
+    attachment_id: Optional[int] = None,
+    created_by: Optional[int] = None,
+    commit: bool = True,
+) -> Job:
+    """Add a job to the queue. With commit=False it is only flushed, to commit together with the caller's changes."""
+    db_job = Job(
+        kind=kind,
+        payload=payload or {},
+        status=JOB_QUEUED,
+        priority=priority,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        attachment_id=attachment_id,
+        created_by=created_by,
+    )
+    db.add(db_job)
+    if commit:
+        db.commit()
+        db.refresh(db_job)
+    else:
+        db.flush()
+    return db_job
+
+
+def claim_jobs(db: Session, worker_id: str, limit: int) -> List[Job]:
+    """
+    Atomically take up to `limit` runnable jobs for a worker.
+
+    Rows are selected with FOR UPDATE SKIP LOCKED, so concurrent workers
+    never block on or claim the same job. The row lock only lasts for this
+    transaction; afterwards the job is owned through its running status.
+    """
+    jobs = (
+        db.query(Job)
+        .filter(Job.status == JOB_QUEUED, Job.run_after <= func.now())
+        .order_by(Job.priority.desc(), Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    now = datetime.now(timezone.utc)
+    for job in jobs:
+        job.status = JOB_RUNNING
+        job.locked_by = worker_id
+        job.locked_at = now
+        job.attempts += 1
+    db.commit()
+    return jobs
+
+
+def complete_job(db: Session, job_id: int, result: Optional[Dict[str, Any]] = None) -> None:
+    """Mark a running job as succeeded."""
+    db.query(Job).filter(Job.id == job_id).update({
+        Job.status: JOB_SUCCEEDED,
+        Job.result: result,
+        Job.last_error: None,
+        Job.locked_by: None,
+        Job.locked_at: None,
+        Job.finished_at: func.now(),
+    }, synchronize_session=False)
+    db.commit()
+
+
+def fail_job(db: Session, job_id: int, error: str) -> Optional[Job]:
+    """Record a failed attempt, requeueing with exponential backoff while attempts remain."""
+    job = get_job_by_id(db, job_id)
+    if not job:
+        return None
+
+    job.last_error = error
+    job.locked_by = None
+    job.locked_at = None
+    if job.attempts < job.max_attempts:
+        delay = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+        job.status = JOB_QUEUED
+        job.run_after = datetime.now(timezone.utc) + timedelta(seconds=delay)
+    else:
+        job.status = JOB_FAILED
+        job.finished_at = datetime.now(timezone.utc)
+
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def requeue_stale_jobs(db: Session, max_age: timedelta) -> int:
+    """Requeue running jobs whose worker has not finished them within max_age (e.g. it crashed)."""
+    cutoff = datetime.now(timezone.utc) - max_age
+    stale = db.query(Job).filter(Job.status == JOB_RUNNING, Job.locked_at < cutoff)
+    
+    # A job that keeps killing its worker must not be retried forever
+    stale.filter(Job.attempts >= Job.max_attempts).update({
+        Job.status: JOB_FAILED,
+        Job.locked_by: None,
+        Job.locked_at: None,
+        Job.last_error: "Worker did not finish the job in time",
+        Job.finished_at: func.now(),
+    }, synchronize_session=False)
+    
+    count = stale.update({
+        Job.status: JOB_QUEUED,
+        Job.locked_by: None,
+        Job.locked_at: None,
+        Job.last_error: "Worker did not finish the job in time",
+    }, synchronize_session=False)
+    db.commit()
+    return count
+
+
+def retry_job(db: Session, job_id: int) -> Optional[Job]:
+    """Put a failed job back on the queue with a fresh set of attempts."""
+    job = get_job_by_id(db, job_id)
+    if not job:
+        return None
+    if job.status != JOB_FAILED:
+        raise ValueError(f"Only failed jobs can be retried; job {job_id} is {job.status}")
+
+    job.status = JOB_QUEUED
+    job.attempts = 0
+    job.run_after = datetime.now(timezone.utc)
+    job.finished_at = None
+    db.commit()
+    db.refresh(job)
+    return job
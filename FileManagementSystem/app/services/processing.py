@@ -0,0 +1,135 @@
+from typing import Callable, Dict, Any, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.database.models import Attachment, Job
+from app.database.session import SessionLocal
+from app.schemas.attachment import AttachmentCreate
+from app.services.attachment import (
+    create_attachment,
+    create_attachment_version,
+    get_attachment_by_id,
+    get_attachment_metrics,
+    get_capture_columns,
+)
+from app.services.job import enqueue_job
+from app.utils.files import file_storage
+from app.utils.preview import TextPreview
+from app.utils.series import SeriesPyramid
+
+PROCESS_ATTACHMENT = "process_attachment"
+
+# Uploads are processed ahead of bulk work such as reprocessing old captures
+UPLOAD_JOB_PRIORITY = 10
+
+
+def needs_processing(attachment: Attachment) -> bool:
+    """Whether an attachment has derived data worth building in the background."""
+    return bool(attachment.presentmon_file) or file_storage.get_mime_type(attachment.filename).startswith("text/")
+
+
+def enqueue_attachment_processing(
+    db: Session,
+    attachment: Attachment,
+    created_by: Optional[int] = None,
+    priority: int = UPLOAD_JOB_PRIORITY,
+    commit: bool = True,
+) -> Optional[Job]:
+    """Queue background processing for a new attachment, if it has anything to process."""
+    if not needs_processing(attachment):
+        return None
+    return enqueue_job(
+        db,
+        PROCESS_ATTACHMENT,
+        {"attachment_id": attachment.id},
+        priority=priority,
+        attachment_id=attachment.id,
+        created_by=created_by,
+        commit=commit,
+    )
+
+
+def _commit_with_processing(db: Session, attachment: Attachment) -> Optional[Job]:
+    """Queue processing for a flushed attachment and commit both, so a stored upload never lacks its job."""
+    try:
+        job = enqueue_attachment_processing(db, attachment, attachment.uploaded_by, commit=False)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise ValueError(f"Database error: {e}")
+    
+    db.refresh(attachment)
+    if job:
+        db.refresh(job)
+    return job
+
+
+def create_processed_attachment(db: Session, attachment_in: AttachmentCreate) -> Tuple[Attachment, Optional[Job]]:
+    """Create an attachment record together with its processing job."""
+    attachment = create_attachment(db, attachment_in, commit=False)
+    return attachment, _commit_with_processing(db, attachment)
+
+
+def create_processed_attachment_version(
+    db: Session,
+    original_attachment_id: int,
+    new_filename: str,
+    new_relative_path: str,
+    uploaded_by: int,
+    content_hash: Optional[str] = None,
+    file_size: Optional[int] = None
+) -> Tuple[Attachment, Optional[Job]]:
+    """Create a new version of an attachment together with its processing job."""
+    attachment = create_attachment_version(
+        db, original_attachment_id, new_filename, new_relative_path, uploaded_by, content_hash, file_size, commit=False
+    )
+    return attachment, _commit_with_processing(db, attachment)
+
+
+def process_attachment(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the derived data of an attachment: text line index, PresentMon columns, metrics and pyramid."""
+    attachment_id = payload["attachment_id"]
+    attachment = get_attachment_by_id(db, attachment_id)
+    if not attachment:
+        raise ValueError(f"Attachment with ID {attachment_id} does not exist")
+
+    file_path = file_storage.get_file_path(attachment.relative_path, attachment.filename)
+    if not file_path.exists():
+        raise FileNotFoundError(f"File for attachment {attachment_id} not found on server")
+
+    result: Dict[str, Any] = {"attachment_id": attachment_id}
+
+    if file_storage.get_mime_type(attachment.filename).startswith("text/"):
+        with TextPreview(file_path) as preview:
+            result["lines"] = preview.index.total_lines
+
+    if attachment.presentmon_file:
+        metrics = get_attachment_metrics(db, attachment_id)
+        SeriesPyramid(get_capture_columns(db, attachment), "frame_time")
+        result["frame_count"] = metrics["frame_count"]
+        result["presentmon_schema"] = metrics["presentmon_schema"]
+
+    return result
+
+
+JOB_HANDLERS: Dict[str, Callable[[Session, Dict[str, Any]], Dict[str, Any]]] = {
+    PROCESS_ATTACHMENT: process_attachment,
+}
+
+
+def execute_job(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one job with its own session.
+
+    This is the entry point of worker processes, so it only takes plain,
+    picklable arguments and returns a JSON-serialisable result.
+    """
+    handler = JOB_HANDLERS.get(kind)
+    if handler is None:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    db = SessionLocal()
+    try:
+        return handler(db, payload)
+    finally:
+        db.close()
@@ -3,6 +3,10 @@ from sqlalchemy.orm import Session
 
 from app.database.models import Project
 from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.services.reference_data import reference_data_changed
+from app.utils.pagination import SortKey, paginate
+
+PROJECT_SORT = (SortKey(Project.id),)
 
 
 def get_project_by_id(db: Session, project_id: int) -> Optional[Project]:
@@ -13,6 +17,7 @@ def get_projects(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     client_id: Optional[int] = None,
 ) -> List[Project]:
     query = db.query(Project)
@@ -20,12 +25,13 @@ def get_projects(
     if client_id is not None:
         query = query.filter(Project.client_id == client_id)
 
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, PROJECT_SORT, skip, limit, cursor)
 
 
 def create_project(db: Session, project_in: ProjectCreate) -> Project:
     project = Project(**project_in.dict())
     db.add(project)
+    reference_data_changed(db, Project)
     db.commit()
     db.refresh(project)
     return project
@@ -43,6 +49,7 @@ def update_project(
     for field, value in project_in.dict(exclude_unset=True).items():
         setattr(project, field, value)
 
+    reference_data_changed(db, Project)
     db.commit()
     db.refresh(project)
     return project
@@ -0,0 +1,163 @@
+import threading
+import time
+from dataclasses import make_dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple, Type
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.models import Status, StatusSet, Resolution, Scenario, TesterType, Client, Project
+from app.utils.events import PgListener
+
+REFERENCE_DATA_CHANNEL = "reference_data"
+
+# Small lookup tables that are read on most requests and rarely written
+REFERENCE_MODELS = (Status, StatusSet, Resolution, Scenario, TesterType, Client, Project)
+
+
+def _row_class(model: Type) -> Type:
+    # Plain frozen copies of the columns: safe to share between threads and
+    # sessions, and readable by the from_attributes response schemas
+    columns = [attribute.key for attribute in model.__mapper__.column_attrs]
+    return make_dataclass(f"{model.__name__}Row", columns, frozen=True)
+
+
+_ROW_CLASSES = {model: _row_class(model) for model in REFERENCE_MODELS}
+
+
+def _copy(model: Type, row: Any) -> Any:
+    return _ROW_CLASSES[model](**{
+        attribute.key: getattr(row, attribute.key) for attribute in model.__mapper__.column_attrs
+    })
+
+
+class ReferenceTable:
+    """One cached table: rows in id order, indexed by id and (where the table has one) by name."""
+
+    def __init__(self, rows: Sequence[Any]):
+        self.rows: Tuple[Any, ...] = tuple(rows)
+        self.by_id: Dict[int, Any] = {row.id: row for row in self.rows}
+        self.by_name: Dict[str, Any] = {}
+        for row in self.rows:
+            name = getattr(row, "name", None)
+            # Names are not unique everywhere (statuses repeat across status
+            # sets); the lowest id wins, as it does for .first() by id
+            if name is not None and name not in self.by_name:
+                self.by_name[name] = row
+
+
+class ReferenceSnapshot:
+    """An immutable copy of every reference table, loaded together."""
+
+    def __init__(self, version: int, tables: Dict[Type, ReferenceTable]):
+        self.version = version
+        self.tables = tables
+
+    def rows(self, model: Type) -> Tuple[Any, ...]:
+        return self.tables[model].rows
+
+    def get(self, model: Type, row_id: Optional[int]) -> Optional[Any]:
+        return self.tables[model].by_id.get(row_id)
+
+    def get_by_name(self, model: Type, name: str) -> Optional[Any]:
+        return self.tables[model].by_name.get(name)
+
+
+class ReferenceDataCache:
+    """
+    Process-wide cache of the reference tables.
+
+    snapshot() returns the current ReferenceSnapshot, loading all tables in
+    one pass when the cache is empty, invalidated or older than the TTL.
+    Services that write a reference table call reference_data_changed()
+    before committing: the local cache is dropped once the transaction
+    commits, and a NOTIFY tells every other API and worker process (each
+    LISTENs once it has loaded a snapshot on Postgres) to drop theirs. The
+    TTL only matters if notifications are lost.
+    """
+
+    def __init__(self, dsn: str, ttl_seconds: float, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._snapshot: Optional[ReferenceSnapshot] = None
+        self._loaded_at = 0.0
+        self._version = 0
+        # Bumped by invalidate(); a load that started before an invalidation
+        # is used for its own request but not kept
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._listener = PgListener(dsn, REFERENCE_DATA_CHANNEL, lambda payload: self.invalidate(), self.invalidate)
+
+    def snapshot(self, db: Session) -> ReferenceSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and self._clock() - self._loaded_at < self.ttl_seconds:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and self._clock() - self._loaded_at < self.ttl_seconds:
+                return self._snapshot
+            if not self._listener.running and db.get_bind().dialect.name == "postgresql":
+                # Changes made before the listener connects are covered by the TTL
+                self._listener.start()
+
+            generation = self._generation
+            self._version += 1
+            # Loaded from the primary even on a read session: a snapshot taken
+            # from a lagging replica right after a change would be kept for the TTL
+            snapshot = ReferenceSnapshot(self._version, {
+                model: ReferenceTable([
+                    _copy(model, row)
+                    for row in db.query(model).execution_options(use_primary=True).order_by(model.id).all()
+                ])
+                for model in REFERENCE_MODELS
+            })
+            if generation == self._generation:
+                self._snapshot = snapshot
+                self._loaded_at = self._clock()
+            return snapshot
+
+    def get(self, db: Session, model: Type, row_id: Optional[int]) -> Optional[Any]:
+        """
+        A row by id.
+        
+        A miss is checked against the database, so a row created moments ago
+        by another process is found before its notification arrives.
+        """
+        row = self.snapshot(db).get(model, row_id)
+        if row is None and row_id is not None:
+            found = db.query(model).execution_options(use_primary=True).filter(model.id == row_id).first()
+            if found is not None:
+                self.invalidate()
+                row = _copy(model, found)
+        return row
+
+    def get_by_name(self, db: Session, model: Type, name: str) -> Optional[Any]:
+        """A row by name (the lowest id when names repeat), with the same fallback as get()."""
+        row = self.snapshot(db).get_by_name(model, name)
+        if row is None:
+            found = db.query(model).execution_options(use_primary=True).filter(model.name == name).order_by(model.id).first()
+            if found is not None:
+                self.invalidate()
+                row = _copy(model, found)
+        return row
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._snapshot = None
+
+    def stop(self) -> None:
+        self._listener.stop()
+
+
+reference_data = ReferenceDataCache(settings.DATABASE_URL, settings.REFERENCE_DATA_TTL_SECONDS)
+
+
+def reference_data_changed(db: Session, model: Type) -> None:
+    """
+    Announce a write to a reference table; call before committing it.
+
+    The NOTIFY is delivered to the other processes only if the transaction
+    commits, and this process drops its cache right after the commit.
+    """
+    db.execute(select(func.pg_notify(REFERENCE_DATA_CHANNEL, model.__tablename__)))
+    event.listen(db, "after_commit", lambda session: reference_data.invalidate(), once=True)
@@ -1,36 +1,47 @@
-from typing import List, Optional
+from typing import Any, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.database.models import Resolution
 from app.schemas.resolution import ResolutionCreate, ResolutionUpdate
+from app.services.reference_data import reference_data, reference_data_changed
+from app.utils.pagination import SortKey, paginate_items
+
+RESOLUTION_SORT = (SortKey(Resolution.id),)
 
 
 def get_resolution_by_id(db: Session, resolution_id: int) -> Optional[Resolution]:
     return db.query(Resolution).filter(Resolution.id == resolution_id).first()
 
 
+def get_cached_resolution(db: Session, resolution_id: int) -> Optional[Any]:
+    """Get a read-only copy of a resolution from the reference-data cache."""
+    return reference_data.snapshot(db).get(Resolution, resolution_id)
+
+
 def get_resolutions(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     w: Optional[int] = None,
     h: Optional[int] = None,
 ) -> List[Resolution]:
-    query = db.query(Resolution)
+    resolutions = reference_data.snapshot(db).rows(Resolution)
 
     if w is not None:
-        query = query.filter(Resolution.w == w)
+        resolutions = [resolution for resolution in resolutions if resolution.w == w]
     if h is not None:
-        query = query.filter(Resolution.h == h)
+        resolutions = [resolution for resolution in resolutions if resolution.h == h]
 
-    return query.offset(skip).limit(limit).all()
+    return paginate_items(resolutions, RESOLUTION_SORT, skip, limit, cursor)
 
 
 def create_resolution(db: Session, resolution_in: ResolutionCreate) -> Resolution:
     resolution = Resolution(**resolution_in.dict())
     db.add(resolution)
     try:
+        reference_data_changed(db, Resolution)
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -53,6 +64,7 @@ def update_resolution(
     for field, value in update_data.items():
         setattr(resolution, field, value)
 
+    reference_data_changed(db, Resolution)
     db.commit()
     db.refresh(resolution)
     return resolution
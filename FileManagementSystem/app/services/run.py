@@ -1,13 +1,22 @@
 # --- /home/oleksiak/FileManagementTool/FileManagementSystem/app/services/run.py ---
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import and_, or_, func, case
+from sqlalchemy import and_, or_, case, select
 from sqlalchemy.sql import label
 
-from app.database.models import Run, Project, Execution, Status
+from app.database.models import Run, Project
 from app.schemas.run import RunCreate, RunUpdate, RunStatsResponse
+from app.services.reference_data import reference_data
+from app.services.run_status_count import get_run_status_counts
+from app.utils.pagination import SortKey, paginate, paginate_async
+
+RUN_SORT = (
+    SortKey(Run.started_at, descending=True),
+    SortKey(Run.id, descending=True),
+)
 
 
 def get_run_by_id(db: Session, run_id: int) -> Optional[Run]:
@@ -15,10 +24,8 @@ def get_run_by_id(db: Session, run_id: int) -> Optional[Run]:
     return db.query(Run).filter(Run.id == run_id).first()
 
 
-def get_runs(
-    db: Session,
-    skip: int = 0,
-    limit: int = 100,
+def _filter_runs(
+    query: Any,
     name: Optional[str] = None,
     project_id: Optional[int] = None,
     started_after: Optional[datetime] = None,
@@ -26,10 +33,8 @@ def get_runs(
     done_after: Optional[datetime] = None,
     done_before: Optional[datetime] = None,
     completed: Optional[bool] = None,
-) -> List[Run]:
-    """Get multiple runs with optional filtering."""
-    query = db.query(Run)
-
+) -> Any:
+    """Apply the run list filters to a Query or a select() of Run."""
     if name:
         query = query.filter(Run.name.ilike(f"%{name}%"))
     if project_id is not None:
@@ -48,13 +53,33 @@ def get_runs(
         else:
             query = query.filter(Run.done_at.is_(None))
 
-    return query.order_by(Run.started_at.desc()).offset(skip).limit(limit).all()
+    return query
+
+
+def get_runs(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    name: Optional[str] = None,
+    project_id: Optional[int] = None,
+    started_after: Optional[datetime] = None,
+    started_before: Optional[datetime] = None,
+    done_after: Optional[datetime] = None,
+    done_before: Optional[datetime] = None,
+    completed: Optional[bool] = None,
+) -> List[Run]:
+    """Get multiple runs with optional filtering."""
+    query = _filter_runs(
+        db.query(Run), name, project_id, started_after, started_before, done_after, done_before, completed
+    )
+    return paginate(query, RUN_SORT, skip, limit, cursor)
 
 
 def create_run(db: Session, run_in: RunCreate) -> Run:
     """Create a new run."""
     # Check if project exists
-    project = db.query(Project).filter(Project.id == run_in.project_id).first()
+    project = reference_data.get(db, Project, run_in.project_id)
     if not project:
         raise ValueError(f"Project with ID {run_in.project_id} does not exist")
     
@@ -101,9 +126,12 @@ def update_run(
     return run
 
 
-def get_runs_by_project(db: Session, project_id: int) -> List[Run]:
-    """Get all runs for a specific project."""
-    return db.query(Run).filter(Run.project_id == project_id).order_by(Run.started_at.desc()).all()
+def get_runs_by_project(
+    db: Session, project_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Run]:
+    """Get one page of the runs of a specific project, latest started first."""
+    query = db.query(Run).filter(Run.project_id == project_id)
+    return paginate(query, RUN_SORT, skip, limit, cursor)
 
 
 def get_run_stats(db: Session, run_id: int) -> Optional[RunStatsResponse]:
@@ -112,16 +140,8 @@ def get_run_stats(db: Session, run_id: int) -> Optional[RunStatsResponse]:
     if not run:
         return None
     
-    # Get execution counts by status
-    executions_query = db.query(
-        Execution.status_id,
-        Status.name,
-        func.count(Execution.id).label('count')
-    ).join(Status, Execution.status_id == Status.id
-    ).filter(Execution.run_id == run_id
-    ).group_by(Execution.status_id, Status.name)
-    
-    executions = executions_query.all()
+    # Get execution counts by status from the run_status_count rollup
+    executions = get_run_status_counts(db, run_id)
     
     # Calculate totals
     total_executions = sum(exec.count for exec in executions)
@@ -183,4 +203,39 @@ def get_active_runs(db: Session) -> List[Run]:
             Run.started_at.isnot(None),
             Run.done_at.is_(None)
         )
-    ).order_by(Run.started_at.desc()).all()
\ No newline at end of file
+    ).order_by(Run.started_at.desc()).all()
+
+
+# Async variants for the AsyncSession endpoints; see the execution service
+
+async def get_runs_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    name: Optional[str] = None,
+    project_id: Optional[int] = None,
+    started_after: Optional[datetime] = None,
+    started_before: Optional[datetime] = None,
+    done_after: Optional[datetime] = None,
+    done_before: Optional[datetime] = None,
+    completed: Optional[bool] = None,
+) -> List[Run]:
+    """Get multiple runs with optional filtering."""
+    statement = _filter_runs(
+        select(Run), name, project_id, started_after, started_before, done_after, done_before, completed
+    )
+    return await paginate_async(db, statement, RUN_SORT, skip, limit, cursor)
+
+
+async def get_runs_by_project_async(
+    db: AsyncSession, project_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Run]:
+    """Get one page of the runs of a specific project, latest started first."""
+    statement = select(Run).where(Run.project_id == project_id)
+    return await paginate_async(db, statement, RUN_SORT, skip, limit, cursor)
+
+
+async def get_run_stats_async(db: AsyncSession, run_id: int) -> Optional[RunStatsResponse]:
+    """Get statistics for a run."""
+    return await db.run_sync(get_run_stats, run_id)
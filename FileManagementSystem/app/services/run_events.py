@@ -0,0 +1,141 @@
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database.models import Execution, RunStatusCount, Status
+from app.database.session import SessionLocal
+from app.services.run import get_run_stats
+from app.utils.events import NotificationBroker, RESET
+
+RUN_EVENTS_CHANNEL = "run_events"
+
+# One LISTEN connection per API process, shared by every /runs/{id}/events client
+run_event_broker = NotificationBroker(
+    settings.DATABASE_URL,
+    RUN_EVENTS_CHANNEL,
+    route_field="runs",
+    queue_size=settings.RUN_EVENTS_QUEUE_SIZE,
+)
+
+
+def _counts(rows: List[Any]) -> List[Dict[str, int]]:
+    return [{"run_id": row.run_id, "status_id": row.status_id, "count": row.count} for row in rows]
+
+
+def _notify(db: Session, event: Dict[str, Any]) -> None:
+    # NOTIFY is transactional: listeners only see it once the caller commits,
+    # and never if the write rolls back
+    db.execute(select(func.pg_notify(RUN_EVENTS_CHANNEL, json.dumps(event, default=str))))
+
+
+def publish_execution_change(db: Session, execution: Execution, counts: List[Any]) -> None:
+    """
+    Announce an execution write that moved the run status counts.
+
+    `counts` are the rollup rows returned by record_execution_change. They
+    carry the new absolute count of every (run, status) the write touched,
+    so subscribers can apply events idempotently on top of any snapshot.
+    """
+    if not counts:
+        return
+    _notify(db, {
+        "type": "execution",
+        "runs": sorted({row.run_id for row in counts} | {execution.run_id}),
+        "execution_id": execution.id,
+        "run_id": execution.run_id,
+        "status_id": execution.status_id,
+        "executed_at": execution.executed_at,
+        "counts": _counts(counts),
+    })
+
+
+def publish_executions_created(db: Session, run_id: int, created: int, counts: List[Any]) -> None:
+    """Announce executions added to a run in bulk, as one event."""
+    if not created:
+        return
+    _notify(db, {
+        "type": "executions_created",
+        "runs": [run_id],
+        "run_id": run_id,
+        "created": created,
+        "counts": _counts(counts),
+    })
+
+
+def get_run_snapshot(db: Session, run_id: int) -> Optional[Dict[str, Any]]:
+    """The current stats and per-status counts of a run, sent before any event."""
+    stats = get_run_stats(db, run_id)
+    if not stats:
+        return None
+
+    rows = db.query(
+        RunStatusCount.run_id, RunStatusCount.status_id, Status.name, RunStatusCount.count
+    ).join(Status, RunStatusCount.status_id == Status.id).filter(
+        RunStatusCount.run_id == run_id,
+        RunStatusCount.count > 0
+    ).order_by(RunStatusCount.status_id).all()
+
+    return {
+        "type": "snapshot",
+        "runs": [run_id],
+        "run_id": run_id,
+        "stats": stats.model_dump(mode="json"),
+        "counts": [
+            {"run_id": row.run_id, "status_id": row.status_id, "name": row.name, "count": row.count}
+            for row in rows
+        ],
+    }
+
+
+def _load_snapshot(run_id: int) -> Optional[Dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        return get_run_snapshot(db, run_id)
+    finally:
+        db.close()
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def run_event_stream(run_id: int, broker: NotificationBroker = run_event_broker) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for one run: a snapshot, then every change as it commits.
+
+    The subscription is registered, and LISTEN is in effect, before the
+    snapshot is read, so no change falls between the two; events carry
+    absolute counts, so one that is already reflected in the snapshot is
+    harmless. After a reset (the client
+    fell behind, or the LISTEN connection dropped) a fresh snapshot is sent.
+    """
+    subscription = broker.subscribe(run_id)
+    try:
+        # Ask EventSource clients to wait a few seconds before reconnecting
+        yield f"retry: {settings.RUN_EVENTS_RETRY_MS}\n\n"
+        if not await broker.wait_listening(settings.RUN_EVENTS_LISTEN_TIMEOUT_SECONDS):
+            # The snapshot below may miss changes made until LISTEN is up
+            broker.reset_when_listening(subscription)
+        snapshot = await run_in_threadpool(_load_snapshot, run_id)
+        if snapshot is None:
+            return
+        yield _sse(snapshot)
+
+        while True:
+            event = await subscription.get(timeout=settings.RUN_EVENTS_HEARTBEAT_SECONDS)
+            if event is None:
+                # Comment line: keeps proxies from closing an idle stream
+                yield f": keep-alive {datetime.utcnow().isoformat()}\n\n"
+            elif event is RESET:
+                snapshot = await run_in_threadpool(_load_snapshot, run_id)
+                if snapshot is None:
+                    return
+                yield _sse(snapshot)
+            else:
+                yield _sse(event)
+    finally:
+        subscription.close()
@@ -0,0 +1,176 @@
+import calendar
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import func, cast, Numeric, case, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.database.models import Execution, RunStatusCount, Status
+
+# What an execution contributes to the rollup: (run_id, status_id, executed_at)
+ExecutionState = Tuple[int, int, Optional[datetime]]
+
+
+def execution_state(execution: Any) -> ExecutionState:
+    """The rollup-relevant fields of an execution (model, schema or dict row)."""
+    if isinstance(execution, dict):
+        return execution["run_id"], execution["status_id"], execution.get("executed_at")
+    return execution.run_id, execution.status_id, execution.executed_at
+
+
+def _epoch_seconds(value: Optional[datetime]) -> Decimal:
+    # Naive timestamps are UTC throughout the services (datetime.utcnow()).
+    # Exact to the microsecond, like EXTRACT(EPOCH ...) on a timestamp
+    if not value:
+        return Decimal(0)
+    return calendar.timegm(value.utctimetuple()) + Decimal(value.microsecond).scaleb(-6)
+
+
+def _apply(db: Session, deltas: Dict[Tuple[int, int], List[int]]) -> List[Any]:
+    # Keys are written in a fixed order so concurrent transactions touching
+    # the same runs lock their rollup rows in the same order
+    rows = [
+        {
+            "run_id": run_id,
+            "status_id": status_id,
+            "count": count,
+            "executed_count": executed_count,
+            "executed_at_sum": executed_at_sum,
+        }
+        for (run_id, status_id), (count, executed_count, executed_at_sum) in sorted(deltas.items())
+        if count or executed_count or executed_at_sum
+    ]
+    if not rows:
+        return []
+
+    stmt = pg_insert(RunStatusCount).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RunStatusCount.run_id, RunStatusCount.status_id],
+        set_={
+            "count": RunStatusCount.count + stmt.excluded.count,
+            "executed_count": RunStatusCount.executed_count + stmt.excluded.executed_count,
+            "executed_at_sum": RunStatusCount.executed_at_sum + stmt.excluded.executed_at_sum,
+        }
+    ).returning(RunStatusCount.run_id, RunStatusCount.status_id, RunStatusCount.count)
+    return db.execute(stmt).all()
+
+
+def _add(deltas: Dict[Tuple[int, int], List[int]], state: ExecutionState, sign: int) -> None:
+    run_id, status_id, executed_at = state
+    delta = deltas[(run_id, status_id)]
+    delta[0] += sign
+    if executed_at is not None:
+        delta[1] += sign
+        delta[2] += sign * _epoch_seconds(executed_at)
+
+
+def record_execution_change(
+    db: Session, before: Optional[ExecutionState], after: Optional[ExecutionState]
+) -> List[Any]:
+    """
+    Move an execution's contribution in the rollup from `before` to `after`.
+
+    Pass None as `before` for a new execution and as `after` for a deleted
+    one. The update is issued in the caller's transaction, so it commits or
+    rolls back together with the execution write. Returns the updated
+    (run_id, status_id, count) rows.
+    """
+    if before == after:
+        return []
+    deltas: Dict[Tuple[int, int], List[int]] = defaultdict(lambda: [0, 0, 0])
+    if before is not None:
+        _add(deltas, before, -1)
+    if after is not None:
+        _add(deltas, after, 1)
+    return _apply(db, deltas)
+
+
+def record_executions_created(db: Session, states: Iterable[ExecutionState]) -> List[Any]:
+    """Add many new executions to the rollup with one statement. Returns the updated rows."""
+    deltas: Dict[Tuple[int, int], List[int]] = defaultdict(lambda: [0, 0, 0])
+    for state in states:
+        _add(deltas, state, 1)
+    return _apply(db, deltas)
+
+
+def _live_counts_query(db: Session, run_id: Optional[int] = None):
+    """The rollup computed from scratch, with a GROUP BY over executions."""
+    executed = Execution.executed_at.isnot(None)
+    query = db.query(
+        Execution.run_id,
+        Execution.status_id,
+        func.count(Execution.id).label("count"),
+        func.count(Execution.executed_at).label("executed_count"),
+        func.coalesce(func.sum(
+            case((executed, cast(func.extract("epoch", Execution.executed_at), Numeric)), else_=0)
+        ), 0).label("executed_at_sum"),
+    )
+    if run_id is not None:
+        query = query.filter(Execution.run_id == run_id)
+    return query.group_by(Execution.run_id, Execution.status_id)
+
+
+def rebuild_run_status_counts(db: Session, run_id: Optional[int] = None) -> int:
+    """Recompute the rollup (of one run, or all runs) from the executions. Returns the rows written."""
+    # Execution writes update the rollup in their own transaction; they wait
+    # until the rebuild commits, so none is lost or counted twice
+    db.execute(text("LOCK TABLE run_status_count IN EXCLUSIVE MODE"))
+    existing = db.query(RunStatusCount)
+    if run_id is not None:
+        existing = existing.filter(RunStatusCount.run_id == run_id)
+    existing.delete(synchronize_session=False)
+
+    rows = [dict(row._mapping) for row in _live_counts_query(db, run_id).all()]
+    if rows:
+        db.execute(pg_insert(RunStatusCount).values(rows))
+    db.commit()
+    return len(rows)
+
+
+def check_run_status_counts(db: Session, run_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Compare the rollup against the executions and return every (run, status) that disagrees."""
+    live = {(row.run_id, row.status_id): row for row in _live_counts_query(db, run_id).all()}
+
+    stored_query = db.query(RunStatusCount)
+    if run_id is not None:
+        stored_query = stored_query.filter(RunStatusCount.run_id == run_id)
+    stored = {(row.run_id, row.status_id): row for row in stored_query.all()}
+
+    fields = ("count", "executed_count", "executed_at_sum")
+    mismatches = []
+    for key in sorted(live.keys() | stored.keys()):
+        expected = tuple(getattr(live[key], field) if key in live else 0 for field in fields)
+        actual = tuple(getattr(stored[key], field) if key in stored else 0 for field in fields)
+        if expected != actual:
+            mismatches.append({
+                "run_id": key[0],
+                "status_id": key[1],
+                "expected": dict(zip(fields, expected)),
+                "actual": dict(zip(fields, actual)),
+            })
+    return mismatches
+
+
+def average_execution_seconds(counts: Iterable[Any], started_at: Optional[datetime]) -> Optional[float]:
+    """Mean time from the run start to each executed execution, from get_run_status_counts rows."""
+    counts = list(counts)
+    executed = sum(row.executed_count for row in counts)
+    if not executed or started_at is None:
+        return None
+    return float(sum(row.executed_at_sum for row in counts) / executed - _epoch_seconds(started_at))
+
+
+def get_run_status_counts(db: Session, run_id: Optional[int] = None):
+    """Per-status totals from the rollup, for one run or summed over all runs."""
+    query = db.query(
+        Status.name,
+        func.sum(RunStatusCount.count).label("count"),
+        func.sum(RunStatusCount.executed_count).label("executed_count"),
+        func.sum(RunStatusCount.executed_at_sum).label("executed_at_sum"),
+    ).join(Status, RunStatusCount.status_id == Status.id).filter(RunStatusCount.count > 0)
+
+    if run_id is not None:
+        query = query.filter(RunStatusCount.run_id == run_id)
+    return query.group_by(Status.name).all()
@@ -3,19 +3,26 @@ from sqlalchemy.orm import Session
 
 from app.database.models import Scenario
 from app.schemas.scenario import ScenarioCreate, ScenarioUpdate
+from app.services.reference_data import reference_data_changed
+from app.utils.pagination import SortKey, paginate
+
+SCENARIO_SORT = (SortKey(Scenario.id),)
 
 
 def get_scenario_by_id(db: Session, scenario_id: int) -> Optional[Scenario]:
     return db.query(Scenario).filter(Scenario.id == scenario_id).first()
 
 
-def get_scenarios(db: Session, skip: int = 0, limit: int = 100) -> List[Scenario]:
-    return db.query(Scenario).offset(skip).limit(limit).all()
+def get_scenarios(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Scenario]:
+    return paginate(db.query(Scenario), SCENARIO_SORT, skip, limit, cursor)
 
 
 def create_scenario(db: Session, scenario_in: ScenarioCreate) -> Scenario:
     scenario = Scenario(**scenario_in.dict())
     db.add(scenario)
+    reference_data_changed(db, Scenario)
     db.commit()
     db.refresh(scenario)
     return scenario
@@ -29,6 +36,7 @@ def update_scenario(db: Session, scenario_id: int, scenario_in: ScenarioUpdate)
     for field, value in scenario_in.dict(exclude_unset=True).items():
         setattr(scenario, field, value)
 
+    reference_data_changed(db, Scenario)
     db.commit()
     db.refresh(scenario)
     return scenario
@@ -1,10 +1,14 @@
 # --- /home/oleksiak/FileManagementTool/FileManagementSystem/app/services/status.py ---
-from typing import List, Optional
+from typing import Any, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.database.models import Status
 from app.schemas.status import StatusCreate, StatusUpdate
+from app.services.reference_data import reference_data, reference_data_changed
+from app.utils.pagination import SortKey, paginate_items
+
+STATUS_SORT = (SortKey(Status.id),)
 
 
 def get_status_by_id(db: Session, status_id: int) -> Optional[Status]:
@@ -12,22 +16,28 @@ def get_status_by_id(db: Session, status_id: int) -> Optional[Status]:
     return db.query(Status).filter(Status.id == status_id).first()
 
 
+def get_cached_status(db: Session, status_id: int) -> Optional[Any]:
+    """Get a read-only copy of a status from the reference-data cache."""
+    return reference_data.snapshot(db).get(Status, status_id)
+
+
 def get_statuses(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     name: Optional[str] = None,
     status_set_id: Optional[int] = None,
 ) -> List[Status]:
-    """Get multiple statuses with optional filtering."""
-    query = db.query(Status)
+    """Get multiple statuses with optional filtering, from the reference-data cache."""
+    statuses = reference_data.snapshot(db).rows(Status)
 
     if name:
-        query = query.filter(Status.name.ilike(f"%{name}%"))
+        statuses = [status for status in statuses if name.lower() in status.name.lower()]
     if status_set_id is not None:
-        query = query.filter(Status.status_set_id == status_set_id)
+        statuses = [status for status in statuses if status.status_set_id == status_set_id]
 
-    return query.offset(skip).limit(limit).all()
+    return paginate_items(statuses, STATUS_SORT, skip, limit, cursor)
 
 
 def create_status(db: Session, status_in: StatusCreate) -> Status:
@@ -35,6 +45,7 @@ def create_status(db: Session, status_in: StatusCreate) -> Status:
     status = Status(**status_in.dict())
     db.add(status)
     try:
+        reference_data_changed(db, Status)
         db.commit()
     except IntegrityError as e:
         db.rollback()
@@ -65,6 +76,7 @@ def update_status(
         setattr(status, field, value)
 
     try:
+        reference_data_changed(db, Status)
         db.commit()
     except IntegrityError as e:
         db.rollback()
@@ -3,19 +3,26 @@ from sqlalchemy.orm import Session
 
 from app.database.models import StatusSet
 from app.schemas.status_set import StatusSetCreate, StatusSetUpdate
+from app.services.reference_data import reference_data_changed
+from app.utils.pagination import SortKey, paginate
+
+STATUS_SET_SORT = (SortKey(StatusSet.id),)
 
 
 def get_status_set_by_id(db: Session, status_set_id: int) -> Optional[StatusSet]:
     return db.query(StatusSet).filter(StatusSet.id == status_set_id).first()
 
 
-def get_status_sets(db: Session, skip: int = 0, limit: int = 100) -> List[StatusSet]:
-    return db.query(StatusSet).offset(skip).limit(limit).all()
+def get_status_sets(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[StatusSet]:
+    return paginate(db.query(StatusSet), STATUS_SET_SORT, skip, limit, cursor)
 
 
 def create_status_set(db: Session, status_set_in: StatusSetCreate) -> StatusSet:
     status_set = StatusSet(**status_set_in.dict())
     db.add(status_set)
+    reference_data_changed(db, StatusSet)
     db.commit()
     db.refresh(status_set)
     return status_set
@@ -29,6 +36,7 @@ def update_status_set(db: Session, status_set_id: int, status_set_in: StatusSetU
     for field, value in status_set_in.dict(exclude_unset=True).items():
         setattr(status_set, field, value)
 
+    reference_data_changed(db, StatusSet)
     db.commit()
     db.refresh(status_set)
     return status_set
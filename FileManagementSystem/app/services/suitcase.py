@@ -5,6 +5,11 @@ from sqlalchemy.exc import IntegrityError
 
 from app.database.models import Suitcase, TestCase, TestSuite, TestCaseVersion
 from app.schemas.suitcase import SuitcaseCreate
+from app.services.test_case import TEST_CASE_SORT
+from app.services.test_suite import TEST_SUITE_SORT
+from app.utils.pagination import SortKey, paginate
+
+SUITCASE_SORT = (SortKey(Suitcase.id),)
 
 
 def get_suitcase_by_id(db: Session, suitcase_id: int) -> Optional[Suitcase]:
@@ -16,6 +21,7 @@ def get_suitcases(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     test_case_id: Optional[int] = None,
     test_suite_id: Optional[int] = None,
 ) -> List[Suitcase]:
@@ -27,7 +33,7 @@ def get_suitcases(
     if test_suite_id is not None:
         query = query.filter(Suitcase.test_suite_id == test_suite_id)
 
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, SUITCASE_SORT, skip, limit, cursor)
 
 
 def create_suitcase(db: Session, suitcase_in: SuitcaseCreate) -> Suitcase:
@@ -64,14 +70,23 @@ def create_suitcase(db: Session, suitcase_in: SuitcaseCreate) -> Suitcase:
     return suitcase
 
 
-def get_test_cases_by_test_suite(db: Session, test_suite_id: int) -> List[TestCase]:
-    """Get all test cases for a specific test suite."""
-    return db.query(TestCase).join(Suitcase).filter(Suitcase.test_suite_id == test_suite_id).all()
+def get_test_cases_by_test_suite(
+    db: Session, test_suite_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[TestCase]:
+    """Get one page of the test cases of a specific test suite."""
+    query = db.query(TestCase).join(Suitcase).filter(Suitcase.test_suite_id == test_suite_id)
+    return paginate(query, TEST_CASE_SORT, skip, limit, cursor)
+
+
+def _test_suites_by_test_case_query(db: Session, test_case_id: int):
+    return db.query(TestSuite).join(Suitcase).filter(Suitcase.test_case_id == test_case_id)
 
 
-def get_test_suites_by_test_case(db: Session, test_case_id: int) -> List[TestSuite]:
-    """Get all test suites for a specific test case."""
-    return db.query(TestSuite).join(Suitcase).filter(Suitcase.test_case_id == test_case_id).all()
+def get_test_suites_by_test_case(
+    db: Session, test_case_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[TestSuite]:
+    """Get one page of the test suites that contain a specific test case."""
+    return paginate(_test_suites_by_test_case_query(db, test_case_id), TEST_SUITE_SORT, skip, limit, cursor)
 
 
 def get_test_suite_with_test_cases(db: Session, test_suite_id: int) -> Dict[str, Any]:
@@ -133,7 +148,10 @@ def get_test_case_with_test_suites(db: Session, test_case_id: int) -> Dict[str,
     if not test_case:
         raise ValueError(f"Test case with ID {test_case_id} does not exist")
     
-    test_suites = get_test_suites_by_test_case(db, test_case_id)
+    # The whole list is returned in one response, so it is read in one query
+    test_suites = _test_suites_by_test_case_query(db, test_case_id).order_by(
+        *[key.order_by() for key in TEST_SUITE_SORT]
+    ).all()
     
     return {
         "test_case_id": test_case.id,
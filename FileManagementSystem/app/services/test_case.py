@@ -6,6 +6,9 @@ from sqlalchemy import and_
 
 from app.database.models import TestCase
 from app.schemas.test_case import TestCaseCreate, TestCaseUpdate
+from app.utils.pagination import SortKey, paginate
+
+TEST_CASE_SORT = (SortKey(TestCase.id),)
 
 
 def get_test_case_by_id(db: Session, test_case_id: int) -> Optional[TestCase]:
@@ -17,6 +20,7 @@ def get_test_cases(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     scenario_id: Optional[int] = None,
     status_set_id: Optional[int] = None,
 ) -> List[TestCase]:
@@ -28,7 +32,7 @@ def get_test_cases(
     if status_set_id is not None:
         query = query.filter(TestCase.status_set_id == status_set_id)
 
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, TEST_CASE_SORT, skip, limit, cursor)
 
 
 def create_test_case(db: Session, test_case_in: TestCaseCreate) -> TestCase:
@@ -81,14 +85,20 @@ def update_test_case(
     return test_case
 
 
-def get_test_cases_by_scenario(db: Session, scenario_id: int) -> List[TestCase]:
-    """Get all test cases for a specific scenario."""
-    return db.query(TestCase).filter(TestCase.scenario_id == scenario_id).all()
+def get_test_cases_by_scenario(
+    db: Session, scenario_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[TestCase]:
+    """Get one page of the test cases for a specific scenario."""
+    query = db.query(TestCase).filter(TestCase.scenario_id == scenario_id)
+    return paginate(query, TEST_CASE_SORT, skip, limit, cursor)
 
 
-def get_test_cases_by_status_set(db: Session, status_set_id: int) -> List[TestCase]:
-    """Get all test cases for a specific status set."""
-    return db.query(TestCase).filter(TestCase.status_set_id == status_set_id).all()
+def get_test_cases_by_status_set(
+    db: Session, status_set_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[TestCase]:
+    """Get one page of the test cases for a specific status set."""
+    query = db.query(TestCase).filter(TestCase.status_set_id == status_set_id)
+    return paginate(query, TEST_CASE_SORT, skip, limit, cursor)
 
 
 def get_test_case_with_versions(db: Session, test_case_id: int) -> Optional[TestCase]:
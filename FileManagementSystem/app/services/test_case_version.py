@@ -6,6 +6,12 @@ from sqlalchemy import desc, and_
 
 from app.database.models import TestCaseVersion, TestCase, Tester
 from app.schemas.test_case_version import TestCaseVersionCreate, TestCaseVersionUpdate
+from app.utils.pagination import SortKey, paginate
+
+TEST_CASE_VERSION_SORT = (
+    SortKey(TestCaseVersion.version, descending=True),
+    SortKey(TestCaseVersion.id, descending=True),
+)
 
 
 def get_test_case_version_by_id(db: Session, version_id: int) -> Optional[TestCaseVersion]:
@@ -17,6 +23,7 @@ def get_test_case_versions(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     test_case_id: Optional[int] = None,
     created_by: Optional[int] = None,
     release_ready: Optional[bool] = None,
@@ -34,7 +41,7 @@ def get_test_case_versions(
     if version is not None:
         query = query.filter(TestCaseVersion.version == version)
 
-    return query.order_by(desc(TestCaseVersion.version)).offset(skip).limit(limit).all()
+    return paginate(query, TEST_CASE_VERSION_SORT, skip, limit, cursor)
 
 
 def get_latest_version_for_test_case(db: Session, test_case_id: int) -> Optional[TestCaseVersion]:
@@ -115,11 +122,12 @@ def update_test_case_version(
     return version
 
 
-def get_versions_by_test_case(db: Session, test_case_id: int) -> List[TestCaseVersion]:
-    """Get all versions for a specific test case."""
-    return db.query(TestCaseVersion).filter(
-        TestCaseVersion.test_case_id == test_case_id
-    ).order_by(desc(TestCaseVersion.version)).all()
+def get_versions_by_test_case(
+    db: Session, test_case_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[TestCaseVersion]:
+    """Get one page of the versions of a specific test case, newest first."""
+    query = db.query(TestCaseVersion).filter(TestCaseVersion.test_case_id == test_case_id)
+    return paginate(query, TEST_CASE_VERSION_SORT, skip, limit, cursor)
 
 
 def get_version_by_test_case_and_number(db: Session, test_case_id: int, version_number: int) -> Optional[TestCaseVersion]:
@@ -3,14 +3,19 @@ from sqlalchemy.orm import Session
 
 from app.database.models import TestSuite
 from app.schemas.test_suite import TestSuiteCreate, TestSuiteUpdate
+from app.utils.pagination import SortKey, paginate
+
+TEST_SUITE_SORT = (SortKey(TestSuite.id),)
 
 
 def get_test_suite_by_id(db: Session, test_suite_id: int) -> Optional[TestSuite]:
     return db.query(TestSuite).filter(TestSuite.id == test_suite_id).first()
 
 
-def get_test_suites(db: Session, skip: int = 0, limit: int = 100) -> List[TestSuite]:
-    return db.query(TestSuite).offset(skip).limit(limit).all()
+def get_test_suites(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[TestSuite]:
+    return paginate(db.query(TestSuite), TEST_SUITE_SORT, skip, limit, cursor)
 
 
 def create_test_suite(db: Session, test_suite_in: TestSuiteCreate) -> TestSuite:
@@ -2,8 +2,13 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from app.database.models import Tester, TesterType
-from app.utils.auth import hash_password
+from app.utils.auth import password_hasher
 from app.schemas.tester import TesterCreate, TesterUpdate, TesterCreateAdmin
+from app.services.reference_data import reference_data
+from app.utils.pagination import SortKey, paginate
+from app.utils.principal_cache import principal_cache
+
+TESTER_SORT = (SortKey(Tester.id),)
 
 def get_tester_by_id(db: Session, tester_id: int) -> Optional[Tester]:
     return db.query(Tester).filter(Tester.id == tester_id).first()
@@ -15,6 +20,7 @@ def get_testers(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     email: Optional[str] = None,
     first_name: Optional[str] = None,
     last_name: Optional[str] = None,
@@ -38,10 +44,10 @@ def get_testers(
     if last_name:
         query = query.filter(Tester.last_name.ilike(f"%{last_name}%"))
 
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, TESTER_SORT, skip, limit, cursor)
 
 def create_tester(db: Session, tester_in: TesterCreate) -> Tester:
-    tester_type = db.query(TesterType).filter_by(name="regular").first()
+    tester_type = reference_data.get_by_name(db, TesterType, "regular")
 
     if not tester_type:
         raise ValueError("Invalid tester type")
@@ -50,7 +56,7 @@ def create_tester(db: Session, tester_in: TesterCreate) -> Tester:
         email=tester_in.email,
         first_name=tester_in.first_name,
         last_name=tester_in.last_name,
-        password=hash_password(tester_in.password),
+        password=password_hasher.hash(tester_in.password),
         tester_type_id=tester_type.id,
     )
     db.add(db_tester)
@@ -60,13 +66,15 @@ def create_tester(db: Session, tester_in: TesterCreate) -> Tester:
 
 
 def create_tester_self(db: Session, data: TesterCreate) -> Tester:
-    regular_type = db.query(TesterType).filter_by(id=3).one()
+    regular_type = reference_data.get(db, TesterType, 3)
+    if not regular_type:
+        raise ValueError("Invalid tester type")
 
     tester = Tester(
         email=data.email,
         first_name=data.first_name,
         last_name=data.last_name,
-        password=hash_password(data.password),
+        password=password_hasher.hash(data.password),
         tester_type_id=regular_type.id,
         active=True,
     )
@@ -81,7 +89,7 @@ def create_tester_admin(db: Session, data: TesterCreateAdmin) -> Tester:
         email=data.email,
         first_name=data.first_name,
         last_name=data.last_name,
-        password=hash_password(data.password),
+        password=password_hasher.hash(data.password),
         tester_type_id=data.tester_type_id or 3,
         tester_group_id=data.tester_group_id,
         active=data.active if data.active is not None else True,
@@ -102,5 +110,6 @@ def update_tester(db: Session, tester_id: int, tester_in: TesterUpdate) -> Optio
         setattr(db_tester, field, value)
     
     db.commit()
+    principal_cache.invalidate(tester_id)
     db.refresh(db_tester)
     return db_tester
\ No newline at end of file
@@ -4,6 +4,10 @@ from sqlalchemy.exc import IntegrityError
 
 from app.database.models import TesterGroup, Tester
 from app.schemas.tester_group import TesterGroupCreate, TesterGroupUpdate
+from app.utils.pagination import SortKey, paginate
+from app.utils.principal_cache import principal_cache
+
+TESTER_GROUP_SORT = (SortKey(TesterGroup.name), SortKey(TesterGroup.id))
 
 
 def get_tester_group_by_id(db: Session, group_id: int) -> Optional[TesterGroup]:
@@ -15,6 +19,7 @@ def get_tester_groups(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     name: Optional[str] = None,
     created_by_id: Optional[int] = None,
     owner_id: Optional[int] = None,
@@ -29,7 +34,7 @@ def get_tester_groups(
     if owner_id is not None:
         query = query.filter(TesterGroup.owner_id == owner_id)
 
-    return query.order_by(TesterGroup.name).offset(skip).limit(limit).all()
+    return paginate(query, TESTER_GROUP_SORT, skip, limit, cursor)
 
 
 def create_tester_group(db: Session, group_in: TesterGroupCreate, created_by_id: int) -> TesterGroup:
@@ -152,6 +157,7 @@ def add_member_to_group(db: Session, group_id: int, tester_id: int) -> Tester:
     
     tester.tester_group_id = group_id
     db.commit()
+    principal_cache.invalidate(tester_id)
     db.refresh(tester)
     return tester
 
@@ -171,6 +177,7 @@ def remove_member_from_group(db: Session, group_id: int, tester_id: int) -> bool
     
     tester.tester_group_id = None
     db.commit()
+    principal_cache.invalidate(tester_id)
     return True
 
 
@@ -202,4 +209,6 @@ def remove_all_members_from_group(db: Session, group_id: int) -> int:
         member.tester_group_id = None
     
     db.commit()
+    for member in members:
+        principal_cache.invalidate(member.id)
     return len(members)
\ No newline at end of file
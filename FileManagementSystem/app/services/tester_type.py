@@ -3,6 +3,10 @@ from sqlalchemy.orm import Session
 
 from app.database.models import TesterType
 from app.schemas.tester_type import TesterTypeCreate, TesterTypeUpdate
+from app.services.reference_data import reference_data_changed
+from app.utils.pagination import SortKey, paginate
+
+TESTER_TYPE_SORT = (SortKey(TesterType.id),)
 
 
 def get_tester_type_by_id(db: Session, tester_type_id: int) -> Optional[TesterType]:
@@ -17,13 +21,15 @@ def get_tester_types(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> List[TesterType]:
-    return db.query(TesterType).offset(skip).limit(limit).all()
+    return paginate(db.query(TesterType), TESTER_TYPE_SORT, skip, limit, cursor)
 
 
 def create_tester_type(db: Session, tester_type_in: TesterTypeCreate) -> TesterType:
     tester_type = TesterType(**tester_type_in.dict())
     db.add(tester_type)
+    reference_data_changed(db, TesterType)
     db.commit()
     db.refresh(tester_type)
     return tester_type
@@ -41,6 +47,7 @@ def update_tester_type(
     for field, value in tester_type_in.dict(exclude_unset=True).items():
         setattr(tester_type, field, value)
 
+    reference_data_changed(db, TesterType)
     db.commit()
     db.refresh(tester_type)
     return tester_type
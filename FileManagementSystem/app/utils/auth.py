@@ -1,9 +1,95 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.config import settings
+
+# Hashes made with other rounds still verify; they are flagged for a rehash
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; on success also return a new hash when the stored one uses outdated parameters."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing pool already has its maximum of pending work."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated process pool.
+
+    A hash costs a few hundred milliseconds of CPU; done in the API process
+    it holds a request worker for that long and a login burst queues every
+    other request behind it. The pool caps hashing at `workers` cores and at
+    `max_pending` queued or running hashes, past which submit() raises
+    PasswordHasherBusy so the caller can answer 429 instead of queueing
+    without bound.
+
+    The pool is created on first use, so processes that never hash (the
+    job worker, the CLI) never start it.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordHasherBusy("Too many password operations in progress")
+            if self._pool is None:
+                # spawn: forking a process that runs an event loop and threads is unsafe
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            self._pending += 1
+        try:
+            future = self._pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # A pool process died; the next call starts a new pool
+            with self._lock:
+                self._pool = None
+            self._release()
+            raise
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, *args) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def hash(self, password: str) -> str:
+        """Hash a password in the pool, blocking the calling thread until it is done."""
+        return self.submit(hash_password, password).result()
+
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self.submit(hash_password, password))
+
+    async def verify_and_update_async(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await asyncio.wrap_future(self.submit(verify_and_update, plain_password, hashed_password))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
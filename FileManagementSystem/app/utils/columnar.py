@@ -0,0 +1,170 @@
+import json
+import os
+import re
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.utils.files import COLUMNAR_DIRECTORY, FileStorage, file_storage
+from app.utils.presentmon import detect_parser, read_capture, read_header
+
+# Bump when the on-disk layout or column dtypes change
+CACHE_VERSION = 2
+META_NAME = "meta.json"
+
+# Timestamps need the extra precision; per-frame durations do not
+COLUMN_DTYPES = {
+    "time": np.float64,
+}
+DEFAULT_DTYPE = np.float32
+
+CONTENT_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class ColumnarCapture:
+    """Read-only, memory-mapped columns of a parsed capture."""
+
+    def __init__(self, path: Path, meta: Dict[str, object]):
+        self.path = path
+        self.rows: int = meta["rows"]
+        self.dtypes: Dict[str, str] = meta["columns"]
+        self.schema: str = meta["presentmon_schema"]
+        self._columns: Dict[str, np.ndarray] = {}
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.dtypes)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.dtypes
+
+    def column(self, name: str) -> np.ndarray:
+        """Map one column; pages are only read from disk when they are touched."""
+        if name not in self.dtypes:
+            raise KeyError(name)
+        if name not in self._columns:
+            if self.rows == 0:
+                self._columns[name] = np.empty(0, dtype=self.dtypes[name])
+            else:
+                self._columns[name] = np.memmap(
+                    self.path / f"{name}.bin", dtype=self.dtypes[name], mode="r", shape=(self.rows,)
+                )
+        return self._columns[name]
+
+    def chunks(self, rows: int) -> Iterable[Dict[str, np.ndarray]]:
+        """Yield column slices of at most `rows` rows, in the shape read_capture produces."""
+        columns = {name: self.column(name) for name in self.dtypes}
+        for start in range(0, self.rows, rows):
+            yield {name: values[start:start + rows] for name, values in columns.items()}
+
+
+class ColumnarCache:
+    """
+    Parsed PresentMon captures stored as one raw typed array per column.
+
+    Entries live under uploads/.columnar/<2 hex>/<content hash>/ and are keyed
+    by the file's digest, so every attachment sharing a file shares its entry.
+    An entry is written into a temporary directory and renamed into place, so
+    readers never see a half-written cache.
+    """
+
+    def __init__(self, storage: FileStorage = file_storage):
+        self.storage = storage
+
+    @property
+    def root(self) -> Path:
+        return self.storage.base_path / COLUMNAR_DIRECTORY
+
+    def entry_path(self, content_hash: str) -> Path:
+        if not CONTENT_HASH_PATTERN.match(content_hash):
+            raise ValueError(f"Invalid content hash: {content_hash}")
+        return self.root / content_hash[:2] / content_hash
+
+    def load(self, content_hash: str) -> Optional[ColumnarCapture]:
+        """Open a cached entry, or return None if there is no usable one."""
+        path = self.entry_path(content_hash)
+        try:
+            with open(path / META_NAME) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("cache_version") != CACHE_VERSION:
+            return None
+        return ColumnarCapture(path, meta)
+
+    def build(self, content_hash: str, source: Path, presentmon_version: Optional[str] = None) -> ColumnarCapture:
+        """Parse a capture once and write its columns to the cache."""
+        parser = detect_parser(read_header(source), presentmon_version)
+        path = self.entry_path(content_hash)
+        if path.exists() and self.load(content_hash) is None:
+            # Left behind by an older cache version
+            self.invalidate(content_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.parent / f"{content_hash}.{uuid.uuid4().hex}.tmp"
+        temp_path.mkdir()
+
+        try:
+            rows = 0
+            dtypes: Dict[str, str] = {}
+            outputs = {}
+            try:
+                for chunk in read_capture(source, parser=parser):
+                    for name, values in chunk.items():
+                        if name not in outputs:
+                            dtypes[name] = np.dtype(COLUMN_DTYPES.get(name, DEFAULT_DTYPE)).str
+                            outputs[name] = open(temp_path / f"{name}.bin", "wb")
+                        values.astype(dtypes[name]).tofile(outputs[name])
+                    rows += len(next(iter(chunk.values())))
+            finally:
+                for output in outputs.values():
+                    output.close()
+
+            meta = {
+                "cache_version": CACHE_VERSION,
+                "content_hash": content_hash,
+                "presentmon_schema": parser.version,
+                "rows": rows,
+                "columns": dtypes,
+            }
+            with open(temp_path / META_NAME, "w") as f:
+                json.dump(meta, f)
+
+            try:
+                os.rename(temp_path, path)
+            except OSError:
+                # Another request built the same entry first; keep theirs
+                if not (path / META_NAME).exists():
+                    raise
+                shutil.rmtree(temp_path, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            raise
+
+        return self.load(content_hash)
+
+    def load_or_build(
+        self, content_hash: str, source: Path, presentmon_version: Optional[str] = None
+    ) -> ColumnarCapture:
+        return self.load(content_hash) or self.build(content_hash, source, presentmon_version)
+
+    def invalidate(self, content_hash: Optional[str]) -> bool:
+        """Drop the cached entry for a digest; it is rebuilt on the next read."""
+        if not content_hash:
+            return False
+        path = self.entry_path(content_hash)
+        if not path.exists():
+            return False
+        # Rename first so concurrent readers either see the old entry or none
+        doomed = path.parent / f"{content_hash}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.rename(path, doomed)
+        except OSError:
+            return False
+        shutil.rmtree(doomed, ignore_errors=True)
+        return True
+
+
+columnar_cache = ColumnarCache()
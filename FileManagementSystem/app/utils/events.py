@@ -0,0 +1,222 @@
+import asyncio
+import json
+import select
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, Set
+
+import psycopg2
+
+# Put on a subscriber's queue when events may have been lost (slow consumer
+# or a dropped LISTEN connection); the subscriber should resynchronise
+RESET = {"type": "reset"}
+
+
+class Subscription:
+    """One client's view of a broker: a bounded queue of events for one key."""
+
+    def __init__(self, broker: "NotificationBroker", key: Any, queue_size: int):
+        self.broker = broker
+        self.key = key
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def push(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client that cannot keep up gets a reset instead of an
+            # ever-growing backlog
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESET)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """The next event, or None when nothing arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class PgListener:
+    """
+    A background thread holding one LISTEN connection on a Postgres channel.
+
+    Every notification payload is passed to `on_notify` on the listener
+    thread. `listening` is set while LISTEN is in effect, and `on_listen` is
+    called each time it is established. When that follows a dropped or
+    failed connection, `on_reconnect` is called too, since notifications
+    sent in between are lost.
+    """
+
+    def __init__(self, dsn: str, channel: str, on_notify: Callable[[str], None],
+                 on_reconnect: Optional[Callable[[], None]] = None, reconnect_delay: float = 2.0,
+                 on_listen: Optional[Callable[[], None]] = None):
+        self.dsn = dsn
+        self.channel = channel
+        self.on_notify = on_notify
+        self.on_reconnect = on_reconnect
+        self.on_listen = on_listen
+        self.reconnect_delay = reconnect_delay
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self.listening = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen, name=f"listen-{self.channel}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _listen(self) -> None:
+        # Whether notifications may have been missed since the thread started
+        missed = False
+        while not self._stopping.is_set():
+            try:
+                conn = psycopg2.connect(self.dsn)
+            except psycopg2.OperationalError as e:
+                print(f"[EVENTS] Could not connect to LISTEN on {self.channel}: {e}")
+                missed = True
+                time.sleep(self.reconnect_delay)
+                continue
+
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                self.listening.set()
+                if self.on_listen is not None:
+                    self.on_listen()
+                if missed and self.on_reconnect is not None:
+                    self.on_reconnect()
+                missed = False
+
+                while not self._stopping.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self.on_notify(conn.notifies.pop(0).payload)
+            except (psycopg2.Error, OSError) as e:
+                print(f"[EVENTS] LISTEN connection on {self.channel} lost: {e}")
+                missed = True
+                time.sleep(self.reconnect_delay)
+            finally:
+                self.listening.clear()
+                conn.close()
+
+
+class NotificationBroker:
+    """
+    Fans out Postgres NOTIFY payloads on one channel to in-process subscribers.
+
+    A single LISTEN connection per process receives every notification; the
+    listener thread decodes each JSON payload once and hands it to the
+    event loop, which pushes it onto the queue of every subscriber whose key
+    is listed in the payload's `route_field`. Subscribers therefore cost no
+    database connection or query of their own.
+
+    The listener starts with the first subscriber, so importing this module
+    (e.g. from the CLI or a worker) never opens a connection.
+    """
+
+    def __init__(self, dsn: str, channel: str, route_field: str, queue_size: int = 100,
+                 reconnect_delay: float = 2.0):
+        self.channel = channel
+        self.route_field = route_field
+        self.queue_size = queue_size
+        self._subscribers: Dict[Any, Set[Subscription]] = defaultdict(set)
+        # Subscribers that gave up waiting for LISTEN; reset once it is up
+        self._waiting: Set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener = PgListener(dsn, channel, self._on_notify, self._on_reconnect, reconnect_delay,
+                                    on_listen=self._on_listen)
+
+    def subscribe(self, key: Any) -> Subscription:
+        """Register a subscriber for `key`. Must be called from the event loop."""
+        if not self._listener.running:
+            self._loop = asyncio.get_running_loop()
+            self._listener.start()
+        subscription = Subscription(self, key, self.queue_size)
+        self._subscribers[key].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._waiting.discard(subscription)
+        subscribers = self._subscribers.get(subscription.key)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.key]
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    async def wait_listening(self, timeout: float) -> bool:
+        """
+        Wait until the LISTEN connection is established; False after `timeout` seconds.
+
+        Notifications committed before LISTEN takes effect are never
+        delivered, so state read before this returns True may miss changes;
+        a subscriber that gives up waiting should call reset_when_listening.
+        """
+        if self._listener.listening.is_set():
+            return True
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._listener.listening.wait, timeout)
+
+    def reset_when_listening(self, subscription: Subscription) -> None:
+        """Push a reset to `subscription` as soon as LISTEN is in effect. Runs on the event loop."""
+        if self._listener.listening.is_set():
+            subscription.push(RESET)
+        else:
+            # _on_listen runs on this loop after the listener sets `listening`,
+            # so a subscription added here is never missed
+            self._waiting.add(subscription)
+
+    def stop(self) -> None:
+        self._listener.stop()
+
+    def dispatch(self, event: Dict[str, Any]) -> None:
+        """Deliver a decoded event to its subscribers. Runs on the event loop."""
+        for key in event.get(self.route_field) or []:
+            for subscription in list(self._subscribers.get(key, ())):
+                subscription.push(event)
+
+    def _reset_all(self) -> None:
+        for subscribers in list(self._subscribers.values()):
+            for subscription in list(subscribers):
+                subscription.push(RESET)
+
+    def _on_notify(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        self._loop.call_soon_threadsafe(self.dispatch, event)
+
+    def _reset_waiting(self) -> None:
+        waiting, self._waiting = self._waiting, set()
+        for subscription in waiting:
+            subscription.push(RESET)
+
+    def _on_listen(self) -> None:
+        self._loop.call_soon_threadsafe(self._reset_waiting)
+
+    def _on_reconnect(self) -> None:
+        self._loop.call_soon_threadsafe(self._reset_all)
@@ -1,34 +1,61 @@
 # --- /home/oleksiak/FileManagementTool/FileManagementSystem/app/utils/file_management.py ---
 import os
 import shutil
+from collections import Counter
 from pathlib import Path
-from typing import List, Tuple
-from datetime import datetime
+from typing import Iterable, List, Tuple
+from datetime import datetime, timedelta
+
+from app.utils.files import COLUMNAR_DIRECTORY, INCOMING_DIRECTORY, PARTIAL_DIRECTORY, sidecar_parent
+
+# Directories holding uploads that do not have an attachment record yet
+IN_FLIGHT_DIRECTORIES = (INCOMING_DIRECTORY, PARTIAL_DIRECTORY)
+
+# Top-level directories that are not matched against attachment records
+UNTRACKED_DIRECTORIES = IN_FLIGHT_DIRECTORIES + (COLUMNAR_DIRECTORY,)
 
 
 class FileManager:
     def __init__(self, base_path: Path):
         self.base_path = base_path
     
-    def cleanup_orphaned_files(self, db_attachments: List[Tuple[str, str]]) -> List[str]:
-        """Remove files that exist on disk but don't have database records."""
+    def cleanup_orphaned_files(self, db_attachments: List[Tuple[str, str]], min_age: timedelta) -> List[str]:
+        """
+        Remove files that exist on disk but don't have database records.
+        
+        db_attachments holds one (filename, relative_path) pair per attachment
+        row. Content-addressed files are shared by several rows, so a file is
+        only removed once its reference count drops to zero.
+        
+        Files modified less than min_age ago are kept: an upload stores its
+        file before it commits the attachment row that references it.
+        """
         orphaned_files = []
+        cutoff = datetime.now().timestamp() - min_age.total_seconds()
+        references = Counter(
+            (db_filename, db_relative_path or "")
+            for db_filename, db_relative_path in db_attachments
+        )
         
         # Walk through all files in upload directory
         for root, dirs, files in os.walk(self.base_path):
+            # Uploads still being received have no record yet, and cached
+            # columns are cleaned up by content hash instead
+            if Path(root) == self.base_path:
+                dirs[:] = [d for d in dirs if d not in UNTRACKED_DIRECTORIES]
+            
             for file in files:
                 file_path = Path(root) / file
                 relative_path = str(file_path.relative_to(self.base_path).parent)
+                if relative_path == ".":
+                    relative_path = ""
                 
-                # Check if this file exists in database
-                found = False
-                for db_filename, db_relative_path in db_attachments:
-                    if file == db_filename and relative_path == db_relative_path:
-                        found = True
-                        break
-                
-                if not found:
+                # Sidecars (e.g. line indexes) live and die with their file
+                owner = sidecar_parent(file) or file
+                if references[(owner, relative_path)] == 0:
                     try:
+                        if file_path.stat().st_mtime >= cutoff:
+                            continue
                         file_path.unlink()
                         orphaned_files.append(str(file_path))
                     except OSError as e:
@@ -52,24 +79,99 @@ class FileManager:
         
         return empty_dirs
     
+    def cleanup_stale_uploads(self, max_age: timedelta) -> List[str]:
+        """Remove resumable uploads that have seen no activity for max_age."""
+        removed = []
+        partial_dir = self.base_path / PARTIAL_DIRECTORY
+        if not partial_dir.exists():
+            return removed
+        
+        cutoff = datetime.now().timestamp() - max_age.total_seconds()
+        for upload_dir in partial_dir.iterdir():
+            if not upload_dir.is_dir():
+                continue
+            try:
+                # Every chunk write renames into the directory and bumps its mtime
+                if upload_dir.stat().st_mtime < cutoff:
+                    shutil.rmtree(upload_dir)
+                    removed.append(str(upload_dir))
+            except OSError as e:
+                print(f"Failed to remove stale upload {upload_dir}: {e}")
+        
+        return removed
+    
+    def cleanup_columnar_cache(self, content_hashes: Iterable[str], min_age: timedelta) -> List[str]:
+        """
+        Remove cached columns whose content hash no attachment references.
+        
+        Temporary entries (<hash>.<uuid>.tmp) modified less than min_age ago
+        may be a build still being written and are kept.
+        """
+        removed = []
+        cache_dir = self.base_path / COLUMNAR_DIRECTORY
+        if not cache_dir.exists():
+            return removed
+        
+        referenced = set(content_hashes)
+        cutoff = datetime.now().timestamp() - min_age.total_seconds()
+        for shard in cache_dir.iterdir():
+            if not shard.is_dir():
+                continue
+            for entry in shard.iterdir():
+                # Leftover temporary entries are never referenced
+                if entry.name in referenced:
+                    continue
+                try:
+                    if entry.name.endswith(".tmp") and self._last_modified(entry) >= cutoff:
+                        continue
+                    if entry.is_dir():
+                        shutil.rmtree(entry)
+                    else:
+                        entry.unlink()
+                    removed.append(str(entry))
+                except OSError as e:
+                    print(f"Failed to remove cache entry {entry}: {e}")
+        
+        return removed
+    
+    @staticmethod
+    def _last_modified(path: Path) -> float:
+        # A build appends to its column files, which leaves the directory's own mtime unchanged
+        if not path.is_dir():
+            return path.stat().st_mtime
+        return max([path.stat().st_mtime] + [child.stat().st_mtime for child in path.iterdir()])
+    
     def get_storage_stats(self) -> dict:
         """Get statistics about file storage."""
         total_size = 0
         file_count = 0
         dir_count = 0
+        cache_size = 0
+        cache_entries = 0
+        cache_dir = self.base_path / COLUMNAR_DIRECTORY
         
         for root, dirs, files in os.walk(self.base_path):
             dir_count += len(dirs)
+            root_path = Path(root)
+            if root_path.parent == cache_dir:
+                cache_entries += len(dirs)
+            in_cache = root_path == cache_dir or cache_dir in root_path.parents
             for file in files:
-                file_path = Path(root) / file
-                total_size += file_path.stat().st_size
+                file_path = root_path / file
+                size = file_path.stat().st_size
+                total_size += size
                 file_count += 1
+                if in_cache:
+                    cache_size += size
         
         return {
             "total_size_bytes": total_size,
             "total_size_mb": total_size / (1024 * 1024),
             "file_count": file_count,
             "directory_count": dir_count,
+            "columnar_cache_bytes": cache_size,
+            "columnar_cache_mb": cache_size / (1024 * 1024),
+            "columnar_cache_entries": cache_entries,
             "upload_directory": str(self.base_path)
         }
     
@@ -1,4 +1,5 @@
 # --- /home/oleksiak/FileManagementTool/FileManagementSystem/app/utils/files.py ---
+import hashlib
 import os
 import shutil
 import uuid
@@ -7,12 +8,45 @@ from typing import Tuple, Optional
 from fastapi import UploadFile, HTTPException
 import mimetypes
 
+from app.config import settings
+
+# Uploads are streamed here first and moved into place once complete
+INCOMING_DIRECTORY = ".incoming"
+
+# Chunks of resumable uploads that have not been finalized yet
+PARTIAL_DIRECTORY = ".partial"
+
+# Parsed PresentMon columns, keyed by content hash
+COLUMNAR_DIRECTORY = ".columnar"
+
+# Derived data cached next to a stored file as <filename><suffix>
+LINE_INDEX_SUFFIX = ".lineidx"
+SIDECAR_SUFFIXES = (LINE_INDEX_SUFFIX,)
+
+
+def sidecar_parent(filename: str) -> Optional[str]:
+    """Return the stored filename a sidecar belongs to, or None if it is not a sidecar."""
+    for suffix in SIDECAR_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)]
+    return None
+
+# Content-addressed files live under objects/<2 hex>/<2 hex>/<digest><ext>
+OBJECTS_DIRECTORY = "objects"
+
 
 class FileStorage:
     def __init__(self, base_path: str = "uploads"):
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
     
+    @property
+    def incoming_path(self) -> Path:
+        """Directory holding uploads that are still being received."""
+        incoming = self.base_path / INCOMING_DIRECTORY
+        incoming.mkdir(parents=True, exist_ok=True)
+        return incoming
+    
     def generate_unique_filename(self, original_filename: str) -> str:
         """Generate a unique filename to avoid collisions."""
         ext = original_filename.split('.')[-1] if '.' in original_filename else ''
@@ -50,6 +84,52 @@ class FileStorage:
         
         return unique_filename, relative_path, str(full_path)
     
+    def content_address(self, content_hash: str, original_filename: str) -> Tuple[str, str]:
+        """Return the sharded (filename, relative_path) a digest is stored under."""
+        ext = original_filename.split('.')[-1] if '.' in original_filename else ''
+        filename = f"{content_hash}.{ext}" if ext else content_hash
+        relative_path = str(Path(OBJECTS_DIRECTORY) / content_hash[:2] / content_hash[2:4])
+        return filename, relative_path
+    
+    def store_content_addressed(self, temp_path: Path, original_filename: str, content_hash: str) -> Tuple[str, str, str]:
+        """
+        Move a received upload into the content-addressed store.
+        
+        If a file with the same digest is already stored, the received copy is
+        dropped and the existing file is shared instead.
+        """
+        filename, relative_path = self.content_address(content_hash, original_filename)
+        save_dir = self.create_subdirectory(relative_path)
+        full_path = save_dir / filename
+        
+        try:
+            # Touching the shared copy keeps the orphan cleanup off it until
+            # this upload's attachment row is committed
+            os.utime(full_path)
+            temp_path.unlink()
+        except FileNotFoundError:
+            os.replace(temp_path, full_path)
+        
+        return filename, relative_path, str(full_path)
+    
+    def store_received_file(self, temp_path: Path, original_filename: str, subdirectory: str = "") -> Tuple[str, str, str]:
+        """Move a fully received upload into place and return (filename, relative_path, full_path)."""
+        unique_filename = self.generate_unique_filename(original_filename)
+        
+        if subdirectory:
+            save_dir = self.create_subdirectory(subdirectory)
+        else:
+            save_dir = self.base_path
+        
+        full_path = save_dir / unique_filename
+        
+        # Same filesystem, so this is a rename rather than a copy
+        os.replace(temp_path, full_path)
+        
+        relative_path = str(save_dir.relative_to(self.base_path)) if subdirectory else ""
+        
+        return unique_filename, relative_path, str(full_path)
+    
     def get_file_path(self, relative_path: str, filename: str) -> Path:
         """Get the full path to a stored file."""
         if relative_path:
@@ -61,11 +141,16 @@ class FileStorage:
         file_path = self.get_file_path(relative_path, filename)
         return file_path.exists()
     
-    def delete_file(self, relative_path: str, filename: str) -> bool:
-        """Delete a stored file."""
+    def delete_file(self, relative_path: str, filename: str, references: int) -> bool:
+        """Delete a stored file unless attachments still reference it (`references` rows)."""
+        if references > 0:
+            return False
+        
         file_path = self.get_file_path(relative_path, filename)
         if file_path.exists():
             file_path.unlink()
+            for suffix in SIDECAR_SUFFIXES:
+                file_path.with_name(filename + suffix).unlink(missing_ok=True)
             
             # Try to remove empty directory
             if relative_path:
@@ -75,6 +160,14 @@ class FileStorage:
             return True
         return False
     
+    def compute_content_hash(self, relative_path: str, filename: str, chunk_size: int = 1024 * 1024) -> str:
+        """Compute the SHA-256 digest of a stored file."""
+        hasher = hashlib.sha256()
+        with open(self.get_file_path(relative_path, filename), "rb") as f:
+            for data in iter(lambda: f.read(chunk_size), b""):
+                hasher.update(data)
+        return hasher.hexdigest()
+    
     def get_file_size(self, relative_path: str, filename: str) -> int:
         """Get the size of a file in bytes."""
         file_path = self.get_file_path(relative_path, filename)
@@ -105,12 +198,15 @@ def validate_file_upload(file: UploadFile, max_size: int = 100 * 1024 * 1024) ->
             detail=f"File too large. Maximum size is {max_size / (1024*1024)}MB"
         )
     
-    # Check file extension (optional - add more validation as needed)
-    allowed_extensions = {'.txt', '.pdf', '.png', '.jpg', '.jpeg', '.gif', '.csv', '.json', '.xml'}
-    file_ext = os.path.splitext(file.filename)[1].lower()
+    validate_file_extension(file.filename)
+
+
+def validate_file_extension(filename: str) -> None:
+    """Reject filenames whose extension is not allowed."""
+    file_ext = os.path.splitext(filename)[1].lower()
     
-    if file_ext not in allowed_extensions:
+    if file_ext not in settings.ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
-            detail=f"File type not allowed. Allowed types: {', '.join(allowed_extensions)}"
+            detail=f"File type not allowed. Allowed types: {', '.join(settings.ALLOWED_EXTENSIONS)}"
         )
\ No newline at end of file
@@ -0,0 +1,155 @@
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.utils.profiling import QueryCounter
+
+
+@dataclass
+class PlanIssue:
+    """A plan node that an index could have avoided."""
+    node_type: str  # "Seq Scan", "Sort" or an index scan that only filters
+    relation: Optional[str]
+    detail: str  # the scan filter or the sort key
+    index: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self.node_type in ("Sort", "Incremental Sort"):
+            return f"{self.node_type} on {self.detail}"
+        target = self.relation or "?"
+        if self.index:
+            target += f" using {self.index}"
+        return f"{self.node_type} on {target}" + (f" (filter: {self.detail})" if self.detail else "")
+
+
+@dataclass
+class ShapeReport:
+    """EXPLAIN findings for the statements one query shape emits."""
+    name: str
+    statements: List[str] = field(default_factory=list)
+    issues: List[PlanIssue] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def capture_statements(engine: Engine, run: Callable[[], Any]) -> List[Tuple[str, Any]]:
+    """Run `run` and return the distinct SELECT statements (with their parameters) it executed."""
+    with QueryCounter(engine, keep_statements=True) as counter:
+        run()
+
+    seen = set()
+    statements = []
+    for statement, parameters in zip(counter.statements, counter.parameters):
+        if statement in seen or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            continue
+        seen.add(statement)
+        statements.append((statement, parameters))
+    return statements
+
+
+def explain(engine: Engine, statement: str, parameters: Any) -> Dict[str, Any]:
+    """
+    EXPLAIN (FORMAT JSON) a statement on Postgres and return the root plan node.
+
+    Sequential scans and sorts are disabled for the transaction. A small
+    development database always prefers a seq scan, so this asks whether
+    an index *could* serve the query; a Seq Scan or Sort left in the plan
+    means no usable index exists.
+    """
+    with engine.connect() as conn:
+        with conn.begin():
+            conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            conn.exec_driver_sql("SET LOCAL enable_sort = off")
+            result = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+
+    plan = json.loads(result) if isinstance(result, str) else result
+    return plan[0]["Plan"]
+
+
+# First key column of every index; expression indexes are left out
+INDEX_LEADING_COLUMNS = text("""
+    SELECT index_class.relname, attribute.attname
+    FROM pg_index
+    JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid
+    JOIN pg_attribute attribute ON attribute.attrelid = pg_index.indrelid AND attribute.attnum = pg_index.indkey[0]
+""")
+
+
+def index_leading_columns(engine: Engine) -> Dict[str, str]:
+    """Map every index name to its first key column."""
+    with engine.connect() as conn:
+        return {name: column for name, column in conn.execute(INDEX_LEADING_COLUMNS)}
+
+
+def _walk(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def _seeks(node: Dict[str, Any], leading_columns: Dict[str, str]) -> bool:
+    # Without a condition on its first column, an index is read from the start
+    condition = node.get("Index Cond")
+    if not condition:
+        return False
+    leading = leading_columns.get(node.get("Index Name", ""))
+    return leading is None or re.search(rf"\b{re.escape(leading)}\b", condition) is not None
+
+
+def plan_issues(
+    plan: Dict[str, Any],
+    tables: Optional[Sequence[str]] = None,
+    leading_columns: Optional[Dict[str, str]] = None,
+) -> List[PlanIssue]:
+    """
+    Find the plan nodes an index could have avoided, optionally only on `tables`.
+
+    Besides sequential scans and explicit sorts, these are index scans that
+    filter rows without seeking on the index's first column: they read the
+    index from its start and discard what the filter rejects, which costs
+    as much as a scan. `leading_columns` (see index_leading_columns) maps
+    index names to that column; without it only scans with no index
+    condition at all are reported.
+    """
+    leading_columns = leading_columns or {}
+    issues = []
+    for node in _walk(plan):
+        if node["Node Type"] == "Seq Scan":
+            issue = PlanIssue("Seq Scan", node.get("Relation Name"), node.get("Filter", ""))
+        elif (node["Node Type"] in ("Index Scan", "Index Only Scan")
+                and node.get("Filter") and not _seeks(node, leading_columns)):
+            issue = PlanIssue(node["Node Type"], node.get("Relation Name"), node["Filter"], node.get("Index Name"))
+        elif node["Node Type"] in ("Sort", "Incremental Sort"):
+            keys = node.get("Sort Key", [])
+            relation = keys[0].split(".", 1)[0] if keys and "." in keys[0] else None
+            issue = PlanIssue(node["Node Type"], relation, ", ".join(keys))
+        else:
+            continue
+        if tables and issue.relation not in tables:
+            continue
+        issues.append(issue)
+    return issues
+
+
+def advise(
+    engine: Engine,
+    shapes: Dict[str, Callable[[], Any]],
+    tables: Optional[Sequence[str]] = None,
+) -> List[ShapeReport]:
+    """Capture the statements of every query shape and report the ones an index does not cover."""
+    reports = []
+    leading_columns = index_leading_columns(engine)
+    for name, run in shapes.items():
+        report = ShapeReport(name)
+        try:
+            for statement, parameters in capture_statements(engine, run):
+                report.statements.append(statement)
+                plan = explain(engine, statement, parameters)
+                report.issues.extend(plan_issues(plan, tables, leading_columns))
+        except Exception as e:
+            report.error = str(e).splitlines()[0]
+        reports.append(report)
+    return reports
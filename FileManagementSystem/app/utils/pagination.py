@@ -0,0 +1,272 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import Date, DateTime, Select, and_, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """
+    One column of a listing's sort order.
+
+    NULLs rank above every value, as they do by default in Postgres (last
+    when ascending, first when descending). The placement is spelled out so
+    other databases order, and therefore page, the same way.
+    """
+    column: Any
+    descending: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.column.key
+
+    @property
+    def nullable(self) -> bool:
+        return bool(self.column.expression.nullable)
+
+    def order_by(self):
+        if self.descending:
+            clause = self.column.desc()
+            return clause.nulls_first() if self.nullable else clause
+        clause = self.column.asc()
+        return clause.nulls_last() if self.nullable else clause
+
+    def after(self, value: Any):
+        """Rows strictly after `value` on this key, or None when nothing can follow it."""
+        if self.descending:
+            if value is None:
+                return self.column.isnot(None) if self.nullable else None
+            return self.column < value
+        if value is None:
+            return None
+        beyond = self.column > value
+        return or_(beyond, self.column.is_(None)) if self.nullable else beyond
+
+    def equal(self, value: Any):
+        return self.column.is_(None) if value is None else self.column == value
+
+
+class Page(list):
+    """A list of results with the cursor of the following page (None on the last page)."""
+
+    def __init__(self, items: Sequence[Any] = (), next_cursor: Optional[str] = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _load(key: SortKey, value: Any) -> Any:
+    if value is None:
+        return None
+    column_type = key.column.expression.type
+    if isinstance(column_type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column_type, Date):
+        return date.fromisoformat(value)
+    return value
+
+
+def encode_cursor(keys: Sequence[SortKey], item: Any) -> str:
+    """Encode the sort key values of `item` as an opaque, URL-safe cursor."""
+    payload = {
+        "k": [key.name for key in keys],
+        "v": [_dump(getattr(item, key.name)) for key in keys],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(keys: Sequence[SortKey], cursor: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor for the same sort keys."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        names, values = payload["k"], payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+
+    if names != [key.name for key in keys] or len(values) != len(keys):
+        raise ValueError("Cursor does not belong to this listing")
+
+    try:
+        return [_load(key, value) for key, value in zip(keys, values)]
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def _row_comparable(keys: Sequence[SortKey], values: Sequence[Any]) -> bool:
+    # A plain row comparison lets the database seek straight into a matching
+    # composite index; it is only correct without NULLs and mixed directions
+    return (len({key.descending for key in keys}) == 1
+            and not any(key.nullable for key in keys)
+            and all(value is not None for value in values))
+
+
+def _rest_after(keys: Sequence[SortKey], values: Sequence[Any]):
+    """Rows strictly after `values` on `keys` (any directions and NULLs), or None when nothing can follow."""
+    if not keys:
+        return None
+    if _row_comparable(keys, values):
+        columns = tuple_(*[key.column for key in keys])
+        cursor = tuple_(*values)
+        return columns < cursor if keys[0].descending else columns > cursor
+
+    clauses = []
+    for index, key in enumerate(keys):
+        after = key.after(values[index])
+        if after is None:
+            continue
+        ties = [k.equal(v) for k, v in zip(keys[:index], values[:index])]
+        clauses.append(and_(*ties, after))
+    return or_(*clauses) if clauses else None
+
+
+def _within(first: SortKey, value: Any, rest: Sequence[SortKey], rest_values: Sequence[Any]):
+    # Rows tied with `value` on the first key that follow the cursor on the rest
+    after = _rest_after(rest, rest_values)
+    return and_(first.equal(value), after) if after is not None else None
+
+
+def _after_cursor(keys: Sequence[SortKey], values: Sequence[Any]) -> List[Any]:
+    """
+    The rows after a cursor, as filters for consecutive blocks of the sort order.
+
+    Every filter bounds the first sort key by a range or an IS [NOT] NULL
+    test, so the database can seek into an index that leads with it instead
+    of filtering the index from its start. NULLs of the first key sort as a
+    separate block (first when descending, last when ascending), which a
+    single range cannot cover; they get a filter of their own.
+    """
+    if _row_comparable(keys, values):
+        return [_rest_after(keys, values)]
+
+    first, value = keys[0], values[0]
+    rest, rest_values = keys[1:], values[1:]
+    within = _within(first, value, rest, rest_values)
+
+    if value is None:
+        blocks = [within]
+        if first.descending:
+            # Every non-NULL value follows the NULL block
+            blocks.append(first.column.isnot(None))
+        return [block for block in blocks if block is not None]
+
+    if first.descending:
+        bound, beyond = first.column <= value, first.column < value
+    else:
+        bound, beyond = first.column >= value, first.column > value
+    block = and_(bound, or_(beyond, within) if within is not None else beyond)
+    if first.nullable and not first.descending:
+        return [block, first.column.is_(None)]
+    return [block]
+
+
+def _order(query: Any, keys: Sequence[SortKey]) -> Any:
+    return query.order_by(*[key.order_by() for key in keys])
+
+
+def _page_statements(query: Any, keys: Sequence[SortKey], skip: int, cursor: Optional[str]) -> List[Any]:
+    # Works on a Query and on a 2.0 Select alike: both order, filter and limit
+    # the same way. The statements select consecutive blocks of the order
+    if cursor:
+        if skip:
+            raise ValueError("skip cannot be combined with cursor")
+        blocks = _after_cursor(keys, decode_cursor(keys, cursor))
+        return [_order(query.filter(block), keys) for block in blocks]
+    query = _order(query, keys)
+    return [query.offset(skip) if skip else query]
+
+
+def _page(rows: Sequence[Any], keys: Sequence[SortKey], limit: int) -> Page:
+    next_cursor = encode_cursor(keys, rows[limit - 1]) if len(rows) > limit else None
+    return Page(rows[:limit], next_cursor)
+
+
+def paginate(
+    query: Query,
+    keys: Sequence[SortKey],
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Page:
+    """
+    Order `query` by `keys` and return one page of it.
+
+    Without a cursor this is a regular offset page. With a cursor, rows are
+    selected by comparing the sort key tuple against the last row of the
+    previous page (keyset pagination), so the cost of a page no longer grows
+    with how deep it is. The last key must be unique (normally the primary
+    key) for the order to be stable. One extra row is fetched to find out
+    whether another page follows.
+    """
+    rows: List[Any] = []
+    for statement in _page_statements(query, keys, skip, cursor):
+        # One extra row tells whether another page follows
+        rows.extend(statement.limit(limit + 1 - len(rows)).all())
+        if len(rows) > limit:
+            break
+    return _page(rows, keys, limit)
+
+
+async def paginate_async(
+    db: AsyncSession,
+    statement: Select,
+    keys: Sequence[SortKey],
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Page:
+    """paginate() for a select() of one entity on an AsyncSession; same pages and cursors."""
+    rows: List[Any] = []
+    for block in _page_statements(statement, keys, skip, cursor):
+        rows.extend((await db.scalars(block.limit(limit + 1 - len(rows)))).all())
+        if len(rows) > limit:
+            break
+    return _page(rows, keys, limit)
+
+
+def paginate_items(
+    items: Sequence[Any],
+    keys: Sequence[SortKey],
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Page:
+    """
+    paginate() over objects already in memory, e.g. cached reference data.
+
+    Produces the same pages and cursors as paginate() would for the same
+    rows. The sort keys must not be NULL.
+    """
+    ordered = list(items)
+    for key in reversed(keys):
+        ordered.sort(key=lambda item: getattr(item, key.name), reverse=key.descending)
+
+    if cursor:
+        if skip:
+            raise ValueError("skip cannot be combined with cursor")
+        values = decode_cursor(keys, cursor)
+
+        def after(item: Any) -> bool:
+            for key, value in zip(keys, values):
+                current = getattr(item, key.name)
+                if current != value:
+                    return current < value if key.descending else current > value
+            return False
+
+        ordered = [item for item in ordered if after(item)]
+    elif skip:
+        ordered = ordered[skip:]
+
+    return _page(ordered, keys, limit)
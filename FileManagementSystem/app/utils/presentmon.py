@@ -0,0 +1,269 @@
+import csv
+import itertools
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Bump when the metric definitions change so cached results are recomputed
+METRICS_VERSION = 2
+
+# Rows parsed per chunk; bounds the text held in memory at once
+CHUNK_ROWS = 200_000
+
+FRAME_TIME_PERCENTILES = (50, 90, 95, 99, 99.9)
+
+# A frame is a stutter when it takes more than this multiple of the median
+STUTTER_FACTOR = 2.0
+
+# Without CPU timings, a frame is GPU-bound when the GPU was busy for at
+# least this fraction of the frame
+GPU_BOUND_THRESHOLD = 0.9
+
+# Shared schema every parser maps captures onto: frame_time, gpu_busy and
+# cpu_busy in milliseconds per frame, time as a timestamp in seconds
+CANONICAL_COLUMNS = ("frame_time", "gpu_busy", "cpu_busy", "time")
+
+_VERSION_PATTERN = re.compile(r"(\d+)")
+
+
+class PresentMonError(ValueError):
+    """Raised when a file cannot be read as a PresentMon capture."""
+
+
+@dataclass(frozen=True)
+class PresentMonParser:
+    """
+    Header layout of one PresentMon release line.
+
+    `columns` maps each canonical column to the header that carries it and
+    `signature` lists the headers that identify the release when sniffing.
+    """
+    version: str
+    signature: Tuple[str, ...]
+    columns: Dict[str, str]
+
+    def matches(self, header: List[str]) -> bool:
+        names = {name.strip() for name in header}
+        return all(name in names for name in self.signature)
+
+    def resolve(self, header: List[str]) -> Dict[str, int]:
+        """Map canonical column names to their index in a capture header."""
+        positions = {name.strip(): i for i, name in enumerate(header)}
+        columns = {
+            canonical: positions[name]
+            for canonical, name in self.columns.items()
+            if name in positions
+        }
+        if "frame_time" not in columns:
+            raise PresentMonError(
+                f"PresentMon {self.version}.x capture has no {self.columns['frame_time']} column"
+            )
+        return columns
+
+
+# Major version -> parser, newest first when sniffing
+PARSERS: Dict[str, PresentMonParser] = {}
+
+
+def register_parser(parser: PresentMonParser) -> PresentMonParser:
+    unknown = set(parser.columns) - set(CANONICAL_COLUMNS)
+    if unknown or "frame_time" not in parser.columns:
+        raise ValueError(f"Parser for PresentMon {parser.version}.x has an invalid column map")
+    PARSERS[parser.version] = parser
+    return parser
+
+
+register_parser(PresentMonParser(
+    version="2",
+    signature=("FrameTime",),
+    columns={
+        "frame_time": "FrameTime",
+        "gpu_busy": "GPUBusy",
+        "cpu_busy": "CPUBusy",
+        "time": "CPUStartTime",
+    },
+))
+
+register_parser(PresentMonParser(
+    version="1",
+    signature=("MsBetweenPresents",),
+    columns={
+        "frame_time": "MsBetweenPresents",
+        "gpu_busy": "MsGPUActive",
+        "time": "TimeInSeconds",
+    },
+))
+
+
+def parser_for_version(presentmon_version: Optional[str]) -> Optional[PresentMonParser]:
+    """Look up the parser for a declared version string such as "1.10.0" or "v2.3"."""
+    if not presentmon_version:
+        return None
+    match = _VERSION_PATTERN.search(presentmon_version)
+    return PARSERS.get(match.group(1)) if match else None
+
+
+def detect_parser(header: List[str], presentmon_version: Optional[str] = None) -> PresentMonParser:
+    """
+    Pick the parser for a capture header.
+
+    A declared version is used when its headers are present; otherwise, or
+    when the file does not look like the declared release (e.g. a 2.x capture
+    exported with v1 metrics), the header is sniffed against every parser.
+    """
+    declared = parser_for_version(presentmon_version)
+    if declared and declared.matches(header):
+        return declared
+    for parser in PARSERS.values():
+        if parser.matches(header):
+            return parser
+    raise PresentMonError("Unrecognized PresentMon capture: no known frame time column")
+
+
+def read_header(path: Path) -> List[str]:
+    with open(path, "r", newline="") as f:
+        header_line = f.readline()
+    if not header_line:
+        raise PresentMonError("Capture is empty")
+    return next(csv.reader([header_line]))
+
+
+def _parse_block(lines: List[str], usecols: List[int]) -> np.ndarray:
+    try:
+        return np.loadtxt(lines, delimiter=",", usecols=usecols, dtype=np.float64, ndmin=2)
+    except ValueError:
+        # PresentMon writes NA / empty cells for dropped frames; genfromtxt
+        # turns those into NaN at the cost of a slower parse for this block
+        return np.atleast_2d(
+            np.genfromtxt(lines, delimiter=",", usecols=usecols, dtype=np.float64, invalid_raise=False)
+        )
+
+
+def read_capture(
+    path: Path,
+    chunk_rows: int = CHUNK_ROWS,
+    parser: Optional[PresentMonParser] = None,
+    presentmon_version: Optional[str] = None,
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Yield the canonical columns of a capture in chunks of `chunk_rows` rows.
+
+    Only the numeric columns that are needed are converted, and each chunk is
+    parsed in a single vectorized call.
+    """
+    with open(path, "r", newline="") as f:
+        header_line = f.readline()
+        if not header_line:
+            raise PresentMonError("Capture is empty")
+        header = next(csv.reader([header_line]))
+        if parser is None:
+            parser = detect_parser(header, presentmon_version)
+        columns = parser.resolve(header)
+        names = list(columns)
+        usecols = [columns[name] for name in names]
+
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if not lines:
+                break
+            block = _parse_block(lines, usecols)
+            if block.size == 0:
+                continue
+            yield {name: block[:, i] for i, name in enumerate(names)}
+
+
+class MetricsAccumulator:
+    """Collects per-chunk data and reduces it to capture-wide metrics."""
+
+    def __init__(self):
+        self._frame_times: List[np.ndarray] = []
+        self.gpu_bound_frames = 0
+        self.cpu_bound_frames = 0
+        self.bound_frames = 0
+
+    def add(self, chunk: Dict[str, np.ndarray]) -> None:
+        frame_time = chunk["frame_time"]
+        valid = np.isfinite(frame_time) & (frame_time > 0)
+        frame_time = frame_time[valid]
+        # float32 keeps ten million frames at 40MB
+        self._frame_times.append(frame_time.astype(np.float32))
+
+        gpu_busy = chunk.get("gpu_busy")
+        cpu_busy = chunk.get("cpu_busy")
+        if gpu_busy is None:
+            return
+        gpu_busy = gpu_busy[valid]
+        if cpu_busy is not None:
+            cpu_busy = cpu_busy[valid]
+            known = np.isfinite(gpu_busy) & np.isfinite(cpu_busy)
+            gpu_bound = gpu_busy[known] >= cpu_busy[known]
+        else:
+            known = np.isfinite(gpu_busy)
+            gpu_bound = gpu_busy[known] >= GPU_BOUND_THRESHOLD * frame_time[known]
+        gpu_count = int(np.count_nonzero(gpu_bound))
+        self.gpu_bound_frames += gpu_count
+        self.cpu_bound_frames += int(gpu_bound.size) - gpu_count
+        self.bound_frames += int(gpu_bound.size)
+
+    def result(self) -> Dict[str, object]:
+        frame_times = np.concatenate(self._frame_times) if self._frame_times else np.empty(0, np.float32)
+        if frame_times.size == 0:
+            raise PresentMonError("Capture contains no frames")
+
+        frame_times = frame_times.astype(np.float64)
+        count = int(frame_times.size)
+        total_ms = float(frame_times.sum())
+        median = float(np.median(frame_times))
+        percentiles = np.percentile(frame_times, FRAME_TIME_PERCENTILES)
+
+        return {
+            "metrics_version": METRICS_VERSION,
+            "frame_count": count,
+            "duration_seconds": total_ms / 1000.0,
+            "average_fps": 1000.0 * count / total_ms,
+            "fps_1_percent_low": _low_fps(frame_times, 0.01),
+            "fps_0_1_percent_low": _low_fps(frame_times, 0.001),
+            "frame_time_ms": {
+                "mean": total_ms / count,
+                "min": float(frame_times.min()),
+                "max": float(frame_times.max()),
+                "std": float(frame_times.std()),
+                **{_percentile_key(p): float(v) for p, v in zip(FRAME_TIME_PERCENTILES, percentiles)},
+            },
+            "stutter_threshold_ms": STUTTER_FACTOR * median,
+            "stutter_count": int(np.count_nonzero(frame_times > STUTTER_FACTOR * median)),
+            "gpu_bound_ratio": self.gpu_bound_frames / self.bound_frames if self.bound_frames else None,
+            "cpu_bound_ratio": self.cpu_bound_frames / self.bound_frames if self.bound_frames else None,
+        }
+
+
+def _percentile_key(percentile: float) -> str:
+    return "p" + f"{percentile:g}".replace(".", "_")
+
+
+def _low_fps(frame_times: np.ndarray, fraction: float) -> float:
+    """FPS over the slowest `fraction` of frames."""
+    worst = max(1, int(frame_times.size * fraction))
+    slowest = np.partition(frame_times, frame_times.size - worst)[-worst:]
+    return 1000.0 / float(slowest.mean())
+
+
+def metrics_from_chunks(chunks: Iterable[Dict[str, np.ndarray]]) -> Dict[str, object]:
+    """Compute frame-time metrics from column chunks, parsed or cached."""
+    accumulator = MetricsAccumulator()
+    for chunk in chunks:
+        accumulator.add(chunk)
+    return accumulator.result()
+
+
+def compute_metrics(
+    path: Path, chunk_rows: int = CHUNK_ROWS, presentmon_version: Optional[str] = None
+) -> Dict[str, object]:
+    """Parse a PresentMon capture and compute its frame-time metrics."""
+    parser = detect_parser(read_header(path), presentmon_version)
+    metrics = metrics_from_chunks(read_capture(path, chunk_rows, parser))
+    metrics["presentmon_schema"] = parser.version
+    return metrics
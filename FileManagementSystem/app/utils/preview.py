@@ -0,0 +1,185 @@
+import mmap
+import os
+import struct
+import uuid
+from array import array
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from app.utils.files import LINE_INDEX_SUFFIX
+
+# Every LINE_INDEX_STRIDE-th line start is recorded, so reaching any line
+# costs one index lookup plus at most LINE_INDEX_STRIDE - 1 newline scans
+LINE_INDEX_STRIDE = 1024
+
+# Newlines are counted per block so whole blocks can be skipped in C
+SCAN_BLOCK_SIZE = 4096
+
+MAX_PREVIEW_LINES = 10000
+MAX_PREVIEW_BYTES = 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_INDEX_MAGIC = b"FMLIDX1\0"
+# magic, file size, file mtime_ns, stride, total lines
+_INDEX_HEADER = struct.Struct("<8sQQIQ")
+
+
+class LineIndex:
+    """
+    Sparse line-offset index for a text file.
+
+    offsets[k] is the byte offset where line k * stride starts. The index is
+    stored next to the file as <filename>.lineidx and rebuilt whenever the
+    file's size or mtime no longer match.
+    """
+
+    def __init__(self, offsets: array, total_lines: int, stride: int = LINE_INDEX_STRIDE):
+        self.offsets = offsets
+        self.total_lines = total_lines
+        self.stride = stride
+
+    @staticmethod
+    def sidecar_path(path: Path) -> Path:
+        return path.with_name(path.name + LINE_INDEX_SUFFIX)
+
+    @classmethod
+    def load_or_build(cls, path: Path, mm: Optional[mmap.mmap]) -> "LineIndex":
+        stat = os.stat(path)
+        index = cls._load(path, stat)
+        if index is None:
+            index = cls.build(mm)
+            index._save(path, stat)
+        return index
+
+    @classmethod
+    def build(cls, mm: Optional[mmap.mmap], stride: int = LINE_INDEX_STRIDE) -> "LineIndex":
+        offsets = array("Q", [0])
+        if mm is None:
+            return cls(offsets, 0, stride)
+
+        size = len(mm)
+        lines_seen = 0
+        next_boundary = stride
+        for block_start in range(0, size, SCAN_BLOCK_SIZE):
+            block_end = min(block_start + SCAN_BLOCK_SIZE, size)
+            count = mm[block_start:block_end].count(b"\n")
+            # Only scan newline by newline inside blocks that contain a boundary
+            while lines_seen + count >= next_boundary:
+                pos = block_start
+                for _ in range(next_boundary - lines_seen):
+                    pos = mm.find(b"\n", pos, block_end) + 1
+                count -= next_boundary - lines_seen
+                lines_seen = next_boundary
+                block_start = pos
+                if pos < size:
+                    offsets.append(pos)
+                next_boundary += stride
+            lines_seen += count
+
+        # A final line without a trailing newline still counts
+        total_lines = lines_seen + (1 if size and mm[size - 1:size] != b"\n" else 0)
+        return cls(offsets, total_lines, stride)
+
+    @classmethod
+    def _load(cls, path: Path, stat: os.stat_result) -> Optional["LineIndex"]:
+        try:
+            with open(cls.sidecar_path(path), "rb") as f:
+                header = f.read(_INDEX_HEADER.size)
+                magic, size, mtime_ns, stride, total_lines = _INDEX_HEADER.unpack(header)
+                if magic != _INDEX_MAGIC or size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+                    return None
+                offsets = array("Q")
+                offsets.frombytes(f.read())
+                return cls(offsets, total_lines, stride)
+        except (OSError, struct.error, ValueError):
+            return None
+
+    def _save(self, path: Path, stat: os.stat_result) -> None:
+        sidecar = self.sidecar_path(path)
+        temp_path = sidecar.with_name(f"{sidecar.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, self.stride, self.total_lines))
+                f.write(self.offsets.tobytes())
+            os.replace(temp_path, sidecar)
+        except OSError as e:
+            # The index is only a cache; previews still work without it
+            print(f"Failed to write line index {sidecar}: {e}")
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+
+
+class TextPreview:
+    """Reads pages of a text file through mmap without loading the whole file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.size = size
+        self._index: Optional[LineIndex] = None
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "TextPreview":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def index(self) -> LineIndex:
+        if self._index is None:
+            self._index = LineIndex.load_or_build(self.path, self._mm)
+        return self._index
+
+    def _line_start(self, line: int) -> int:
+        index = self.index
+        if line >= index.total_lines:
+            return self.size
+        pos = index.offsets[line // index.stride]
+        for _ in range(line % index.stride):
+            pos = self._mm.find(b"\n", pos) + 1
+        return pos
+
+    def line_range(self, offset: int, limit: int) -> Tuple[int, int, int]:
+        """Return (start_byte, end_byte, lines_read) for `limit` lines from line `offset`."""
+        start = self._line_start(offset)
+        end = start
+        lines = 0
+        while lines < limit and end < self.size:
+            newline = self._mm.find(b"\n", end, min(self.size, start + MAX_PREVIEW_BYTES))
+            if newline == -1:
+                if lines and start + MAX_PREVIEW_BYTES < self.size:
+                    # Stop at the last whole line that fits in the byte budget
+                    break
+                end = min(self.size, start + MAX_PREVIEW_BYTES)
+                lines += 1
+                break
+            end = newline + 1
+            lines += 1
+        return start, end, lines
+
+    def byte_range(self, offset: int, limit: int) -> Tuple[int, int]:
+        start = min(offset, self.size)
+        return start, min(self.size, start + limit)
+
+    def read(self, start: int, end: int) -> str:
+        if self._mm is None or start >= end:
+            return ""
+        return self._mm[start:end].decode("utf-8", errors="replace")
+
+    def iter_bytes(self, start: int, end: int) -> Iterator[bytes]:
+        """Yield the range in fixed-size slices, closing the file when done."""
+        try:
+            for pos in range(start, end, STREAM_CHUNK_SIZE):
+                yield self._mm[pos:min(end, pos + STREAM_CHUNK_SIZE)]
+        finally:
+            self.close()
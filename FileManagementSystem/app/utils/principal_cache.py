@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated tester, as far as authorization needs it.
+
+    Returned by get_current_tester in place of the Tester row; endpoints that
+    need more than these fields load the tester themselves.
+    """
+    id: int
+    tester_type_id: int
+    tester_group_id: Optional[int]
+    active: bool
+
+
+# (tester id, token issue time); a new login never reuses an old entry
+PrincipalKey = Tuple[int, Optional[int]]
+
+
+class PrincipalCache:
+    """
+    A bounded LRU of principals with a time-to-live.
+
+    Services that change a tester call invalidate(), which drops every entry
+    of that tester in this process. Other API processes keep their entry
+    until it expires, so the TTL bounds how long a deactivation or a type
+    change can go unnoticed.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[PrincipalKey, Tuple[float, Principal]]" = OrderedDict()
+        self._keys_by_tester: Dict[int, Set[PrincipalKey]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def get(self, key: PrincipalKey) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def put(self, key: PrincipalKey, principal: Principal) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, principal)
+            self._entries.move_to_end(key)
+            self._keys_by_tester[key[0]].add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tester_id: int) -> None:
+        """Forget every cached principal of a tester."""
+        with self._lock:
+            for key in list(self._keys_by_tester.get(tester_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tester.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: PrincipalKey) -> None:
+        self._entries.pop(key, None)
+        keys = self._keys_by_tester.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tester[key[0]]
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
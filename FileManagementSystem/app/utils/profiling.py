@@ -0,0 +1,41 @@
+import time
+from typing import Any, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """
+    Counts the statements (database round-trips) an engine executes.
+
+    Used as a context manager around the code being measured:
+
+        with QueryCounter(engine) as counter:
+            resolve(...)
+        print(counter.count, counter.elapsed_ms)
+    """
+
+    def __init__(self, engine: Engine, keep_statements: bool = False):
+        self.engine = engine
+        self.keep_statements = keep_statements
+        self.count = 0
+        self.statements: List[str] = []
+        self.parameters: List[Any] = []
+        self.elapsed_ms = 0.0
+        self._started: Optional[float] = None
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        if self.keep_statements:
+            self.statements.append(statement)
+            self.parameters.append(parameters)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.elapsed_ms = (time.perf_counter() - self._started) * 1000
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
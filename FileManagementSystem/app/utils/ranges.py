@@ -0,0 +1,249 @@
+import os
+import uuid
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+from urllib.parse import quote
+
+import aiofiles
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+
+# Requests asking for more ranges than this are served the whole file instead
+MAX_RANGES = 32
+
+
+class FileValidators:
+    """ETag and Last-Modified for a stored file."""
+
+    def __init__(self, path: Path, content_hash: Optional[str] = None, modified_at: Optional[datetime] = None):
+        stat = os.stat(path)
+        self.size = stat.st_size
+
+        # A stored digest gives a strong validator; legacy rows without one fall
+        # back to a weak tag that only changes when the file on disk does
+        if content_hash:
+            self.etag = f'"{content_hash}"'
+        else:
+            self.etag = f'W/"{self.size:x}-{stat.st_mtime_ns:x}"'
+
+        if modified_at is None:
+            modified_at = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+        elif modified_at.tzinfo is None:
+            modified_at = modified_at.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        self.last_modified = modified_at.astimezone(timezone.utc).replace(microsecond=0)
+
+    @property
+    def is_strong(self) -> bool:
+        return not self.etag.startswith("W/")
+
+    def headers(self, accept_ranges: bool = True) -> dict:
+        headers = {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+        }
+        if accept_ranges:
+            headers["Accept-Ranges"] = "bytes"
+        return headers
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _opaque_tag(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(request: Request, validators: FileValidators) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since (If-None-Match wins when both are sent)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison, as required for If-None-Match
+        tags = {_opaque_tag(tag.strip()) for tag in if_none_match.split(",")}
+        return _opaque_tag(validators.etag) in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        since = _parse_http_date(if_modified_since)
+        return since is not None and validators.last_modified <= since
+
+    return False
+
+
+def not_modified_response(validators: FileValidators) -> Response:
+    return Response(status_code=304, headers=validators.headers(accept_ranges=False))
+
+
+def _if_range_matches(request: Request, validators: FileValidators) -> bool:
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        # Strong comparison only
+        return validators.is_strong and if_range == validators.etag
+    since = _parse_http_date(if_range)
+    return since is not None and validators.last_modified == since
+
+
+def parse_range_header(value: str, size: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Parse a bytes Range header into sorted, merged, inclusive (start, end) pairs.
+
+    Returns None when the header should be ignored (wrong unit, bad syntax or
+    too many ranges) and an empty list when no range is satisfiable.
+    """
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+
+    ranges = []
+    parts = spec.split(",")
+    if len(parts) > MAX_RANGES:
+        return None
+
+    for part in parts:
+        start_text, dash, end_text = part.strip().partition("-")
+        if not dash:
+            return None
+        try:
+            if start_text == "":
+                # Suffix range: the last N bytes
+                length = int(end_text)
+                # An empty file has no last bytes to satisfy it
+                if length <= 0 or size == 0:
+                    continue
+                ranges.append((max(size - length, 0), size - 1))
+                continue
+            start = int(start_text)
+            end = int(end_text) if end_text else None
+        except ValueError:
+            return None
+        if start < 0 or (end is not None and end < start):
+            return None
+        if start >= size:
+            continue
+        ranges.append((start, size - 1 if end is None else min(end, size - 1)))
+
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+async def _read_range(path: Path, start: int, end: int) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = await f.read(min(settings.UPLOAD_CHUNK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+async def _read_multipart(
+    path: Path, ranges: List[Tuple[int, int]], size: int, media_type: str, boundary: str
+) -> AsyncIterator[bytes]:
+    for start, end in ranges:
+        yield (
+            f"--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode("latin-1")
+        async for data in _read_range(path, start, end):
+            yield data
+        yield b"\r\n"
+    yield f"--{boundary}--\r\n".encode("latin-1")
+
+
+def _multipart_length(ranges: List[Tuple[int, int]], size: int, media_type: str, boundary: str) -> int:
+    length = len(f"--{boundary}--\r\n")
+    for start, end in ranges:
+        length += len(
+            f"--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        )
+        length += end - start + 1 + 2
+    return length
+
+
+def _content_disposition(filename: str, disposition: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+
+def ranged_file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    filename: Optional[str] = None,
+    content_hash: Optional[str] = None,
+    modified_at: Optional[datetime] = None,
+    disposition: str = "attachment",
+) -> Response:
+    """
+    Serve a file with validators, conditional GET and byte-range support.
+
+    Handles If-None-Match / If-Modified-Since (304), If-Range, single ranges
+    (206 with Content-Range), multiple ranges (206 multipart/byteranges) and
+    unsatisfiable ranges (416). The body is streamed with non-blocking reads.
+    """
+    validators = FileValidators(path, content_hash, modified_at)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
+    headers = validators.headers()
+    if filename:
+        headers["Content-Disposition"] = _content_disposition(filename, disposition)
+    size = validators.size
+
+    range_header = request.headers.get("range")
+    ranges = None
+    if range_header and _if_range_matches(request, validators):
+        ranges = parse_range_header(range_header, size)
+
+    if ranges is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_read_range(path, 0, size - 1), media_type=media_type, headers=headers)
+
+    if not ranges:
+        headers["Content-Range"] = f"bytes */{size}"
+        return Response(status_code=416, headers=headers)
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            _read_range(path, start, end), status_code=206, media_type=media_type, headers=headers
+        )
+
+    boundary = uuid.uuid4().hex
+    headers["Content-Length"] = str(_multipart_length(ranges, size, media_type, boundary))
+    return StreamingResponse(
+        _read_multipart(path, ranges, size, media_type, boundary),
+        status_code=206,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+        headers=headers,
+    )
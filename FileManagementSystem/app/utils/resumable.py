@@ -0,0 +1,237 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiofiles
+from fastapi import HTTPException, Request
+
+from app.config import settings
+from app.utils.files import PARTIAL_DIRECTORY, FileStorage, file_storage, validate_file_extension
+from app.utils.uploads import ReceivedUpload
+
+UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+MANIFEST_NAME = "manifest.json"
+FINALIZE_LOCK_NAME = "finalize.lock"
+CHUNK_SUFFIX = ".chunk"
+
+
+class ResumableUploadStore:
+    """
+    Keeps partially uploaded files as numbered chunks under uploads/.partial.
+
+    Each upload gets a directory holding a manifest written once at init and
+    one file per received chunk. Chunks are written to a temporary name and
+    renamed into place, so PUTs are idempotent and can arrive in any order or
+    in parallel without any locking: which chunks exist *is* the state.
+    """
+
+    def __init__(self, storage: FileStorage = file_storage):
+        self.storage = storage
+
+    @property
+    def root(self) -> Path:
+        root = self.storage.base_path / PARTIAL_DIRECTORY
+        root.mkdir(parents=True, exist_ok=True)
+        return root
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        if not UPLOAD_ID_PATTERN.match(upload_id):
+            raise HTTPException(status_code=404, detail="Upload not found")
+        upload_dir = self.root / upload_id
+        if not (upload_dir / MANIFEST_NAME).exists():
+            raise HTTPException(status_code=404, detail="Upload not found")
+        return upload_dir
+
+    def create(
+        self,
+        filename: str,
+        total_size: int,
+        uploaded_by: int,
+        chunk_size: Optional[int] = None,
+        content_hash: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Register a new upload and return its manifest."""
+        validate_file_extension(filename)
+        if total_size > settings.MAX_RESUMABLE_UPLOAD_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size is {settings.MAX_RESUMABLE_UPLOAD_SIZE / (1024*1024)}MB"
+            )
+
+        chunk_size = chunk_size or settings.RESUMABLE_CHUNK_SIZE
+        if chunk_size > settings.MAX_RESUMABLE_CHUNK_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Chunk size may not exceed {settings.MAX_RESUMABLE_CHUNK_SIZE} bytes"
+            )
+
+        upload_id = uuid.uuid4().hex
+        manifest = {
+            "upload_id": upload_id,
+            "filename": filename,
+            "total_size": total_size,
+            "chunk_size": chunk_size,
+            "chunk_count": max(1, -(-total_size // chunk_size)),
+            "content_hash": content_hash.lower() if content_hash else None,
+            "uploaded_by": uploaded_by,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "metadata": metadata or {},
+        }
+
+        upload_dir = self.root / upload_id
+        upload_dir.mkdir()
+        with open(upload_dir / MANIFEST_NAME, "w") as f:
+            json.dump(manifest, f)
+        return manifest
+
+    def get_manifest(self, upload_id: str, uploaded_by: Optional[int] = None) -> Dict[str, Any]:
+        """Load an upload's manifest, optionally checking who owns it."""
+        with open(self._upload_dir(upload_id) / MANIFEST_NAME) as f:
+            manifest = json.load(f)
+        if uploaded_by is not None and manifest["uploaded_by"] != uploaded_by:
+            raise HTTPException(status_code=403, detail="Not authorized to access this upload")
+        return manifest
+
+    def expected_chunk_size(self, manifest: Dict[str, Any], index: int) -> int:
+        """Size in bytes that chunk `index` must have."""
+        if index < 0 or index >= manifest["chunk_count"]:
+            raise HTTPException(status_code=400, detail=f"Chunk index must be between 0 and {manifest['chunk_count'] - 1}")
+        start = index * manifest["chunk_size"]
+        return min(manifest["chunk_size"], manifest["total_size"] - start)
+
+    def received_chunks(self, upload_id: str) -> List[int]:
+        """Indexes of the chunks that have been fully received."""
+        upload_dir = self._upload_dir(upload_id)
+        return sorted(
+            int(path.name[:-len(CHUNK_SUFFIX)])
+            for path in upload_dir.iterdir()
+            if path.name.endswith(CHUNK_SUFFIX)
+        )
+
+    async def write_chunk(self, manifest: Dict[str, Any], index: int, request: Request) -> int:
+        """Stream one chunk of the request body into place and return its size."""
+        expected = self.expected_chunk_size(manifest, index)
+        upload_dir = self._upload_dir(manifest["upload_id"])
+        temp_path = upload_dir / f"{index}.{uuid.uuid4().hex}.tmp"
+
+        size = 0
+        try:
+            async with aiofiles.open(temp_path, "wb") as out:
+                async for data in request.stream():
+                    size += len(data)
+                    if size > expected:
+                        raise HTTPException(status_code=400, detail=f"Chunk {index} must be {expected} bytes")
+                    await out.write(data)
+            if size != expected:
+                raise HTTPException(status_code=400, detail=f"Chunk {index} must be {expected} bytes, got {size}")
+            # A retried or parallel PUT of the same chunk simply replaces it
+            os.replace(temp_path, upload_dir / f"{index}{CHUNK_SUFFIX}")
+        except BaseException:
+            try:
+                temp_path.unlink()
+            except FileNotFoundError:
+                pass
+            raise
+        return size
+
+    def status(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """Describe which chunks and byte ranges are still missing."""
+        received = set(self.received_chunks(manifest["upload_id"]))
+        missing = [i for i in range(manifest["chunk_count"]) if i not in received]
+
+        # Collapse runs of missing chunks into inclusive byte ranges
+        missing_ranges: List[Tuple[int, int]] = []
+        for index in missing:
+            start = index * manifest["chunk_size"]
+            end = start + self.expected_chunk_size(manifest, index) - 1
+            if missing_ranges and missing_ranges[-1][1] + 1 == start:
+                missing_ranges[-1] = (missing_ranges[-1][0], end)
+            else:
+                missing_ranges.append((start, end))
+
+        bytes_received = sum(self.expected_chunk_size(manifest, i) for i in received)
+        # The cleanup command removes uploads by the mtime of their directory,
+        # which every chunk write bumps, so the expiry moves with activity
+        last_activity = self._upload_dir(manifest["upload_id"]).stat().st_mtime
+        expires_at = datetime.fromtimestamp(last_activity, timezone.utc) + timedelta(hours=settings.RESUMABLE_UPLOAD_TTL_HOURS)
+
+        return {
+            "upload_id": manifest["upload_id"],
+            "filename": manifest["filename"],
+            "total_size": manifest["total_size"],
+            "chunk_size": manifest["chunk_size"],
+            "chunk_count": manifest["chunk_count"],
+            "received_chunks": sorted(received),
+            "missing_chunks": missing,
+            "missing_ranges": missing_ranges,
+            "bytes_received": bytes_received,
+            "complete": not missing,
+            "expires_at": expires_at,
+        }
+
+    async def assemble(self, manifest: Dict[str, Any]) -> ReceivedUpload:
+        """
+        Concatenate all chunks into a single incoming file.
+
+        Only one finalize may run per upload; a concurrent attempt gets a 409.
+        The caller must call release() or delete() once it is done.
+        """
+        upload_dir = self._upload_dir(manifest["upload_id"])
+        try:
+            fd = os.open(upload_dir / FINALIZE_LOCK_NAME, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.close(fd)
+        except FileExistsError:
+            raise HTTPException(status_code=409, detail="Upload is already being finalized")
+
+        try:
+            missing = self.status(manifest)["missing_chunks"]
+            if missing:
+                raise HTTPException(status_code=409, detail=f"Upload is missing {len(missing)} chunk(s)")
+
+            temp_path = self.storage.incoming_path / uuid.uuid4().hex
+            hasher = hashlib.sha256()
+            async with aiofiles.open(temp_path, "wb") as out:
+                for index in range(manifest["chunk_count"]):
+                    async with aiofiles.open(upload_dir / f"{index}{CHUNK_SUFFIX}", "rb") as chunk:
+                        while True:
+                            data = await chunk.read(settings.UPLOAD_CHUNK_SIZE)
+                            if not data:
+                                break
+                            hasher.update(data)
+                            await out.write(data)
+
+            upload = ReceivedUpload(
+                original_filename=manifest["filename"],
+                temp_path=temp_path,
+                size=manifest["total_size"],
+                content_hash=hasher.hexdigest(),
+                fields=manifest["metadata"],
+            )
+            if manifest["content_hash"] and manifest["content_hash"] != upload.content_hash:
+                upload.discard()
+                raise HTTPException(status_code=400, detail="Assembled file does not match the declared content hash")
+            return upload
+        except BaseException:
+            self.release(manifest["upload_id"])
+            raise
+
+    def release(self, upload_id: str) -> None:
+        """Allow another finalize attempt after a failed one."""
+        try:
+            (self.root / upload_id / FINALIZE_LOCK_NAME).unlink()
+        except FileNotFoundError:
+            pass
+
+    def delete(self, upload_id: str) -> None:
+        """Drop an upload and all of its chunks."""
+        shutil.rmtree(self._upload_dir(upload_id), ignore_errors=True)
+
+
+resumable_uploads = ResumableUploadStore()
@@ -0,0 +1,178 @@
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.columnar import ColumnarCapture
+
+# Each pyramid level merges this many buckets of the level below
+PYRAMID_FANOUT = 8
+
+# Levels stop once they would have fewer buckets than this
+PYRAMID_MIN_BUCKETS = 1024
+
+PYRAMID_DIRECTORY = "pyramid"
+ELAPSED_NAME = "elapsed.bin"
+
+MAX_SERIES_WIDTH = 10000
+
+
+class SeriesPyramid:
+    """
+    Multi-resolution min/max summary of one capture column.
+
+    Level 0 is the raw column. Level k holds the NaN-ignoring min and max of
+    consecutive buckets of PYRAMID_FANOUT ** k frames, so a window of any size
+    is served by reading at most a few buckets per output pixel. Levels are
+    stored inside the capture's columnar cache entry and share its lifetime.
+    """
+
+    def __init__(self, capture: ColumnarCapture, column: str):
+        if column not in capture or column == "time":
+            raise ValueError(f"Capture has no '{column}' column")
+        self.capture = capture
+        self.column = column
+        self.path = capture.path / PYRAMID_DIRECTORY / column
+        self.elapsed = self._load_elapsed()
+        self.levels = self._load_levels()
+
+    @staticmethod
+    def bucket_size(level: int) -> int:
+        return PYRAMID_FANOUT ** level
+
+    def _load_elapsed(self) -> np.ndarray:
+        """Seconds since the first frame, one entry per frame."""
+        path = self.capture.path / PYRAMID_DIRECTORY / ELAPSED_NAME
+        if not path.exists():
+            if "time" in self.capture:
+                time = self.capture.column("time")
+                elapsed = np.asarray(time, dtype=np.float64) - (time[0] if time.size else 0.0)
+            else:
+                # Without timestamps, frame N starts after frames 0..N-1 completed
+                frame_time = np.nan_to_num(np.asarray(self.capture.column("frame_time"), dtype=np.float64))
+                elapsed = np.concatenate(([0.0], np.cumsum(frame_time)[:-1])) / 1000.0 if frame_time.size else frame_time
+            _write_atomic(path, elapsed.astype(np.float64))
+        if self.capture.rows == 0:
+            return np.empty(0, dtype=np.float64)
+        return np.memmap(path, dtype=np.float64, mode="r", shape=(self.capture.rows,))
+
+    def _load_levels(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        if not self.path.exists():
+            self._build()
+        levels = []
+        level = 1
+        while True:
+            count = -(-self.capture.rows // self.bucket_size(level))
+            min_path = self.path / f"{level}.min.bin"
+            if count < PYRAMID_MIN_BUCKETS or not min_path.exists():
+                break
+            levels.append((
+                np.memmap(min_path, dtype=np.float32, mode="r", shape=(count,)),
+                np.memmap(self.path / f"{level}.max.bin", dtype=np.float32, mode="r", shape=(count,)),
+            ))
+            level += 1
+        return levels
+
+    def _build(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.parent / f"{self.column}.{uuid.uuid4().hex}.tmp"
+        temp_path.mkdir()
+        try:
+            lower = upper = np.asarray(self.capture.column(self.column), dtype=np.float32)
+            level = 1
+            while -(-lower.size // PYRAMID_FANOUT) >= PYRAMID_MIN_BUCKETS:
+                starts = np.arange(0, lower.size, PYRAMID_FANOUT)
+                lower = np.fmin.reduceat(lower, starts)
+                upper = np.fmax.reduceat(upper, starts)
+                lower.tofile(temp_path / f"{level}.min.bin")
+                upper.tofile(temp_path / f"{level}.max.bin")
+                level += 1
+            try:
+                os.rename(temp_path, self.path)
+            except OSError:
+                # Built concurrently by another request
+                if not self.path.exists():
+                    raise
+                shutil.rmtree(temp_path, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            raise
+
+    def query(self, width: int, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, object]:
+        """
+        Downsample the frames in [start, end] seconds to at most `width` buckets.
+
+        Each bucket reports the elapsed time of its first frame and the min and
+        max of the column over the bucket, so spikes survive any zoom level.
+        """
+        elapsed = self.elapsed
+        first = 0 if start is None else int(np.searchsorted(elapsed, start, side="left"))
+        last = elapsed.size if end is None else int(np.searchsorted(elapsed, end, side="right"))
+        frames = max(0, last - first)
+
+        result = {
+            "start": float(elapsed[first]) if frames else start,
+            "end": float(elapsed[last - 1]) if frames else end,
+            "frame_count": frames,
+            "level": 0,
+            "bucket_frames": 1,
+            "t": [],
+            "min": [],
+            "max": [],
+        }
+        if not frames:
+            return result
+
+        per_pixel = frames / width
+        level = 0
+        while level < len(self.levels) and self.bucket_size(level + 1) <= per_pixel:
+            level += 1
+
+        if level == 0:
+            values = np.asarray(self.capture.column(self.column)[first:last], dtype=np.float64)
+            lower = upper = values
+            times = np.asarray(elapsed[first:last])
+        else:
+            size = self.bucket_size(level)
+            lower_level, upper_level = self.levels[level - 1]
+            lo, hi = first // size, -(-last // size)
+            lower = lower_level[lo:hi]
+            upper = upper_level[lo:hi]
+            times = np.asarray(elapsed[lo * size:hi * size:size])
+
+        # Merge the chosen level's buckets down to the requested width
+        group = -(-lower.size // width)
+        if group > 1:
+            starts = np.arange(0, lower.size, group)
+            lower = np.fmin.reduceat(lower, starts)
+            upper = np.fmax.reduceat(upper, starts)
+            times = times[starts]
+
+        result.update({
+            "level": level,
+            "bucket_frames": self.bucket_size(level) * group,
+            "t": _to_list(times),
+            "min": _to_list(lower),
+            "max": _to_list(upper),
+        })
+        return result
+
+
+def _to_list(values: np.ndarray) -> List[Optional[float]]:
+    # JSON has no NaN; frames without a reading become null
+    values = np.asarray(values, dtype=np.float64)
+    return [None if np.isnan(v) else v for v in values.tolist()]
+
+
+def _write_atomic(path: Path, values: np.ndarray) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        values.tofile(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,51 @@
+import math
+from typing import Optional, Sequence, Tuple
+
+# Two-sided 95% critical values of Student's t for 1..30 degrees of freedom
+_T_975 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+_Z_975 = 1.959964
+
+
+def t_critical_95(df: float) -> float:
+    """Two-sided 95% critical value of Student's t (fractional df rounded down)."""
+    if df < 1:
+        return math.inf
+    if df <= len(_T_975):
+        return _T_975[int(df) - 1]
+    # Cornish-Fisher expansion; within 0.001 of the exact value past 30 df
+    z = _Z_975
+    return z + (z ** 3 + z) / (4 * df) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+
+
+def summarize(values: Sequence[float]) -> Tuple[float, float, int]:
+    """Return (mean, sample variance, n) of a sequence."""
+    n = len(values)
+    mean = sum(values) / n
+    variance = sum((v - mean) ** 2 for v in values) / (n - 1) if n > 1 else 0.0
+    return mean, variance, n
+
+
+def welch_interval(
+    mean_a: float, var_a: float, n_a: int, mean_b: float, var_b: float, n_b: int
+) -> Optional[Tuple[float, float]]:
+    """
+    95% confidence interval for mean_b - mean_a without assuming equal variances.
+
+    Returns None when either side has fewer than two samples.
+    """
+    if n_a < 2 or n_b < 2:
+        return None
+    se_a = var_a / n_a
+    se_b = var_b / n_b
+    se = math.sqrt(se_a + se_b)
+    delta = mean_b - mean_a
+    if se == 0:
+        return delta, delta
+    # Welch-Satterthwaite degrees of freedom
+    df = (se_a + se_b) ** 2 / (se_a ** 2 / (n_a - 1) + se_b ** 2 / (n_b - 1))
+    margin = t_critical_95(df) * se
+    return delta - margin, delta + margin
@@ -0,0 +1,222 @@
+import hashlib
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import aiofiles
+from fastapi import HTTPException, Request
+from multipart.multipart import MultipartParser, parse_options_header
+
+from app.config import settings
+from app.utils.files import FileStorage, file_storage, validate_file_extension
+
+# Plain form fields are small; anything larger is almost certainly a misuse
+MAX_FIELD_SIZE = 64 * 1024
+
+
+@dataclass
+class ReceivedUpload:
+    """A multipart upload whose file part has been streamed to a temporary file."""
+    original_filename: str
+    temp_path: Path
+    size: int
+    content_hash: str
+    fields: Dict[str, str] = field(default_factory=dict)
+
+    def discard(self) -> None:
+        """Remove the temporary file if it has not been moved into place."""
+        try:
+            self.temp_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class _PartCollector:
+    """Turns python-multipart callbacks into a list of events for the async writer."""
+
+    def __init__(self):
+        self.events: List[Tuple[str, object]] = []
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        self.events.append(("begin", self._headers))
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self.events.append(("data", data[start:end]))
+
+    def on_part_end(self) -> None:
+        self.events.append(("end", None))
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+
+class UploadReceiver:
+    """
+    Streams a multipart/form-data request body straight to disk.
+
+    The body is consumed chunk by chunk from the ASGI receive channel, so the
+    file is never spooled in memory or to a second temporary file. File data
+    is buffered into fixed-size writes and MAX_UPLOAD_SIZE is enforced while
+    the bytes arrive, before anything beyond the limit touches the disk. The
+    SHA-256 digest is computed on the same pass.
+    """
+
+    def __init__(
+        self,
+        storage: FileStorage = file_storage,
+        file_field: str = "file",
+        max_size: int = settings.MAX_UPLOAD_SIZE,
+        chunk_size: int = settings.UPLOAD_CHUNK_SIZE,
+    ):
+        self.storage = storage
+        self.file_field = file_field
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+
+        self.fields: Dict[str, str] = {}
+        self.original_filename: Optional[str] = None
+        self.temp_path: Optional[Path] = None
+        self.size = 0
+        self._hasher = hashlib.sha256()
+
+        self._current_name: Optional[str] = None
+        self._current_is_file = False
+        self._field_buffer = bytearray()
+        self._write_buffer = bytearray()
+        self._out = None
+
+    async def receive(self, request: Request) -> ReceivedUpload:
+        """Consume the request body and return the received upload."""
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        boundary = params.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise HTTPException(status_code=400, detail="Expected a multipart/form-data request")
+
+        collector = _PartCollector()
+        parser = MultipartParser(boundary, collector.callbacks())
+
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                await self._handle_events(collector)
+            parser.finalize()
+            await self._handle_events(collector)
+        except BaseException:
+            await self._close(discard=True)
+            raise
+
+        if self.temp_path is None:
+            raise HTTPException(status_code=400, detail=f"Missing file field '{self.file_field}'")
+
+        return ReceivedUpload(
+            original_filename=self.original_filename,
+            temp_path=self.temp_path,
+            size=self.size,
+            content_hash=self._hasher.hexdigest(),
+            fields=self.fields,
+        )
+
+    async def _handle_events(self, collector: _PartCollector) -> None:
+        events, collector.events = collector.events, []
+        for kind, payload in events:
+            if kind == "begin":
+                await self._begin_part(payload)
+            elif kind == "data":
+                await self._part_data(payload)
+            else:
+                await self._end_part()
+
+    async def _begin_part(self, headers: Dict[bytes, bytes]) -> None:
+        disposition, options = parse_options_header(headers.get(b"content-disposition", b""))
+        if disposition != b"form-data" or b"name" not in options:
+            raise HTTPException(status_code=400, detail="Malformed multipart part")
+
+        self._current_name = options[b"name"].decode("latin-1")
+        self._current_is_file = b"filename" in options
+        self._field_buffer.clear()
+
+        if not self._current_is_file:
+            return
+        if self._current_name != self.file_field or self.temp_path is not None:
+            raise HTTPException(status_code=400, detail=f"Unexpected file field '{self._current_name}'")
+
+        self.original_filename = options[b"filename"].decode("utf-8", errors="replace")
+        validate_file_extension(self.original_filename)
+
+        self.temp_path = self.storage.incoming_path / uuid.uuid4().hex
+        self._out = await aiofiles.open(self.temp_path, "wb")
+
+    async def _part_data(self, data: bytes) -> None:
+        if not self._current_is_file:
+            self._field_buffer.extend(data)
+            if len(self._field_buffer) > MAX_FIELD_SIZE:
+                raise HTTPException(status_code=400, detail=f"Form field '{self._current_name}' is too large")
+            return
+
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size is {self.max_size / (1024*1024)}MB"
+            )
+
+        self._hasher.update(data)
+        self._write_buffer.extend(data)
+        if len(self._write_buffer) >= self.chunk_size:
+            await self._flush()
+
+    async def _end_part(self) -> None:
+        if self._current_is_file:
+            await self._close()
+        else:
+            self.fields[self._current_name] = self._field_buffer.decode("utf-8")
+        self._current_name = None
+        self._current_is_file = False
+
+    async def _flush(self) -> None:
+        if self._write_buffer:
+            await self._out.write(bytes(self._write_buffer))
+            self._write_buffer.clear()
+
+    async def _close(self, discard: bool = False) -> None:
+        if self._out is not None:
+            if not discard:
+                await self._flush()
+            await self._out.close()
+            self._out = None
+        if discard and self.temp_path is not None:
+            try:
+                self.temp_path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+async def receive_upload(request: Request, file_field: str = "file") -> ReceivedUpload:
+    """Stream the file part of a multipart request to disk and collect the other form fields."""
+    return await UploadReceiver(file_field=file_field).receive(request)
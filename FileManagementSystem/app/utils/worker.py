@@ -0,0 +1,129 @@
+import os
+import signal
+import socket
+import time
+import traceback
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from typing import Dict
+
+from app.config import settings
+from app.database.session import SessionLocal, engine
+from app.services.job import claim_jobs, complete_job, fail_job, requeue_stale_jobs
+from app.services.processing import execute_job
+
+# How often (in poll intervals) the worker looks for jobs abandoned by crashed workers
+STALE_CHECK_EVERY = 60
+
+
+def _init_process() -> None:
+    # Connections inherited from the parent must not be shared with it
+    engine.dispose(close=False)
+    # Shutdown is coordinated by the parent; let in-flight jobs finish
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class JobWorker:
+    """
+    Pulls jobs from the job table and runs them in a process pool.
+
+    The parent process owns all queue bookkeeping: it claims at most as many
+    jobs as it has idle processes, then records each result or failure as the
+    futures complete. Handlers run in child processes, so CPU-bound parsing
+    never blocks the polling loop and one crashing job cannot take the
+    worker down.
+    """
+
+    def __init__(self, concurrency: int = settings.JOB_WORKER_CONCURRENCY,
+                 poll_interval: float = settings.JOB_POLL_INTERVAL_SECONDS):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stopping = False
+
+    def stop(self, *args) -> None:
+        self._stopping = True
+
+    def run(self, once: bool = False) -> int:
+        """Process jobs until stopped (or, with once=True, until the queue is drained). Returns jobs handled."""
+        handled = 0
+        polls = 0
+        in_flight: Dict[Future, int] = {}
+        pool = self._new_pool()
+
+        try:
+            while True:
+                if polls % STALE_CHECK_EVERY == 0:
+                    self._requeue_stale()
+                polls += 1
+
+                claimed = 0
+                idle = self.concurrency - len(in_flight)
+                if idle > 0 and not self._stopping:
+                    for job_id, kind, payload in self._claim(idle):
+                        in_flight[pool.submit(execute_job, kind, payload)] = job_id
+                        claimed += 1
+
+                if not in_flight:
+                    if self._stopping or (once and not claimed):
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+
+                done, _ = wait(in_flight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    broken = broken or isinstance(future.exception(), BrokenProcessPool)
+                    self._record(in_flight.pop(future), future)
+                    handled += 1
+
+                if broken:
+                    # A child died hard (e.g. killed for memory); every job in
+                    # the pool failed with it, so record them and start over
+                    for future, job_id in in_flight.items():
+                        self._record(job_id, future)
+                        handled += 1
+                    in_flight.clear()
+                    pool.shutdown(wait=False)
+                    pool = self._new_pool()
+        finally:
+            pool.shutdown(wait=True)
+
+        return handled
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.concurrency, initializer=_init_process)
+
+    def _claim(self, limit: int):
+        db = SessionLocal()
+        try:
+            # Detach plain values before the session closes
+            return [(job.id, job.kind, job.payload or {}) for job in claim_jobs(db, self.worker_id, limit)]
+        finally:
+            db.close()
+
+    def _record(self, job_id: int, future: Future) -> None:
+        db = SessionLocal()
+        try:
+            error = future.exception()
+            if error is None:
+                complete_job(db, job_id, future.result())
+            else:
+                message = "".join(traceback.format_exception_only(type(error), error)).strip()
+                job = fail_job(db, job_id, message)
+                if job:
+                    print(f"Job {job_id} failed (attempt {job.attempts}/{job.max_attempts}): {message}")
+        finally:
+            db.close()
+
+    def _requeue_stale(self) -> None:
+        db = SessionLocal()
+        try:
+            count = requeue_stale_jobs(db, timedelta(minutes=settings.JOB_LOCK_TIMEOUT_MINUTES))
+            if count:
+                print(f"Requeued {count} stale jobs")
+        finally:
+            db.close()
+
@@ -1,4 +1,6 @@
 import click
+import math
+from datetime import timedelta
 from sqlalchemy.orm import Session
 from app.database.session import SessionLocal
 from app.services.tester import create_tester, get_testers, get_tester_by_email
@@ -86,7 +88,8 @@ def cleanup_files():
         attachments = db.query(Attachment.filename, Attachment.relative_path).all()
         
         # Clean up orphaned files
-        orphaned = file_manager.cleanup_orphaned_files(attachments)
+        grace = timedelta(minutes=settings.CLEANUP_GRACE_MINUTES)
+        orphaned = file_manager.cleanup_orphaned_files(attachments, grace)
         if orphaned:
             click.echo(f"Removed {len(orphaned)} orphaned files:")
             for file in orphaned:
@@ -94,6 +97,15 @@ def cleanup_files():
         else:
             click.echo("No orphaned files found.")
         
+        # Clean up cached columns of files no attachment references
+        content_hashes = [
+            content_hash for (content_hash,) in
+            db.query(Attachment.content_hash).filter(Attachment.content_hash.isnot(None)).distinct()
+        ]
+        stale_cache = file_manager.cleanup_columnar_cache(content_hashes, grace)
+        if stale_cache:
+            click.echo(f"Removed {len(stale_cache)} columnar cache entries.")
+        
         # Clean up empty directories
         empty_dirs = file_manager.cleanup_empty_directories()
         if empty_dirs:
@@ -102,12 +114,31 @@ def cleanup_files():
                 click.echo(f"  - {dir_path}")
         else:
             click.echo("No empty directories found.")
+        
+        # Clean up abandoned resumable uploads
+        stale = file_manager.cleanup_stale_uploads(timedelta(hours=settings.RESUMABLE_UPLOAD_TTL_HOURS))
+        if stale:
+            click.echo(f"Removed {len(stale)} stale uploads.")
             
     except Exception as e:
         click.echo(f"Error cleaning up files: {e}")
     finally:
         db.close()
 
+@cli.command()
+@click.option("--max-age-hours", default=settings.RESUMABLE_UPLOAD_TTL_HOURS, help="Remove uploads idle for longer than this")
+def cleanup_uploads(max_age_hours):
+    """Remove stale partial resumable uploads."""
+    from app.utils.file_management import file_manager
+    
+    removed = file_manager.cleanup_stale_uploads(timedelta(hours=max_age_hours))
+    if removed:
+        click.echo(f"Removed {len(removed)} stale uploads:")
+        for upload_dir in removed:
+            click.echo(f"  - {upload_dir}")
+    else:
+        click.echo("No stale uploads found.")
+
 @cli.command()
 def storage_stats():
     """Show file storage statistics."""
@@ -119,6 +150,294 @@ def storage_stats():
     click.echo(f"  Total Files: {stats['file_count']}")
     click.echo(f"  Total Size: {stats['total_size_mb']:.2f} MB ({stats['total_size_bytes']} bytes)")
     click.echo(f"  Directories: {stats['directory_count']}")
+    click.echo(f"  Columnar Cache: {stats['columnar_cache_entries']} entries, {stats['columnar_cache_mb']:.2f} MB")
+
+# ------------------------
+# Benchmarks
+# ------------------------
+@cli.command()
+@click.option("--test-suite-id", "test_suite_ids", multiple=True, type=int, help="Suite to measure (default: all suites)")
+@click.option("--repeat", default=5, help="Runs per suite; the median latency is reported")
+def benchmark_suite_resolution(test_suite_ids, repeat):
+    """Measure round-trips and latency of test case version resolution by suite size."""
+    import statistics
+    from sqlalchemy import func
+    from app.database.models import Suitcase, TestSuite
+    from app.database.session import engine
+    from app.services.execution import _resolve_test_case_versions
+    from app.utils.profiling import QueryCounter
+    
+    db = SessionLocal()
+    try:
+        sizes = dict(
+            db.query(TestSuite.id, func.count(Suitcase.id))
+            .outerjoin(Suitcase, Suitcase.test_suite_id == TestSuite.id)
+            .group_by(TestSuite.id)
+            .all()
+        )
+        suite_ids = test_suite_ids or sorted(sizes, key=lambda suite_id: sizes[suite_id])
+        
+        click.echo(f"{'suite':>8} {'suitcases':>10} {'resolved':>9} {'round-trips':>12} {'median ms':>10}")
+        for suite_id in suite_ids:
+            if suite_id not in sizes or not sizes[suite_id]:
+                continue
+            timings = []
+            for _ in range(repeat):
+                with QueryCounter(engine) as counter:
+                    resolved = _resolve_test_case_versions(db, suite_id)
+                timings.append(counter.elapsed_ms)
+                # Measure the database, not the identity map
+                db.expire_all()
+            click.echo(
+                f"{suite_id:>8} {sizes[suite_id]:>10} {len(resolved):>9} "
+                f"{counter.count:>12} {statistics.median(timings):>10.2f}"
+            )
+    finally:
+        db.close()
+
+@cli.command()
+@click.option("--logins", default=200, help="Logins in the burst")
+@click.option("--concurrency", default=200, help="Logins in flight at once")
+def benchmark_login(logins, concurrency):
+    """Compare login throughput with bcrypt in the request threads and in the hashing pool."""
+    import asyncio
+    import time
+    from starlette.concurrency import run_in_threadpool
+    from app.utils.auth import PasswordHasherBusy, hash_password, password_hasher, verify_password
+    
+    stored = hash_password("benchmark-password")
+    
+    async def burst(verify):
+        gate = asyncio.Semaphore(concurrency)
+        lags = []
+        done = asyncio.Event()
+        
+        async def ticker():
+            # How late a 10 ms timer fires: what every other request waits for
+            while not done.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                lags.append((time.perf_counter() - start - 0.01) * 1000)
+        
+        async def login():
+            async with gate:
+                try:
+                    await verify()
+                    return True
+                except PasswordHasherBusy:
+                    return False
+        
+        tick = asyncio.ensure_future(ticker())
+        start = time.perf_counter()
+        results = await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await tick
+        return sum(results), len(results) - sum(results), elapsed, max(lags, default=0.0)
+    
+    modes = {
+        "request threads": lambda: run_in_threadpool(verify_password, "benchmark-password", stored),
+        "hashing pool": lambda: password_hasher.verify_and_update_async("benchmark-password", stored),
+    }
+    # Start the pool processes before timing
+    asyncio.run(password_hasher.hash_async("warm-up"))
+    
+    click.echo(f"{'mode':<16} {'ok':>6} {'429':>6} {'seconds':>8} {'logins/s':>9} {'max loop lag ms':>16}")
+    for name, verify in modes.items():
+        ok, rejected, elapsed, lag = asyncio.run(burst(verify))
+        click.echo(f"{name:<16} {ok:>6} {rejected:>6} {elapsed:>8.2f} {ok / elapsed:>9.1f} {lag:>16.1f}")
+    password_hasher.shutdown()
+
+@cli.command()
+@click.option("--clients", default=500, help="Concurrent clients")
+@click.option("--requests", "requests_per_client", default=20, help="Requests per client")
+@click.option("--run-id", type=int, default=None, help="List this run's executions instead of all executions")
+def benchmark_async(clients, requests_per_client, run_id):
+    """Compare execution listing throughput and tail latency on the sync and async database paths."""
+    import asyncio
+    import statistics
+    import time
+    from starlette.concurrency import run_in_threadpool
+    from app.database.session import AsyncSessionLocal, async_engine
+    from app.services.execution import (
+        get_executions, get_executions_async, get_executions_by_run, get_executions_by_run_async
+    )
+    
+    def sync_list():
+        # What a def endpoint does: a worker thread holds a Session for the whole request
+        db = SessionLocal()
+        try:
+            return get_executions_by_run(db, run_id) if run_id else get_executions(db)
+        finally:
+            db.close()
+    
+    async def async_list():
+        async with AsyncSessionLocal() as db:
+            return await (get_executions_by_run_async(db, run_id) if run_id else get_executions_async(db))
+    
+    async def load(call):
+        latencies = []
+        
+        async def client():
+            for _ in range(requests_per_client):
+                start = time.perf_counter()
+                await call()
+                latencies.append((time.perf_counter() - start) * 1000)
+        
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        return latencies, time.perf_counter() - start
+    
+    modes = {
+        "sync (threadpool)": lambda: run_in_threadpool(sync_list),
+        "async (asyncpg)": async_list,
+    }
+    
+    async def compare():
+        # Both modes share one event loop: async connections belong to the loop that opened them
+        click.echo(f"{clients} clients x {requests_per_client} requests")
+        click.echo(f"{'mode':<18} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        try:
+            for name, call in modes.items():
+                latencies, elapsed = await load(call)
+                quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+                click.echo(
+                    f"{name:<18} {len(latencies) / elapsed:>8.1f} {quantiles[49]:>8.1f} "
+                    f"{quantiles[94]:>8.1f} {quantiles[98]:>8.1f} {max(latencies):>8.1f}"
+                )
+        finally:
+            await async_engine.dispose()
+    
+    asyncio.run(compare())
+
+@cli.command()
+@click.option("--table", "tables", multiple=True, default=["execution"], help="Only report plans on these tables")
+@click.option("--verbose", is_flag=True, help="Print the SQL of every query shape")
+def index_advisor(tables, verbose):
+    """Report execution query shapes that no index covers (EXPLAIN on Postgres)."""
+    from app.database.session import engine
+    from app.services.index_advisor import execution_query_shapes
+    from app.utils.index_advisor import advise
+    
+    if engine.dialect.name != "postgresql":
+        raise click.ClickException("The index advisor needs EXPLAIN output from Postgres")
+    
+    db = SessionLocal()
+    try:
+        reports = advise(engine, execution_query_shapes(db), tables)
+    finally:
+        db.close()
+    
+    missing = 0
+    for report in reports:
+        if report.error:
+            click.echo(f"{report.name:<28} ERROR {report.error}")
+        elif report.issues:
+            missing += 1
+            click.echo(f"{report.name:<28} MISSING {'; '.join(str(issue) for issue in report.issues)}")
+        else:
+            click.echo(f"{report.name:<28} ok")
+        if verbose:
+            for statement in report.statements:
+                click.echo(f"    {' '.join(statement.split())}")
+    click.echo(f"{missing} of {len(reports)} query shapes miss an index")
+
+@cli.command()
+def check_replicas():
+    """Probe the read replicas (DB_REPLICA_HOSTS) and report their lag and rotation state."""
+    from app.database.session import replica_set
+    
+    if not len(replica_set):
+        raise click.ClickException("No read replicas configured (DB_REPLICA_HOSTS)")
+    
+    replica_set.check()
+    healthy = set(replica_set.healthy())
+    for index, engine in enumerate(replica_set.engines):
+        lag = replica_set.lag_seconds[index]
+        click.echo(
+            f"{f'{engine.url.host}:{engine.url.port}':<32} "
+            f"{'unreachable' if lag is None else 'not streaming' if math.isinf(lag) else f'{lag:.1f}s behind':<14} "
+            f"{'in rotation' if index in healthy else 'out of rotation'}"
+        )
+    if not healthy:
+        raise click.ClickException("No replica is in rotation; reads go to the primary")
+
+@cli.command()
+@click.option("--run-id", type=int, default=None, help="Only this run (default: all runs)")
+def rebuild_run_stats(run_id):
+    """Recompute the run_status_count rollup from the executions."""
+    from app.services.run_status_count import rebuild_run_status_counts
+    
+    db = SessionLocal()
+    try:
+        rows = rebuild_run_status_counts(db, run_id)
+        click.echo(f"Rebuilt {rows} run/status rows")
+    finally:
+        db.close()
+
+@cli.command()
+@click.option("--run-id", type=int, default=None, help="Only this run (default: all runs)")
+@click.option("--fix", is_flag=True, help="Rebuild the rollup when it disagrees with the executions")
+def check_run_stats(run_id, fix):
+    """Compare the run_status_count rollup with a full count of the executions."""
+    from app.services.run_status_count import check_run_status_counts, rebuild_run_status_counts
+    
+    db = SessionLocal()
+    try:
+        mismatches = check_run_status_counts(db, run_id)
+        for mismatch in mismatches:
+            click.echo(
+                f"run {mismatch['run_id']} status {mismatch['status_id']}: "
+                f"expected {mismatch['expected']}, stored {mismatch['actual']}"
+            )
+        click.echo(f"{len(mismatches)} mismatched run/status rows")
+        if mismatches and fix:
+            rebuild_run_status_counts(db, run_id)
+            click.echo("Rollup rebuilt")
+        elif mismatches:
+            raise click.ClickException("The rollup is out of date; rerun with --fix")
+    finally:
+        db.close()
+
+# ------------------------
+# Background jobs
+# ------------------------
+@cli.command()
+@click.option("--concurrency", default=settings.JOB_WORKER_CONCURRENCY, help="Number of worker processes")
+@click.option("--poll-interval", default=settings.JOB_POLL_INTERVAL_SECONDS, help="Seconds between queue polls when idle")
+@click.option("--once", is_flag=True, help="Exit once the queue is empty")
+def worker(concurrency, poll_interval, once):
+    """Run a background job worker."""
+    import signal
+    from app.utils.worker import JobWorker
+    
+    job_worker = JobWorker(concurrency=concurrency, poll_interval=poll_interval)
+    # Finish the jobs in progress, then exit
+    signal.signal(signal.SIGTERM, job_worker.stop)
+    signal.signal(signal.SIGINT, job_worker.stop)
+    
+    click.echo(f"Worker {job_worker.worker_id} started with {concurrency} processes")
+    handled = job_worker.run(once=once)
+    click.echo(f"Worker stopped after {handled} jobs")
+
+@cli.command()
+@click.option("--priority", default=0, help="Job priority (uploads use 10)")
+def reprocess_attachments(priority):
+    """Queue background processing for every attachment with derived data."""
+    from app.database.models import Attachment
+    from app.services.processing import enqueue_attachment_processing
+    
+    db = SessionLocal()
+    try:
+        queued = 0
+        for attachment in db.query(Attachment).order_by(Attachment.id).all():
+            if enqueue_attachment_processing(db, attachment, priority=priority):
+                queued += 1
+        click.echo(f"Queued {queued} jobs.")
+    except Exception as e:
+        click.echo(f"Error queueing jobs: {e}")
+    finally:
+        db.close()
 
 @cli.command()
 @click.option("--backup-dir", default="backups", help="Directory to store backups")
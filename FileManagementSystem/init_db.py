@@ -3,17 +3,54 @@ import os
 from pathlib import Path
 import time
 from functools import wraps
+from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
 from app.database.session import engine, SessionLocal
 from app.database.base import Base
 from app.database.models import (
     TesterType, Status, StatusSet, TestCase, Scenario,
     Tester, TestCaseVersion, TesterGroup, Client, Project,
-    Device, Resolution, TestSuite
+    Device, Resolution, TestSuite, Execution, RunStatusCount
 )
+from app.services.run_status_count import rebuild_run_status_counts
 from app.utils.auth import hash_password
 from app.config import settings
 
+# create_all() only creates missing tables, so columns and indexes added to
+# existing tables after the first release are applied here
+SCHEMA_UPGRADES = [
+    "ALTER TABLE attachment ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)",
+    "ALTER TABLE attachment ADD COLUMN IF NOT EXISTS file_size BIGINT",
+    "CREATE INDEX IF NOT EXISTS attachment_content_hash_idx ON attachment (content_hash, file_size)",
+    "ALTER TABLE attachment ADD COLUMN IF NOT EXISTS metrics JSON",
+    # Composite indexes matching the keyset pagination sort keys
+    "CREATE INDEX IF NOT EXISTS execution_executed_at_order_idx ON execution (executed_at DESC, execution_order, id)",
+    "CREATE INDEX IF NOT EXISTS run_started_at_id_idx ON run (started_at, id)",
+    "CREATE INDEX IF NOT EXISTS attachment_uploaded_at_id_idx ON attachment (uploaded_at, id)",
+    "CREATE INDEX IF NOT EXISTS test_case_version_version_id_idx ON test_case_version (version, id)",
+    "CREATE INDEX IF NOT EXISTS tester_group_name_id_idx ON tester_group (name, id)",
+    "CREATE INDEX IF NOT EXISTS attachment_uploader_uploaded_at_idx ON attachment (uploaded_by, uploaded_at, id)",
+    # Execution filters and orders (see `cli.py index-advisor`)
+    "CREATE INDEX IF NOT EXISTS execution_device_executed_at_idx ON execution (device_id, executed_at DESC, execution_order, id)",
+    "CREATE INDEX IF NOT EXISTS execution_tester_executed_at_idx ON execution (executed_by, executed_at DESC, execution_order, id)",
+    "CREATE INDEX IF NOT EXISTS execution_status_executed_at_idx ON execution (status_id, executed_at DESC, execution_order, id)",
+    "CREATE INDEX IF NOT EXISTS execution_version_executed_at_idx ON execution (test_case_version_id, executed_at DESC, execution_order, id)",
+    "CREATE INDEX IF NOT EXISTS execution_run_order_idx ON execution (run_id, execution_order, executed_at DESC, id)",
+    "CREATE INDEX IF NOT EXISTS execution_attachment_idx ON execution (attachment_id) WHERE attachment_id IS NOT NULL",
+]
+
+# run_status_count.executed_at_sum held whole epoch seconds before it
+# became NUMERIC; the sums are rebuilt when the column is converted
+ROLLUP_SUM_TYPE = text("""
+    SELECT data_type FROM information_schema.columns
+    WHERE table_name = 'run_status_count' AND column_name = 'executed_at_sum'
+""")
+
+def upgrade_schema():
+    with engine.begin() as conn:
+        for statement in SCHEMA_UPGRADES:
+            conn.execute(text(statement))
+
 def retry_on_operational_error(max_retries=30, delay=2):
     def decorator(func):
         @wraps(func)
@@ -35,6 +72,7 @@ def create_tables_and_data():
     print(f"[INIT] Using DB at: {settings.DATABASE_URL}")
 
     Base.metadata.create_all(bind=engine)
+    upgrade_schema()
 
     db = SessionLocal()
     try:
@@ -281,6 +319,16 @@ def create_tables_and_data():
                 db.add(version)
 
         db.commit()
+
+        # run_status_count is new on existing deployments: fill it once from the executions
+        if db.execute(ROLLUP_SUM_TYPE).scalar() == "bigint":
+            db.execute(text("ALTER TABLE run_status_count ALTER COLUMN executed_at_sum TYPE NUMERIC"))
+            rows = rebuild_run_status_counts(db)
+            print(f"[INIT] Rebuilt run statistics rollup with exact execution times ({rows} rows)")
+        elif db.query(RunStatusCount).first() is None and db.query(Execution).first() is not None:
+            rows = rebuild_run_status_counts(db)
+            print(f"[INIT] Built run statistics rollup ({rows} rows)")
+
         print("[INIT] Database initialized successfully with default data")
         return {"status": "success"}
     except Exception as e:
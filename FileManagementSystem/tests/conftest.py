@@ -0,0 +1,6 @@
+import os
+
+# Settings without defaults; nothing here connects to the database
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
@@ -0,0 +1,39 @@
+from app.utils.index_advisor import plan_issues
+
+LEADING_COLUMNS = {
+    "execution_executed_at_order_idx": "executed_at",
+    "execution_run_order_idx": "run_id",
+}
+
+
+def _index_scan(index, condition=None, filter=None):
+    node = {"Node Type": "Index Scan", "Relation Name": "execution", "Index Name": index}
+    if condition:
+        node["Index Cond"] = condition
+    if filter:
+        node["Filter"] = filter
+    return node
+
+
+def _issues(*nodes):
+    plan = {"Node Type": "Limit", "Plans": list(nodes)}
+    return [str(issue) for issue in plan_issues(plan, ["execution"], LEADING_COLUMNS)]
+
+
+def test_filtered_index_scan_without_condition_is_reported():
+    assert _issues(_index_scan("execution_executed_at_order_idx", filter="(executed_at < now())")) == [
+        "Index Scan on execution using execution_executed_at_order_idx (filter: (executed_at < now()))"
+    ]
+
+
+def test_condition_on_a_later_column_is_reported():
+    assert _issues(_index_scan("execution_run_order_idx", "(execution_order > 3)", "(device_id = 1)")) == [
+        "Index Scan on execution using execution_run_order_idx (filter: (device_id = 1))"
+    ]
+
+
+def test_seek_on_the_leading_column_is_ok():
+    assert _issues(
+        _index_scan("execution_executed_at_order_idx", "(executed_at <= now())", "(execution_order > 3)"),
+        _index_scan("execution_executed_at_order_idx"),
+    ) == []
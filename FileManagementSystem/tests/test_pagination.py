@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.database.models import Execution
+from app.services.execution import EXECUTION_SORT
+from app.utils.pagination import encode_cursor, _page_statements
+
+
+class Row:
+    def __init__(self, executed_at, execution_order, id):
+        self.executed_at = executed_at
+        self.execution_order = execution_order
+        self.id = id
+
+
+def _where(row):
+    cursor = encode_cursor(EXECUTION_SORT, row)
+    statements = _page_statements(select(Execution.id), EXECUTION_SORT, 0, cursor)
+    return [
+        " ".join(str(statement.whereclause.compile(dialect=postgresql.dialect())).split())
+        for statement in statements
+    ]
+
+
+def test_execution_cursor_bounds_leading_key():
+    # executed_at <= :v lets Postgres seek execution_executed_at_order_idx
+    assert _where(Row(datetime(2024, 1, 1), 3, 10)) == [
+        "execution.executed_at <= %(executed_at_1)s AND (execution.executed_at < %(executed_at_2)s"
+        " OR execution.executed_at = %(executed_at_3)s"
+        " AND (execution.execution_order, execution.id) > (%(param_1)s, %(param_2)s))"
+    ]
+
+
+def test_execution_cursor_in_null_block():
+    # NULLs sort first when descending: the rest of the NULL block, then every other row
+    assert _where(Row(None, 3, 10)) == [
+        "execution.executed_at IS NULL"
+        " AND (execution.execution_order, execution.id) > (%(param_1)s, %(param_2)s)",
+        "execution.executed_at IS NOT NULL",
+    ]